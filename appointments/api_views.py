@@ -7,9 +7,11 @@ from django.utils import timezone
 from .models import Appointment
 from .serializers import AppointmentSerializer
 from core.permissions import IsClinicalStaff
+from core.api_utils import SparseQuerysetMixin
+from core.export import ExportMixin
 
 
-class AppointmentViewSet(viewsets.ModelViewSet):
+class AppointmentViewSet(ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Appointment.objects.all()
     serializer_class = AppointmentSerializer
     permission_classes = [IsClinicalStaff]
@@ -17,6 +19,7 @@ class AppointmentViewSet(viewsets.ModelViewSet):
     search_fields = ["patient__first_name", "patient__last_name", "doctor__first_name"]
     ordering_fields = ["appointment_date", "status"]
     ordering = ["-appointment_date"]
+    cursor_ordering = ["-appointment_date", "-id"]
 
     def perform_create(self, serializer):
         try:
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0008_alter_appointment_created_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        ("staff", "0010_history_audit_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalappointment",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalappointment",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="appointment_history_bf5b44_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalappointment",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="appointment_history_2a2aa9_idx",
+            ),
+        ),
+    ]
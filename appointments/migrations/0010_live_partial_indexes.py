@@ -0,0 +1,43 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("appointments", "0009_history_audit_indexes"),
+        ("patients", "0012_history_audit_indexes"),
+        ("staff", "0010_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["appointment_date"],
+                name="appt_live_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["status", "appointment_date"],
+                name="appt_live_status_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["doctor", "appointment_date"],
+                name="appt_live_doctor_date_idx",
+            ),
+        ),
+    ]
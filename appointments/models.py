@@ -3,8 +3,7 @@ from patients.models import Patient
 from staff.models import Staff
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class Appointment(RemediumBaseModel):
@@ -22,6 +21,24 @@ class Appointment(RemediumBaseModel):
                 name="unique_appointment",
             )
         ]
+        # Partial (is_deleted=False) to match SoftDeleteManager's filter.
+        indexes = [
+            models.Index(
+                fields=["appointment_date"],
+                name="appt_live_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "appointment_date"],
+                name="appt_live_status_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["doctor", "appointment_date"],
+                name="appt_live_doctor_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     patient = models.ForeignKey(Patient, on_delete=models.CASCADE)
     doctor = models.ForeignKey("staff.Staff", on_delete=models.CASCADE)
@@ -42,7 +59,7 @@ class Appointment(RemediumBaseModel):
         blank=True, null=True, help_text="Time when patient arrived at clinic"
     )
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def clean(self):
         super().clean()
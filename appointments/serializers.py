@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from .models import Appointment
 from patients.serializers import PatientSerializer
 from staff.serializers import StaffSerializer
 
 
-class AppointmentSerializer(serializers.ModelSerializer):
+class AppointmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     patient_detail = PatientSerializer(source="patient", read_only=True)
     doctor_detail = StaffSerializer(source="doctor", read_only=True)
 
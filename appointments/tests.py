@@ -177,3 +177,36 @@ class TestAppointmentViews:
         url = reverse("queue_tracker")
         response = client.get(url)
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestAppointmentIndexes:
+    """Partial indexes serve the soft-delete manager's queries."""
+
+    def _plan(self, queryset):
+        from django.db import connection
+
+        if connection.vendor != "sqlite":
+            pytest.skip("Plan assertions are written for SQLite's EXPLAIN QUERY PLAN.")
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return " ".join(str(row) for row in cursor.fetchall())
+
+    def test_upcoming_uses_status_date_index(self):
+        queryset = Appointment.objects.filter(
+            status="Scheduled", appointment_date__gte=timezone.now()
+        ).order_by("appointment_date")
+        assert "appt_live_status_date_idx" in self._plan(queryset)
+
+    def test_doctor_schedule_uses_doctor_date_index(self):
+        queryset = Appointment.objects.filter(
+            doctor_id=1, appointment_date__gte=timezone.now()
+        )
+        assert "appt_live_doctor_date_idx" in self._plan(queryset)
+
+    def test_all_objects_cannot_use_partial_index(self):
+        queryset = Appointment.all_objects.filter(
+            status="Scheduled", appointment_date__gte=timezone.now()
+        )
+        assert "appt_live_status_date_idx" not in self._plan(queryset)
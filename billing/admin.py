@@ -1,4 +1,5 @@
 from django.contrib import admin
+from . import line_items
 from .models import Invoice, Payment, InvoiceItem
 
 
@@ -29,6 +30,12 @@ class InvoiceAdmin(admin.ModelAdmin):
     inlines = [InvoiceItemInline, PaymentInline]
     readonly_fields = ("total_amount", "invoice_number")
 
+    def save_formset(self, request, form, formset, change):
+        if formset.model is InvoiceItem:
+            line_items.save_formset(formset, user=request.user)
+        else:
+            super().save_formset(request, form, formset, change)
+
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
@@ -1,14 +1,18 @@
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Invoice, Payment
-from .serializers import InvoiceSerializer
+from . import line_items
+from .models import Invoice, InvoiceItem, Payment
+from .serializers import InvoiceItemSerializer, InvoiceSerializer
 from core.permissions import IsBillingStaff
 from core.serializers import StandardErrorSerializer
+from core.api_utils import SparseQuerysetMixin
+from core.export import ExportMixin
 
 
 @extend_schema_view(
@@ -21,23 +25,33 @@ from core.serializers import StandardErrorSerializer
         description="Retrieve detailed information about a specific invoice by ID.",
     ),
     create=extend_schema(
-        summary="Create invoice", description="Generate a new invoice record."
+        summary="Create invoice",
+        description=(
+            "Generate a new invoice record, optionally with its line items in "
+            "`items`. The lines are inserted in bulk and the total computed once."
+        ),
     ),
     update=extend_schema(
         summary="Update invoice",
-        description="Update all fields of an existing invoice.",
+        description=(
+            "Update all fields of an existing invoice. `items`, if given, "
+            "replace all of its line items."
+        ),
     ),
     partial_update=extend_schema(
         summary="Partial update invoice",
-        description="Update specific fields of an existing invoice.",
+        description=(
+            "Update specific fields of an existing invoice. `items`, if given, "
+            "replace all of its line items."
+        ),
     ),
     destroy=extend_schema(
         summary="Delete invoice",
         description="Remove an invoice record from the system.",
     ),
 )
-class InvoiceViewSet(viewsets.ModelViewSet):
-    queryset = Invoice.objects.all()
+class InvoiceViewSet(ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Invoice.objects.prefetch_related("items")
     serializer_class = InvoiceSerializer
     permission_classes = [IsBillingStaff]
     filter_backends = [
@@ -54,6 +68,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ["issue_date", "due_date", "total_amount"]
     ordering = ["-issue_date"]
+    cursor_ordering = ["-issue_date", "-id"]
 
     @extend_schema(
         summary="List unpaid invoices",
@@ -112,3 +127,38 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         invoice.refresh_from_db()
         serializer = self.get_serializer(invoice)
         return Response(serializer.data)
+
+    @extend_schema(
+        summary="Invoice line items",
+        description=(
+            "GET lists the invoice's line items. POST adds the given list of "
+            "items and PUT replaces all of them; either way the lines are "
+            "written in bulk and the invoice total is recomputed once."
+        ),
+        request=InvoiceItemSerializer(many=True),
+        responses={
+            200: InvoiceItemSerializer(many=True),
+            201: InvoiceItemSerializer(many=True),
+            400: StandardErrorSerializer,
+        },
+    )
+    @action(detail=True, methods=["get", "post", "put"], pagination_class=None)
+    def items(self, request, pk=None):
+        """List, add or replace an invoice's line items."""
+        invoice = self.get_object()
+        if request.method == "GET":
+            return Response(InvoiceItemSerializer(invoice.items.all(), many=True).data)
+        serializer = InvoiceItemSerializer(
+            data=request.data, many=True, max_length=line_items.MAX_ITEMS
+        )
+        if not serializer.is_valid():
+            # Per-line errors come as a list; the error envelope needs a dict.
+            raise ValidationError({"items": serializer.errors})
+        items = [InvoiceItem(**row) for row in serializer.validated_data]
+        if request.method == "PUT":
+            saved = line_items.replace_items(invoice, items, user=request.user)
+            code = status.HTTP_200_OK
+        else:
+            saved = line_items.add_items(invoice, items, user=request.user)
+            code = status.HTTP_201_CREATED
+        return Response(InvoiceItemSerializer(saved, many=True).data, status=code)
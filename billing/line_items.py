@@ -0,0 +1,72 @@
+"""
+Batched invoice line-item writes.
+
+``InvoiceItem.save()`` recomputes the invoice total after every line: an
+aggregate query, an ``Invoice`` save and an invoice history row per item,
+on top of the item's own insert and history row. Inpatient invoices run to
+hundreds of lines, so the formset views, the admin inline and the API write
+lines through the helpers here instead. Each helper writes all lines with
+``bulk_create``/``bulk_update`` plus bulk history rows and recomputes the
+total once, in one transaction.
+"""
+
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from .models import InvoiceItem
+
+# Most lines one API request may write.
+MAX_ITEMS = 2000
+
+# Columns a line edit can change.
+UPDATE_FIELDS = ["service", "description", "quantity", "unit_price", "total_price"]
+
+
+def _insert(invoice, items, user):
+    if not items:
+        return []
+    for item in items:
+        item.invoice = invoice
+        item.prepare()
+    return bulk_create_with_history(items, InvoiceItem, default_user=user)
+
+
+def add_items(invoice, items, user=None):
+    """Insert unsaved ``items`` on ``invoice`` and update its total once."""
+    with transaction.atomic():
+        created = _insert(invoice, list(items), user)
+        invoice.update_total()
+    return created
+
+
+def replace_items(invoice, items, user=None):
+    """Replace every line of ``invoice`` with the unsaved ``items``."""
+    with transaction.atomic():
+        invoice.items.all().delete()
+        created = _insert(invoice, list(items), user)
+        invoice.update_total()
+    return created
+
+
+def save_formset(formset, user=None):
+    """
+    Save an ``InvoiceItemFormSet`` (new, changed and deleted lines) for
+    ``formset.instance`` with bulk writes and a single total update.
+    Returns the saved items, like ``formset.save()``.
+    """
+    invoice = formset.instance
+    items = formset.save(commit=False)
+    changed = [item for item in items if item.pk is not None]
+    with transaction.atomic():
+        deleted = [item.pk for item in formset.deleted_objects]
+        if deleted:
+            InvoiceItem.objects.filter(invoice=invoice, pk__in=deleted).delete()
+        for item in changed:
+            item.prepare()
+        if changed:
+            bulk_update_with_history(
+                changed, InvoiceItem, UPDATE_FIELDS, default_user=user
+            )
+        _insert(invoice, [item for item in items if item.pk is None], user)
+        invoice.update_total()
+    return items
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("billing", "0012_alter_historicalinvoice_created_at_and_more"),
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalinvoice",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name="historicalinvoiceitem",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name="historicalpayment",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalinvoice",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="billing_his_history_63f30c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalinvoice",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="billing_his_history_211c14_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalinvoiceitem",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="billing_his_history_22d201_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalinvoiceitem",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="billing_his_history_8e873d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpayment",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="billing_his_history_08b80b_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpayment",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="billing_his_history_c1e5e1_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("billing", "0013_history_audit_indexes"),
+        ("patients", "0012_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-issue_date"],
+                name="inv_live_issue_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["patient", "-issue_date"],
+                name="inv_live_patient_issue_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False), ("paid", False)),
+                fields=["due_date"],
+                name="inv_live_unpaid_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("billing", "0014_live_partial_indexes"),
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0014_contact_blind_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="historicalinvoice",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="billing_his_id_9d5800_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="historicalinvoiceitem",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="billing_his_id_afb5d2_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="historicalpayment",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="billing_his_id_10eec5_idx",
+            ),
+        ),
+    ]
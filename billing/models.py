@@ -3,12 +3,14 @@ from django.db.models import Sum
 from patients.models import Patient
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class InvoiceCounter(models.Model):
-    """Per-year atomic sequence counter for invoice numbers."""
+    """
+    Per-year sequence counter for invoice numbers. On PostgreSQL it only
+    seeds the year's native sequence (see billing.numbering).
+    """
 
     year = models.PositiveIntegerField(primary_key=True)
     last_seq = models.PositiveIntegerField(default=0)
@@ -18,14 +20,10 @@ class InvoiceCounter(models.Model):
 
     @classmethod
     def next_seq(cls, year):
-        """Atomically increment and return the next sequence number for the given year."""
-        from django.db import transaction
+        """Return the next invoice sequence number for the given year."""
+        from . import numbering
 
-        with transaction.atomic():
-            counter, _ = cls.objects.select_for_update().get_or_create(year=year)
-            counter.last_seq += 1
-            counter.save(update_fields=["last_seq"])
-            return counter.last_seq
+        return numbering.next_seq(year)
 
 
 class Invoice(RemediumBaseModel):
@@ -47,6 +45,23 @@ class Invoice(RemediumBaseModel):
                 name="invoice_due_after_issue",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["-issue_date"],
+                name="inv_live_issue_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["patient", "-issue_date"],
+                name="inv_live_patient_issue_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["due_date"],
+                name="inv_live_unpaid_due_idx",
+                condition=models.Q(is_deleted=False, paid=False),
+            ),
+        ]
 
     patient = models.ForeignKey(Patient, on_delete=models.CASCADE)
     invoice_number = models.CharField(
@@ -59,14 +74,14 @@ class Invoice(RemediumBaseModel):
     insurance_claimed = models.BooleanField(default=False, db_index=True)
     details = models.TextField(blank=True, null=True)
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def save(self, *args, **kwargs):
         """Auto-generate invoice number and validate before saving."""
         if not self.invoice_number:
-            year = timezone.now().year
-            seq = InvoiceCounter.next_seq(year)
-            self.invoice_number = f"INV-{year}-{seq:05d}"
+            from . import numbering
+
+            self.invoice_number = numbering.next_number(timezone.now().year)
         # Enforce model-level validation so API calls (which bypass forms) are
         # also protected against invalid dates and negative amounts.
         # Skip when update_fields is set — those are targeted internal saves
@@ -108,15 +123,20 @@ class InvoiceItem(models.Model):
     unit_price = models.DecimalField(max_digits=10, decimal_places=2)
     total_price = models.DecimalField(max_digits=10, decimal_places=2, editable=False)
 
-    def save(self, *args, **kwargs):
+    def prepare(self):
+        """Fill the derived fields: default description and line total."""
         if not self.description and self.service:
             self.description = self.service.name
         self.total_price = self.unit_price * self.quantity
+
+    def save(self, *args, **kwargs):
+        self.prepare()
         super().save(*args, **kwargs)
-        # Update parent invoice total
+        # Update parent invoice total (batched writes go through
+        # billing.line_items, which does this once per batch).
         self.invoice.update_total()
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def __str__(self):
         return f"{self.description} (x{self.quantity}) on {self.invoice.invoice_number}"
@@ -150,7 +170,7 @@ class Payment(RemediumBaseModel):
     )
     status = models.CharField(max_length=20, default="COMPLETED", db_index=True)
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def __str__(self):
         return f"{self.amount} for Invoice #{self.invoice.invoice_number}"
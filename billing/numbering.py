@@ -0,0 +1,110 @@
+"""
+Invoice number allocation (``INV-YYYY-NNNNN``).
+
+``InvoiceCounter.next_seq()`` used to lock the year's counter row for every
+invoice, so invoice creation was serialized across all workers until each
+creating transaction committed, which stalled month-end batch billing.
+
+On PostgreSQL each year now has a native sequence,
+``billing_invoice_seq_<year>``, created on first use and started after the
+year's ``InvoiceCounter.last_seq`` so it carries on from numbers already
+issued. ``nextval()`` takes no row lock and is not rolled back with the
+transaction, so concurrent invoices never wait on each other.
+
+Other backends keep per-invoice locking on the counter row: every
+creation path runs inside a transaction, so numbers reserved ahead of time
+would be released with it, and SQLite serializes writers anyway.
+``reserve()`` still takes a whole batch under a single lock.
+
+Numbers are unique and increasing but, on PostgreSQL, not gap-free:
+rolled-back invoices leave gaps.
+"""
+
+from django.db import DatabaseError, connections, router, transaction
+
+from .models import Invoice, InvoiceCounter
+
+_sequences = set()  # (db alias, year) whose sequence is known to exist
+
+
+def format_number(year, seq):
+    return f"INV-{year}-{seq:05d}"
+
+
+def _alias():
+    return router.db_for_write(Invoice)
+
+
+def _sequence_name(year):
+    return f"billing_invoice_seq_{int(year)}"
+
+
+def _ensure_sequence(alias, year):
+    """Create the year's sequence, starting after the counter row, if missing."""
+    name = _sequence_name(year)
+    start = (
+        InvoiceCounter.objects.using(alias)
+        .filter(year=year)
+        .values_list("last_seq", flat=True)
+        .first()
+        or 0
+    ) + 1
+    try:
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {name} START WITH {start}")
+    except DatabaseError:
+        # Another worker created it concurrently.
+        pass
+
+
+def _from_sequence(alias, year, count):
+    name = _sequence_name(year)
+    key = (alias, year)
+    if key not in _sequences:
+        _ensure_sequence(alias, year)
+        # The CREATE rolls back with the surrounding transaction, if any.
+        transaction.on_commit(lambda: _sequences.add(key), using=alias)
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f"SELECT nextval('{name}') FROM generate_series(1, %s)", [count])
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def _from_counter(alias, year, count):
+    """Reserve ``count`` consecutive numbers from the counter row."""
+    with transaction.atomic(using=alias):
+        counter, _ = (
+            InvoiceCounter.objects.using(alias)
+            .select_for_update()
+            .get_or_create(year=year)
+        )
+        first = counter.last_seq + 1
+        counter.last_seq = first + count - 1
+        counter.save(update_fields=["last_seq"])
+    return list(range(first, first + count))
+
+
+def reserve(year, count):
+    """
+    Reserve ``count`` invoice sequence numbers for ``year`` and return them
+    in ascending order, e.g. for invoices written with ``bulk_create``.
+    They are unique but, on PostgreSQL, not necessarily consecutive.
+    """
+    if count < 1:
+        return []
+    alias = _alias()
+    if connections[alias].vendor == "postgresql":
+        return _from_sequence(alias, year, count)
+    return _from_counter(alias, year, count)
+
+
+def next_seq(year):
+    """The next invoice sequence number for ``year``."""
+    alias = _alias()
+    if connections[alias].vendor == "postgresql":
+        return _from_sequence(alias, year, 1)[0]
+    return _from_counter(alias, year, 1)[0]
+
+
+def next_number(year):
+    """The next invoice number for ``year``, e.g. ``INV-2026-00042``."""
+    return format_number(year, next_seq(year))
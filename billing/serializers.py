@@ -1,10 +1,74 @@
+from django.db import transaction
 from rest_framework import serializers
-from .models import Invoice
+from core.serializers import SparseFieldsetMixin
+from hospital.models import HospitalService
+from . import line_items
+from .models import Invoice, InvoiceItem
 from patients.serializers import PatientSerializer
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class _ServiceField(serializers.PrimaryKeyRelatedField):
+    """Resolves services from the batch ``InvoiceItemListSerializer`` preloads."""
+
+    def to_internal_value(self, data):
+        preloaded = getattr(self.parent, "_services", None)
+        try:
+            return preloaded[int(data)]
+        except (KeyError, TypeError, ValueError):
+            # Not preloaded (single item) or invalid: the usual lookup and errors.
+            return super().to_internal_value(data)
+
+
+class InvoiceItemListSerializer(serializers.ListSerializer):
+    """Validates a batch of lines with one query for all their services."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = set()
+            for row in data:
+                try:
+                    ids.add(int(row.get("service")))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+            self.child._services = HospitalService.objects.in_bulk(ids)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            self.child._services = None
+
+
+class InvoiceItemSerializer(serializers.ModelSerializer):
+    service = _ServiceField(
+        queryset=HospitalService.objects.all(), required=False, allow_null=True
+    )
+
+    class Meta:
+        model = InvoiceItem
+        list_serializer_class = InvoiceItemListSerializer
+        fields = [
+            "id",
+            "service",
+            "description",
+            "quantity",
+            "unit_price",
+            "total_price",
+        ]
+        read_only_fields = ["id", "total_price"]
+        extra_kwargs = {"description": {"required": False, "allow_blank": True}}
+
+    def validate(self, attrs):
+        if not attrs.get("description") and not attrs.get("service"):
+            raise serializers.ValidationError(
+                {"description": "Give a description or a service."}
+            )
+        return attrs
+
+
+class InvoiceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     patient_detail = PatientSerializer(source="patient", read_only=True)
+    items = InvoiceItemSerializer(
+        many=True, required=False, max_length=line_items.MAX_ITEMS
+    )
 
     class Meta:
         model = Invoice
@@ -18,5 +82,33 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "paid",
             "insurance_claimed",
             "details",
+            "items",
         ]
         read_only_fields = ["id"]
+        field_dependencies = {"items": []}
+
+    def _user(self):
+        request = self.context.get("request")
+        return getattr(request, "user", None)
+
+    def create(self, validated_data):
+        """Create the invoice and bulk-insert its ``items``, if given."""
+        items = validated_data.pop("items", None)
+        with transaction.atomic():
+            invoice = super().create(validated_data)
+            if items:
+                line_items.add_items(
+                    invoice, [InvoiceItem(**item) for item in items], self._user()
+                )
+        return invoice
+
+    def update(self, instance, validated_data):
+        """Update the invoice; ``items``, if given, replace all its lines."""
+        items = validated_data.pop("items", None)
+        with transaction.atomic():
+            invoice = super().update(instance, validated_data)
+            if items is not None:
+                line_items.replace_items(
+                    invoice, [InvoiceItem(**item) for item in items], self._user()
+                )
+        return invoice
@@ -12,6 +12,12 @@ from billing.models import Invoice, Payment
 from patients.models import Patient
 
 
+def _is_postgres():
+    from django.db import connection
+
+    return connection.vendor == "postgresql"
+
+
 @pytest.mark.django_db
 class TestInvoiceModel:
     """Test Invoice model."""
@@ -188,3 +194,205 @@ class TestInvoiceViews:
         url = reverse("billing:invoice_create")
         response = client.get(url)
         assert response.status_code == 200
+
+
+class TestInvoiceNumbering:
+    """Invoice number allocation (billing.numbering)."""
+
+    def _patient(self):
+        return Patient.objects.create(
+            unique_id="PAT_NUM",
+            first_name="Num",
+            last_name="Bered",
+            date_of_birth=date(1980, 1, 1),
+            gender="F",
+        )
+
+    @pytest.mark.django_db
+    def test_invoices_get_sequential_numbers(self):
+        patient = self._patient()
+        year = timezone.now().year
+        numbers = [
+            Invoice.objects.create(patient=patient).invoice_number for _ in range(3)
+        ]
+        assert len(set(numbers)) == 3
+        assert all(number.startswith(f"INV-{year}-") for number in numbers)
+        if not _is_postgres():
+            assert numbers == [f"INV-{year}-{n:05d}" for n in (1, 2, 3)]
+
+    @pytest.mark.django_db
+    def test_reserve_returns_ascending_unique_numbers(self):
+        from billing import numbering
+
+        first = numbering.reserve(2030, 4)
+        second = numbering.reserve(2030, 2)
+        assert first == sorted(first) and len(set(first + second)) == 6
+        assert min(second) > max(first)
+        assert numbering.reserve(2030, 0) == []
+
+    @pytest.mark.skipif(_is_postgres(), reason="counter-row fallback only")
+    @pytest.mark.django_db
+    def test_counter_row_tracks_every_number(self):
+        from billing import numbering
+        from billing.models import InvoiceCounter
+
+        assert [numbering.next_seq(2031) for _ in range(3)] == [1, 2, 3]
+        assert InvoiceCounter.objects.get(year=2031).last_seq == 3
+
+
+@pytest.mark.django_db
+class TestInvoiceLineItems:
+    """Batched line-item writes (billing.line_items) and the nested API."""
+
+    @pytest.fixture
+    def invoice(self):
+        patient = Patient.objects.create(
+            unique_id="PAT_LINES",
+            first_name="Line",
+            last_name="Items",
+            date_of_birth=date(1975, 5, 5),
+            gender="M",
+        )
+        return Invoice.objects.create(patient=patient)
+
+    @pytest.fixture
+    def api_client(self):
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(username="biller", password="pass", is_staff=True)
+        )
+        return client
+
+    def _lines(self, count):
+        return [
+            {"description": f"Day {n}", "quantity": 2, "unit_price": "10.50"}
+            for n in range(count)
+        ]
+
+    def test_add_items_writes_in_constant_queries(self, invoice):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from billing import line_items
+        from billing.models import InvoiceItem
+
+        counts = []
+        for size in (3, 40):
+            items = [
+                InvoiceItem(
+                    description=f"Day {n}", quantity=2, unit_price=Decimal("10.50")
+                )
+                for n in range(size)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                line_items.add_items(invoice, items)
+            counts.append(len(ctx.captured_queries))
+        assert counts[0] == counts[1]
+        invoice.refresh_from_db()
+        assert invoice.total_amount == Decimal("903.00")
+        assert InvoiceItem.history.filter(invoice_id=invoice.pk).count() == 43
+        # One invoice history row per batch, not per line.
+        assert invoice.history.count() == 3
+
+    def test_save_formset_creates_updates_and_deletes(self, invoice):
+        from billing import line_items
+        from billing.forms import InvoiceItemFormSet
+        from billing.models import InvoiceItem
+        from hospital.models import HospitalService
+
+        service = HospitalService.objects.create(
+            name="Bed day", category="ACCOMMODATION", base_price=100
+        )
+        keep = InvoiceItem.objects.create(
+            invoice=invoice, description="Keep", quantity=1, unit_price=5
+        )
+        drop = InvoiceItem.objects.create(
+            invoice=invoice, description="Drop", quantity=1, unit_price=7
+        )
+        data = {
+            "items-TOTAL_FORMS": "3",
+            "items-INITIAL_FORMS": "2",
+            "items-0-id": keep.pk,
+            "items-0-description": "Keep",
+            "items-0-quantity": "3",
+            "items-0-unit_price": "5",
+            "items-1-id": drop.pk,
+            "items-1-description": "Drop",
+            "items-1-quantity": "1",
+            "items-1-unit_price": "7",
+            "items-1-DELETE": "on",
+            "items-2-service": service.pk,
+            "items-2-description": "Bed day",
+            "items-2-quantity": "2",
+            "items-2-unit_price": "100",
+        }
+        formset = InvoiceItemFormSet(data, instance=invoice)
+        assert formset.is_valid(), formset.errors
+        line_items.save_formset(formset)
+
+        lines = {item.description: item for item in invoice.items.all()}
+        assert set(lines) == {"Keep", "Bed day"}
+        assert lines["Keep"].total_price == Decimal("15.00")
+        assert lines["Bed day"].total_price == Decimal("200.00")
+        invoice.refresh_from_db()
+        assert invoice.total_amount == Decimal("215.00")
+
+    def test_create_invoice_with_nested_items(self, invoice, api_client):
+        r = api_client.post(
+            "/api/v1/invoices/",
+            {"patient": invoice.patient_id, "items": self._lines(5)},
+            format="json",
+        )
+        assert r.status_code == 201, r.data
+        assert r.data["total_amount"] == "105.00"
+        assert len(r.data["items"]) == 5
+
+        r = api_client.patch(
+            f"/api/v1/invoices/{r.data['id']}/",
+            {"items": self._lines(1)},
+            format="json",
+        )
+        assert r.status_code == 200
+        assert r.data["total_amount"] == "21.00"
+        assert [item["description"] for item in r.data["items"]] == ["Day 0"]
+
+    def test_items_endpoint_adds_and_replaces(self, invoice, api_client):
+        from hospital.models import HospitalService
+
+        url = f"/api/v1/invoices/{invoice.pk}/items/"
+        services = [
+            HospitalService.objects.create(
+                name=f"Test {n}", category="LABORATORY", base_price=10
+            )
+            for n in range(3)
+        ]
+        lines = [
+            {"service": service.pk, "quantity": 1, "unit_price": "10"}
+            for service in services
+        ]
+        r = api_client.post(url, lines, format="json")
+        assert r.status_code == 201, r.data
+        assert [item["description"] for item in r.data] == [
+            "Test 0",
+            "Test 1",
+            "Test 2",
+        ]
+
+        r = api_client.put(url, self._lines(2), format="json")
+        assert r.status_code == 200
+        r = api_client.get(url)
+        assert [item["description"] for item in r.data] == ["Day 0", "Day 1"]
+        invoice.refresh_from_db()
+        assert invoice.total_amount == Decimal("42.00")
+
+    def test_items_endpoint_rejects_invalid_lines(self, invoice, api_client):
+        url = f"/api/v1/invoices/{invoice.pk}/items/"
+        r = api_client.post(
+            url,
+            [{"quantity": 1, "unit_price": "1"}, {"service": 999999}],
+            format="json",
+        )
+        assert r.status_code == 400
+        assert set(r.data["errors"]["items"][1]) == {"service", "unit_price"}
+        assert not invoice.items.exists()
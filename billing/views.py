@@ -2,6 +2,7 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views import generic
 from .models import Invoice, Payment
 from .forms import InvoiceForm, InvoiceItemFormSet
+from . import line_items
 from django.urls import reverse_lazy, reverse
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
@@ -62,7 +63,7 @@ class InvoiceCreateView(
             self.object = form.save()
             if items.is_valid():
                 items.instance = self.object
-                items.save()
+                line_items.save_formset(items, user=self.request.user)
             else:
                 return self.form_invalid(form)
         return super().form_valid(form)
@@ -97,7 +98,7 @@ class InvoiceUpdateView(
             self.object = form.save()
             if items.is_valid():
                 items.instance = self.object
-                items.save()
+                line_items.save_formset(items, user=self.request.user)
             else:
                 return self.form_invalid(form)
         return super().form_valid(form)
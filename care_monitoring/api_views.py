@@ -1,12 +1,17 @@
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from . import series as vitals
 from .models import PatientCare
-from .serializers import PatientCareSerializer
+from .serializers import PatientCareSerializer, VitalsSeriesQuerySerializer
 from core.permissions import IsClinicalStaff
+from core.api_utils import SparseQuerysetMixin
+from core.export import ExportMixin
 
 
-class PatientCareViewSet(viewsets.ModelViewSet):
+class PatientCareViewSet(ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = PatientCare.objects.select_related("patient", "monitored_by").all()
     serializer_class = PatientCareSerializer
     permission_classes = [IsClinicalStaff]
@@ -14,6 +19,7 @@ class PatientCareViewSet(viewsets.ModelViewSet):
     search_fields = ["patient__first_name", "patient__last_name", "status"]
     ordering_fields = ["monitoring_date", "status"]
     ordering = ["-monitoring_date"]
+    cursor_ordering = ["-monitoring_date", "-id"]
 
     @action(detail=False, methods=["get"])
     def critical(self, request):
@@ -21,3 +27,52 @@ class PatientCareViewSet(viewsets.ModelViewSet):
         qs = self.get_queryset().filter(status="CRITICAL")
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
+
+    @extend_schema(
+        summary="Downsampled vitals time series",
+        description=(
+            "Vital-sign readings of one patient, oldest first, each metric reduced "
+            "to at most `points` samples with Largest-Triangle-Three-Buckets. "
+            "`total` is the number of readings before downsampling."
+        ),
+        parameters=[
+            OpenApiParameter("patient", int, required=True, description="Patient ID."),
+            OpenApiParameter(
+                "metrics",
+                str,
+                description=f"Comma-separated metrics; default all of: {', '.join(vitals.METRICS)}.",
+            ),
+            OpenApiParameter(
+                "since", OpenApiTypes.DATETIME, description="Window start."
+            ),
+            OpenApiParameter("until", OpenApiTypes.DATETIME, description="Window end."),
+            OpenApiParameter(
+                "points",
+                int,
+                description=f"Maximum samples per metric (3-{vitals.MAX_POINTS}, "
+                f"default {vitals.DEFAULT_POINTS}).",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"])
+    def series(self, request):
+        """Downsampled vitals of one patient for charting."""
+        query = VitalsSeriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        return Response(
+            {
+                "patient": params["patient"].pk,
+                "since": params.get("since"),
+                "until": params.get("until"),
+                "points": params["points"],
+                "series": vitals.vitals_series(
+                    params["patient"].pk,
+                    metrics=params.get("metrics"),
+                    since=params.get("since"),
+                    until=params.get("until"),
+                    points=params["points"],
+                ),
+            }
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("care_monitoring", "0005_historicalpatientcare_created_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        ("staff", "0010_history_audit_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalpatientcare",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatientcare",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="care_monito_history_b3afbe_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatientcare",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="care_monito_history_e50efb_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("care_monitoring", "0006_history_audit_indexes"),
+        ("patients", "0012_history_audit_indexes"),
+        ("staff", "0010_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="patientcare",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-monitoring_date"],
+                name="care_live_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="patientcare",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["status", "-monitoring_date"],
+                name="care_live_status_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="patientcare",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["patient", "-monitoring_date"],
+                name="care_live_patient_date_idx",
+            ),
+        ),
+    ]
@@ -3,8 +3,7 @@ from patients.models import Patient
 from decimal import Decimal
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
-from simple_history.models import HistoricalRecords
-from core.models import RemediumBaseModel
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class PatientCare(RemediumBaseModel):
@@ -26,6 +25,23 @@ class PatientCare(RemediumBaseModel):
             ("care_monitoring_delete_patientcare", "Can delete patient care"),
         ]
         ordering = ["-monitoring_date"]
+        indexes = [
+            models.Index(
+                fields=["-monitoring_date"],
+                name="care_live_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "-monitoring_date"],
+                name="care_live_status_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["patient", "-monitoring_date"],
+                name="care_live_patient_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     patient = models.ForeignKey(
         "patients.Patient",
@@ -121,7 +137,7 @@ class PatientCare(RemediumBaseModel):
         help_text="Staff member who recorded the monitoring",
     )
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def clean(self):
         super().clean()
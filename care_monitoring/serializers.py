@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from django.core.exceptions import ValidationError as DjangoValidationError
+from core.serializers import SparseFieldsetMixin
+from patients.models import Patient
+from . import series
 from .models import PatientCare
 
 
-class PatientCareSerializer(serializers.ModelSerializer):
+class PatientCareSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     patient_name = serializers.CharField(source="patient.full_name", read_only=True)
     blood_pressure = serializers.CharField(read_only=True)
     bmi = serializers.FloatField(read_only=True)
@@ -32,6 +35,18 @@ class PatientCareSerializer(serializers.ModelSerializer):
             "is_vital_signs_critical",
         ]
         read_only_fields = ["id", "monitoring_date"]
+        field_dependencies = {
+            "patient_name": ["patient__first_name", "patient__last_name"],
+            "blood_pressure": ["blood_pressure_systolic", "blood_pressure_diastolic"],
+            "bmi": ["weight", "height"],
+            "is_vital_signs_critical": [
+                "temperature",
+                "heart_rate",
+                "blood_pressure_systolic",
+                "oxygen_saturation",
+                "respiratory_rate",
+            ],
+        }
 
     def validate(self, data):
         systolic = data.get("blood_pressure_systolic")
@@ -43,3 +58,32 @@ class PatientCareSerializer(serializers.ModelSerializer):
                 }
             )
         return data
+
+
+class VitalsSeriesQuerySerializer(serializers.Serializer):
+    """Query parameters of the downsampled vitals series endpoint."""
+
+    patient = serializers.PrimaryKeyRelatedField(queryset=Patient.objects.all())
+    metrics = serializers.CharField(required=False, allow_blank=True)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    points = serializers.IntegerField(
+        min_value=3,
+        max_value=series.MAX_POINTS,
+        default=series.DEFAULT_POINTS,
+    )
+
+    def validate_metrics(self, value):
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(series.METRICS))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown metrics: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(series.METRICS)}."
+            )
+        return names
+
+    def validate(self, data):
+        if data.get("since") and data.get("until") and data["since"] > data["until"]:
+            raise serializers.ValidationError({"until": "Must not be before since."})
+        return data
@@ -0,0 +1,116 @@
+"""
+Downsampled vital-sign time series for charts.
+
+An ICU patient accumulates thousands of ``PatientCare`` readings, far more
+than a chart can show. ``vitals_series()`` reads the requested window in one
+query over the ``(patient, monitoring_date)`` index and reduces each metric
+to at most ``points`` samples with Largest-Triangle-Three-Buckets (LTTB),
+which keeps the visual shape of the curve, spikes and dips included, unlike
+averaging or taking every n-th reading.
+
+LTTB is a single linear pass, so it is implemented in plain Python rather
+than pulling in NumPy for a few thousand values per request.
+"""
+
+from decimal import Decimal
+
+from .models import PatientCare
+
+DEFAULT_POINTS = 300
+MAX_POINTS = 2000
+
+# Public metric name -> PatientCare field.
+METRICS = {
+    "heart_rate": "heart_rate",
+    "temperature": "temperature",
+    "systolic": "blood_pressure_systolic",
+    "diastolic": "blood_pressure_diastolic",
+    "oxygen_saturation": "oxygen_saturation",
+    "respiratory_rate": "respiratory_rate",
+}
+
+
+def lttb(points, threshold):
+    """
+    Downsample ``[(x, y), ...]`` (sorted by ``x``) to ``threshold`` points
+    with Largest-Triangle-Three-Buckets. The first and last points are
+    always kept; inputs no longer than ``threshold`` are returned as is.
+    """
+    return [points[i] for i in lttb_indices(points, threshold)]
+
+
+def lttb_indices(points, threshold):
+    """Indices of the points ``lttb()`` keeps, in ascending order."""
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    sampled = [0]
+    # Interior points are split into threshold - 2 buckets of equal width.
+    every = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+
+        # Average of the next bucket (or the last point for the final bucket).
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        avg_x = sum(x for x, _ in points[next_start:next_end]) / span
+        avg_y = sum(y for _, y in points[next_start:next_end]) / span
+
+        # Keep the point forming the largest triangle with the previously
+        # kept point and the next bucket's average.
+        ax, ay = points[previous]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            x, y = points[i]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        sampled.append(best)
+        previous = best
+
+    sampled.append(count - 1)
+    return sampled
+
+
+def _number(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def vitals_series(
+    patient_id, metrics=None, since=None, until=None, points=DEFAULT_POINTS
+):
+    """
+    Return ``{metric: {"total": n, "points": [[monitoring_date, value], ...]}}``
+    for the patient's live readings in ``[since, until]``, oldest first, each
+    metric downsampled to at most ``points`` samples. Readings without a
+    value for a metric are skipped for that metric only.
+    """
+    metrics = list(metrics or METRICS)
+    fields = [METRICS[name] for name in metrics]
+    queryset = PatientCare.objects.filter(patient_id=patient_id)
+    if since:
+        queryset = queryset.filter(monitoring_date__gte=since)
+    if until:
+        queryset = queryset.filter(monitoring_date__lte=until)
+    rows = list(
+        queryset.order_by("monitoring_date").values_list("monitoring_date", *fields)
+    )
+
+    series = {}
+    for column, name in enumerate(metrics, start=1):
+        readings = [
+            (row[0], _number(row[column])) for row in rows if row[column] is not None
+        ]
+        kept = lttb_indices(
+            [(when.timestamp(), float(value)) for when, value in readings], points
+        )
+        series[name] = {
+            "total": len(readings),
+            "points": [list(readings[i]) for i in kept],
+        }
+    return series
@@ -64,6 +64,27 @@ class TestPatientCareAPI:
         assert r.status_code == status.HTTP_200_OK
         assert all(rec["status"] == "CRITICAL" for rec in r.data)
 
+    def test_sparse_fields_skip_patient_phi(self, admin_client, patient):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        PatientCare.objects.create(patient=patient, status="STABLE")
+        with CaptureQueriesContext(connection) as queries:
+            r = admin_client.get("/api/v1/care-monitoring/", {"fields": "id"})
+        assert r.status_code == status.HTTP_200_OK
+        assert set(r.data["results"][0]) == {"id"}
+        assert not [q for q in queries if '"patients_patient"' in q["sql"]]
+
+        with CaptureQueriesContext(connection) as queries:
+            r = admin_client.get(
+                "/api/v1/care-monitoring/", {"fields": "id,patient_name"}
+            )
+        assert r.data["results"][0]["patient_name"] == "Bob Jones"
+        select = [q["sql"] for q in queries if '"patients_patient"' in q["sql"]]
+        assert select
+        assert all('"medical_history"' not in sql for sql in select)
+        assert all('"patients_patient"."phone"' not in sql for sql in select)
+
     def test_serializer_computed_fields(self, admin_client, patient):
         PatientCare.objects.create(
             patient=patient,
@@ -147,3 +168,78 @@ class TestPatientCareViews:
         url = reverse("care_monitoring:patientcare_create")
         response = client.get(url)
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestVitalsSeries:
+    """Downsampled vitals series at /api/v1/care-monitoring/series/."""
+
+    def _readings(self, patient, count):
+        start = timezone.now() - timedelta(minutes=count)
+        records = PatientCare.objects.bulk_create(
+            PatientCare(
+                patient=patient,
+                status="STABLE",
+                heart_rate=70 + i % 10,
+                temperature="37.0",
+                oxygen_saturation=None if i % 2 else "98.50",
+            )
+            for i in range(count)
+        )
+        for i, record in enumerate(records):
+            record.monitoring_date = start + timedelta(minutes=i)
+        PatientCare.objects.bulk_update(records, ["monitoring_date"])
+        return start
+
+    def test_lttb_keeps_extremes_and_endpoints(self):
+        from care_monitoring.series import lttb
+
+        points = [(x, 0.0) for x in range(100)]
+        points[37] = (37, 50.0)
+        sampled = lttb(points, 10)
+        assert len(sampled) == 10
+        assert sampled[0] == points[0] and sampled[-1] == points[-1]
+        assert (37, 50.0) in sampled
+        assert lttb(points[:5], 10) == points[:5]
+
+    def test_downsamples_each_metric(self, admin_client, patient):
+        self._readings(patient, 200)
+        r = admin_client.get(
+            "/api/v1/care-monitoring/series/",
+            {
+                "patient": patient.pk,
+                "metrics": "heart_rate,oxygen_saturation",
+                "points": 50,
+            },
+        )
+        assert r.status_code == status.HTTP_200_OK
+        series = r.data["series"]
+        assert set(series) == {"heart_rate", "oxygen_saturation"}
+        assert series["heart_rate"]["total"] == 200
+        assert len(series["heart_rate"]["points"]) == 50
+        assert series["oxygen_saturation"]["total"] == 100
+        dates = [when for when, _ in series["heart_rate"]["points"]]
+        assert dates == sorted(dates)
+        assert series["oxygen_saturation"]["points"][0][1] == 98.5
+
+    def test_window_and_single_query(
+        self, admin_client, patient, django_assert_max_num_queries
+    ):
+        start = self._readings(patient, 60)
+        params = {
+            "patient": patient.pk,
+            "since": (start + timedelta(minutes=10)).isoformat(),
+            "until": (start + timedelta(minutes=19)).isoformat(),
+        }
+        with django_assert_max_num_queries(2):
+            r = admin_client.get("/api/v1/care-monitoring/series/", params)
+        assert r.data["series"]["heart_rate"]["total"] == 10
+
+    def test_invalid_parameters_rejected(self, admin_client, patient):
+        url = "/api/v1/care-monitoring/series/"
+        assert admin_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        r = admin_client.get(url, {"patient": patient.pk, "metrics": "heart_rate,mood"})
+        assert r.status_code == status.HTTP_400_BAD_REQUEST
+        assert "mood" in str(r.data)
+        r = admin_client.get(url, {"patient": patient.pk, "points": 1})
+        assert r.status_code == status.HTTP_400_BAD_REQUEST
@@ -24,3 +24,13 @@ os.environ.setdefault("DB_NAME", ":memory:")
 def api_client():
     """Provide DRF APIClient for API tests."""
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache so cached counters and role flags don't leak."""
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
@@ -1,3 +1,50 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ArchiveManifest, SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "duration_ms", "view", "origin", "analyzed"]
+    list_filter = ["view", "vendor", "analyzed"]
+    search_fields = ["sql", "view", "origin"]
+    date_hierarchy = "created_at"
+    list_per_page = 25
+    readonly_fields = [
+        "created_at",
+        "duration_ms",
+        "view",
+        "origin",
+        "sql",
+        "params",
+        "plan",
+        "analyzed",
+        "vendor",
+        "stack",
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ArchiveManifest)
+class ArchiveManifestAdmin(admin.ModelAdmin):
+    list_display = ["pk", "started_at", "finished_at", "status", "batches"]
+    list_filter = ["status"]
+    date_hierarchy = "started_at"
+    readonly_fields = [
+        "started_at",
+        "finished_at",
+        "status",
+        "retention",
+        "counts",
+        "skipped",
+        "batches",
+        "error",
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,6 +1,8 @@
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.parsers import BaseParser
 from rest_framework.renderers import JSONRenderer
 from rest_framework.throttling import AnonRateThrottle
 import logging
@@ -97,3 +99,50 @@ def throttled_token_obtain_pair_view():
         throttle_classes = [LoginThrottle]
 
     return ThrottledTokenObtainPairView.as_view()
+
+
+class SparseQuerysetMixin:
+    """
+    ViewSet mixin: for reads with ``?fields=``/``?omit=``, defer the model
+    columns the selected serializer fields do not read (see
+    ``core.serializers.SparseFieldsetMixin``). Only the relations those
+    fields traverse are joined, and only the related columns they read are
+    loaded, so e.g. ``?fields=id`` never decrypts the patient's PHI.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not (
+            params.get("fields") or params.get("omit")
+        ):
+            return queryset
+        serializer = self.get_serializer()
+        required = getattr(serializer, "required_columns", None)
+        columns = required() if required else None
+        if columns is None:
+            return queryset
+        traversed = {column.split("__")[0] for column in columns if "__" in column}
+        queryset = queryset.select_related(None)
+        if traversed:
+            queryset = queryset.select_related(*sorted(traversed))
+        return queryset.only(*columns | traversed)
+
+
+class StreamParser(BaseParser):
+    """
+    Hand the raw request body to the view as a stream instead of reading it
+    into memory, for endpoints that process large uploads incrementally.
+    ``request.data`` is the stream itself.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class CSVStreamParser(StreamParser):
+    media_type = "text/csv"
+
+
+class NDJSONStreamParser(StreamParser):
+    media_type = "application/x-ndjson"
@@ -10,3 +10,5 @@ class CoreConfig(AppConfig):
         from simple_history import register
 
         register(User, app="core")
+
+        import core.signals  # noqa: F401
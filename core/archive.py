@@ -0,0 +1,254 @@
+"""
+Archival of long-soft-deleted rows.
+
+``RemediumBaseModel.delete()`` only flags rows, so dead data stays in the hot
+tables and their indexes. ``archive_deleted()`` moves rows that have been
+soft-deleted for longer than their retention period into ``ArchivedRecord``
+(serialized and encrypted as a whole) and removes them from their table, in
+bounded batches of one transaction each. Each run is recorded in an
+``ArchiveManifest``.
+
+Foreign keys stay consistent because removal goes through Django's deletion
+``Collector``: rows that would be cascaded are archived together with their
+parent, and foreign keys that would be set to NULL are recorded so
+``restore_manifest()`` can re-link them. A row whose cascade would remove a
+*live* (not soft-deleted) row is left in place and counted as skipped.
+
+Rows soft-deleted without a ``deleted_at`` timestamp are never archived,
+since their age is unknown.
+"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import ProtectedError, QuerySet, RestrictedError
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from core.models import ArchivedRecord, ArchiveManifest, RemediumBaseModel
+
+DEFAULT_RETENTION_DAYS = 365
+BATCH_SIZE = 500
+
+
+def archivable_models():
+    """Concrete soft-delete models, keyed by lowercased label."""
+    return {
+        model._meta.label_lower: model
+        for model in apps.get_models()
+        if issubclass(model, RemediumBaseModel) and not model._meta.abstract
+    }
+
+
+def retention_days(label):
+    """Days a soft-deleted row of ``label`` is kept before archiving."""
+    configured = getattr(settings, "ARCHIVE_RETENTION_DAYS", {})
+    return configured.get(label, configured.get("default", DEFAULT_RETENTION_DAYS))
+
+
+def _is_live(obj):
+    return isinstance(obj, RemediumBaseModel) and not obj.is_deleted
+
+
+def _collect(objs):
+    """
+    Return a sorted Collector for removing ``objs``, or ``None`` if that is
+    not possible without touching live rows (or PROTECT/RESTRICT relations).
+    """
+    collector = Collector(using=DEFAULT_DB_ALIAS)
+    try:
+        collector.collect(objs)
+    except (ProtectedError, RestrictedError):
+        return None
+    # Fast deletes skip signals and never load rows; load them so they can
+    # be archived and checked like everything else.
+    fast = [list(qs) for qs in collector.fast_deletes]
+    if any(_is_live(obj) for rows in fast for obj in rows):
+        return None
+    if any(_is_live(obj) for rows in collector.data.values() for obj in rows):
+        return None
+    collector.fast_deletes = fast
+    for model in collector.data:
+        collector.data[model] = sorted(collector.data[model], key=lambda obj: obj.pk)
+    collector.sort()
+    return collector
+
+
+def _nullified(collector):
+    """``(label, pk, field attname, original value)`` for SET_NULL-style updates."""
+    updates = []
+    for (field, value), groups in collector.field_updates.items():
+        for group in groups:
+            rows = (
+                group.values_list("pk", field.attname)
+                if isinstance(group, QuerySet)
+                else [(obj.pk, getattr(obj, field.attname)) for obj in group]
+            )
+            for pk, original in rows:
+                updates.append(
+                    [field.model._meta.label_lower, pk, field.attname, original]
+                )
+    return updates
+
+
+def _archive_batch(manifest, objs, sequence):
+    """
+    Archive and remove ``objs`` (plus cascades). Returns
+    ``(archived per label, next sequence)`` or ``None`` when the batch as a
+    whole cannot be removed.
+    """
+    collector = _collect(objs)
+    if collector is None:
+        return None
+
+    # Deletion order: fast deletes first, then models in collector order.
+    ordered = [obj for rows in collector.fast_deletes for obj in rows]
+    for rows in collector.data.values():
+        ordered.extend(reversed(rows))
+    nullified = _nullified(collector)
+
+    records = []
+    counts = {}
+    for obj in ordered:
+        label = obj._meta.label_lower
+        counts[label] = counts.get(label, 0) + 1
+        records.append(
+            ArchivedRecord(
+                manifest=manifest,
+                sequence=sequence,
+                model_label=label,
+                object_pk=str(obj.pk),
+                payload=serializers.serialize("json", [obj]),
+            )
+        )
+        sequence += 1
+    # Re-linking is attached to the first record of the batch.
+    if records:
+        records[0].nullified = nullified
+    ArchivedRecord.objects.bulk_create(records)
+
+    # Restore the lazy querysets Collector.delete() expects.
+    collector.fast_deletes = [
+        rows[0].__class__._base_manager.filter(pk__in=[obj.pk for obj in rows])
+        for rows in collector.fast_deletes
+        if rows
+    ]
+    collector.delete()
+    return counts, sequence
+
+
+def _archive_rows(manifest, label, batch, sequence):
+    """Archive one batch of ``label`` rows, updating the manifest tallies."""
+    results = [_archive_batch(manifest, batch, sequence)]
+    if results[0] is not None:
+        sequence = results[0][1]
+    else:
+        # Fall back to one row at a time to isolate the blockers.
+        results = []
+        for obj in batch:
+            single = _archive_batch(manifest, [obj], sequence)
+            if single is None:
+                manifest.skipped[label] = manifest.skipped.get(label, 0) + 1
+            else:
+                results.append(single)
+                sequence = single[1]
+    for counts, _ in results:
+        for key, value in counts.items():
+            manifest.counts[key] = manifest.counts.get(key, 0) + value
+    return sequence
+
+
+def archive_deleted(
+    batch_size=BATCH_SIZE, max_batches=None, labels=None, dry_run=False
+):
+    """
+    Archive rows soft-deleted longer than their retention period.
+
+    Returns the ``ArchiveManifest`` for the run (unsaved when ``dry_run``, in
+    which case ``counts`` holds the number of eligible root rows).
+    """
+    now = timezone.now()
+    models = {
+        label: model
+        for label, model in archivable_models().items()
+        if not labels or label in labels
+    }
+    manifest = ArchiveManifest(
+        retention={label: retention_days(label) for label in models}
+    )
+    if dry_run:
+        for label, model in models.items():
+            manifest.counts[label] = _eligible(model, now, label).count()
+        return manifest
+    manifest.save()
+
+    sequence = 0
+    try:
+        for label, model in models.items():
+            last_pk = None
+            while max_batches is None or manifest.batches < max_batches:
+                queryset = _eligible(model, now, label).order_by("pk")
+                if last_pk is not None:
+                    queryset = queryset.filter(pk__gt=last_pk)
+                batch = list(queryset[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+                with transaction.atomic():
+                    sequence = _archive_rows(manifest, label, batch, sequence)
+                    manifest.batches += 1
+                    manifest.save(update_fields=["counts", "skipped", "batches"])
+    except Exception as exc:
+        manifest.status = "FAILED"
+        manifest.error = f"{exc.__class__.__name__}: {exc}"
+        manifest.finished_at = timezone.now()
+        manifest.save(update_fields=["status", "error", "finished_at"])
+        raise
+    manifest.status = "COMPLETED"
+    manifest.finished_at = timezone.now()
+    manifest.save(update_fields=["status", "finished_at"])
+    return manifest
+
+
+def _eligible(model, now, label):
+    cutoff = now - timedelta(days=retention_days(label))
+    return model.all_objects.filter(is_deleted=True, deleted_at__lt=cutoff)
+
+
+def restore_manifest(manifest, label=None, object_pk=None):
+    """
+    Re-insert archived rows of ``manifest`` (optionally one model / one row)
+    in reverse deletion order and re-link nullified foreign keys.
+
+    Rows come back exactly as archived, i.e. still soft-deleted. Returns the
+    number of rows restored.
+    """
+    records = manifest.records.filter(restored_at__isnull=True)
+    if label:
+        records = records.filter(model_label=label)
+    if object_pk is not None:
+        records = records.filter(object_pk=str(object_pk))
+
+    restored = 0
+    with transaction.atomic():
+        for record in records.order_by("-sequence"):
+            for deserialized in serializers.deserialize("json", record.payload):
+                deserialized.save()
+            record.restored_at = timezone.now()
+            record.save(update_fields=["restored_at"])
+            restored += 1
+        relinked = manifest.records.filter(restored_at__isnull=False).exclude(
+            nullified=[]
+        )
+        for record in relinked:
+            for model_label, pk, attname, original in record.nullified:
+                model = apps.get_model(model_label)
+                target = model._meta.get_field(attname).related_model
+                if target._base_manager.filter(pk=original).exists():
+                    model._base_manager.filter(
+                        pk=pk, **{f"{attname}__isnull": True}
+                    ).update(**{attname: original})
+    return restored
@@ -0,0 +1,142 @@
+"""
+Unified audit stream across every django-simple-history table.
+
+Each historical model is queried with the same keyset condition on
+``(history_date, model label, history_id)``, newest first, reading at most
+``page_size + 1`` keys per table; the per-table results are k-way merged in
+Python and only the rows that made the page are loaded in full. Every table
+query is an index range scan on ``(history_date, history_id)`` (or
+``(history_user, history_date)`` when filtering by user; see
+``core.models.AuditedHistoricalRecords``), so a page months back costs the
+same as the first one.
+"""
+
+import heapq
+from dataclasses import dataclass
+from itertools import islice
+
+from django.apps import apps
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from simple_history.models import HistoricalChanges
+
+from core.pagination import decode_cursor, encode_cursor
+
+PAGE_SIZE = 50
+
+
+@dataclass
+class AuditPage:
+    entries: list
+    older_cursor: str = None
+    newer_cursor: str = None
+
+
+def history_models():
+    """Historical models keyed by the lowercased label of the tracked model."""
+    found = {
+        model.instance_type._meta.label_lower: model
+        for model in apps.get_models()
+        if issubclass(model, HistoricalChanges)
+    }
+    return dict(sorted(found.items()))
+
+
+def parse_audit_cursor(token):
+    """Decode a cursor into ``(history_date, label, history_id)``."""
+    values = decode_cursor(token)
+    if len(values) != 3:
+        raise ValueError("Invalid cursor.")
+    history_date = parse_datetime(values[0]) if isinstance(values[0], str) else None
+    if history_date is None or not isinstance(values[1], str):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values[2], int):
+        raise ValueError("Invalid cursor.")
+    return history_date, values[1], values[2]
+
+
+def _keyset_q(label, cursor, newer):
+    """Rows of table ``label`` strictly after ``cursor`` in the walk direction."""
+    date, cursor_label, cursor_id = cursor
+    if newer:
+        if label < cursor_label:
+            return Q(history_date__gt=date)
+        if label > cursor_label:
+            return Q(history_date__gte=date)
+        return Q(history_date__gt=date) | Q(history_date=date, history_id__gt=cursor_id)
+    if label < cursor_label:
+        return Q(history_date__lte=date)
+    if label > cursor_label:
+        return Q(history_date__lt=date)
+    return Q(history_date__lt=date) | Q(history_date=date, history_id__lt=cursor_id)
+
+
+def audit_page(
+    before=None,
+    after=None,
+    models=None,
+    user_id=None,
+    since=None,
+    until=None,
+    page_size=PAGE_SIZE,
+):
+    """
+    Return one page of the merged audit stream, newest first.
+
+    ``before`` walks back in time from a cursor and ``after`` forward; both
+    are tokens from a previous ``AuditPage``. ``models`` limits the stream to
+    the given model labels (``"patients.patient"``), ``user_id`` to changes
+    made by one user and ``since``/``until`` to a half-open datetime range.
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    registry = history_models()
+    labels = [label for label in registry if not models or label in models]
+    newer = after is not None
+    cursor = parse_audit_cursor(after if newer else before) if (after or before) else None
+    order = ("history_date", "history_id") if newer else ("-history_date", "-history_id")
+
+    streams = []
+    for label in labels:
+        queryset = registry[label].objects.all()
+        if user_id:
+            queryset = queryset.filter(history_user_id=user_id)
+        if since:
+            queryset = queryset.filter(history_date__gte=since)
+        if until:
+            queryset = queryset.filter(history_date__lt=until)
+        if cursor:
+            queryset = queryset.filter(_keyset_q(label, cursor, newer))
+        rows = queryset.order_by(*order).values_list("history_date", "history_id")
+        streams.append([(date, label, pk) for date, pk in rows[: page_size + 1]])
+
+    keys = list(islice(heapq.merge(*streams, reverse=not newer), page_size + 1))
+    has_more = len(keys) > page_size
+    keys = keys[:page_size]
+    if newer:
+        keys.reverse()
+
+    page = AuditPage(entries=_load_entries(registry, keys))
+    if keys:
+        if has_more or newer:
+            page.older_cursor = encode_cursor(keys[-1])
+        if (has_more and newer) or (cursor and not newer):
+            page.newer_cursor = encode_cursor(keys[0])
+    return page
+
+
+def _load_entries(registry, keys):
+    """Fetch the full historical rows for ``keys``, one query per table."""
+    wanted = {}
+    for _, label, pk in keys:
+        wanted.setdefault(label, []).append(pk)
+    loaded = {}
+    for label, pks in wanted.items():
+        model = registry[label]
+        name = model.instance_type._meta.verbose_name.title()
+        for entry in model.objects.filter(history_id__in=pks).select_related(
+            "history_user"
+        ):
+            entry.model_label = label
+            entry.model_name = name
+            loaded[(label, entry.history_id)] = entry
+    return [loaded[(label, pk)] for _, label, pk in keys if (label, pk) in loaded]
@@ -0,0 +1,182 @@
+"""
+Latency and query-count benchmarks for the hot HTML and API endpoints.
+
+Requests go through the full middleware stack with Django's test client
+against whatever database is configured, so run ``seed_demo --scale N`` first
+to benchmark against production-sized data. The whole run happens in a
+transaction that is rolled back, so the benchmark users, their sessions and
+anything the requests write are discarded. Results are plain dicts that
+``core.management.commands.benchmark`` writes as JSON and compares between
+commits.
+"""
+
+import math
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.roles import invalidate_role_flags
+from patients.models import Patient
+from staff.models import Staff
+
+DASHBOARD_ROLES = [
+    "ADMIN",
+    "DOCTOR",
+    "NURSE",
+    "RECEPTIONIST",
+    "PHARMACIST",
+    "LAB_TECH",
+    "SURGEON",
+]
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def bench_user(role):
+    """Get or create the benchmark user for ``role`` (superuser for ``None``)."""
+    username = f"bench_{(role or 'superuser').lower()}"
+    user, created = User.objects.get_or_create(username=username)
+    if created:
+        user.set_unusable_password()
+        user.is_superuser = user.is_staff = role is None
+        user.save()
+    if role and not Staff.objects.filter(user=user).exists():
+        Staff.objects.create(
+            user=user,
+            staff_id=f"BENCH_{role}"[:20],
+            first_name="Bench",
+            last_name=role.title(),
+            role=role,
+        )
+    return user
+
+
+def endpoints():
+    """
+    ``(name, role, url)`` for every benchmarked endpoint.
+
+    ``role`` is the staff role to log in as, or ``None`` for a superuser.
+    """
+    patient = Patient.objects.order_by("-pk").first()
+    search_term = patient.last_name if patient else "Smith"
+    cases = [
+        (f"homepage[{role.lower()}]", role, reverse("home")) for role in DASHBOARD_ROLES
+    ]
+    cases += [
+        (
+            "patient_list[search]",
+            None,
+            f"{reverse('patient_list')}?q={search_term}",
+        ),
+        ("invoice_api[list]", None, reverse("invoice-list")),
+        ("appointment_api[upcoming]", None, reverse("appointment-upcoming")),
+        ("doctor_availability", None, reverse("doctor_availability")),
+        ("occupancy_map", None, reverse("hospital:occupancy_map")),
+        ("ward_api[occupancy]", None, reverse("ward-occupancy")),
+    ]
+    if patient:
+        cases.append(
+            ("patient_detail", None, reverse("patient_detail", args=[patient.pk]))
+        )
+    return cases
+
+
+def run(iterations=20, warmup=2, only=None):
+    """
+    Benchmark every endpoint; returns ``{name: result}``. Nothing the run
+    writes to the database is kept.
+    """
+    results = {}
+    clients = {}
+    users = []
+    try:
+        with transaction.atomic():
+            try:
+                for name, role, url in endpoints():
+                    if only and not any(pattern in name for pattern in only):
+                        continue
+                    if role not in clients:
+                        user = bench_user(role)
+                        users.append(user.pk)
+                        client = Client(raise_request_exception=False)
+                        client.force_login(user)
+                        clients[role] = client
+                    results[name] = measure(clients[role], url, iterations, warmup)
+            finally:
+                # Flushes cached sessions too; the database rows roll back.
+                for client in clients.values():
+                    client.logout()
+                transaction.set_rollback(True)
+    finally:
+        # The rolled-back user ids may be handed out again.
+        invalidate_role_flags(*users)
+    return results
+
+
+def measure(client, url, iterations, warmup):
+    """Time ``iterations`` GETs of ``url`` after ``warmup`` untimed ones."""
+    for _ in range(warmup):
+        client.get(url)
+    timings, queries, statuses = [], [], set()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+    result = {
+        "url": url,
+        "iterations": iterations,
+        "status": sorted(statuses),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "queries": max(queries),
+    }
+    for pct in PERCENTILES:
+        result[f"p{pct}_ms"] = round(percentile(timings, pct), 2)
+    return result
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compare two result dicts; returns ``(rows, regressions)``.
+
+    A regression is a p95 slower than ``threshold`` (a fraction) or any
+    increase in the query count.
+    """
+    rows, regressions = [], []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append((name, None, result["p95_ms"], None, result["queries"]))
+            continue
+        change = (
+            (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+            if before["p95_ms"]
+            else 0.0
+        )
+        rows.append(
+            (
+                name,
+                before["p95_ms"],
+                result["p95_ms"],
+                before["queries"],
+                result["queries"],
+            )
+        )
+        if change > threshold or result["queries"] > before["queries"]:
+            regressions.append(name)
+    return rows, regressions
@@ -0,0 +1,64 @@
+"""
+Blind indexes for encrypted columns.
+
+``Encrypted*Field`` values are Fernet ciphertexts with a random IV, so the
+database cannot compare them and every lookup would have to decrypt the whole
+table. A blind index is a keyed HMAC of the normalized plaintext, stored in
+an ordinary indexed column next to the ciphertext: equal values give equal
+digests, so exact-match lookups become a B-tree lookup, while the digest
+reveals nothing about the value without the key.
+
+Digests are truncated to 128 bits, which keeps the column small and is
+still far beyond collision range for any realistic table.
+
+The key is ``settings.BLIND_INDEX_KEY`` or, when unset, one derived from
+``FIELD_ENCRYPTION_KEY``. Changing it invalidates every stored digest; run
+``manage.py backfill_blind_indexes`` afterwards.
+"""
+
+import hashlib
+import hmac
+import re
+
+from django.conf import settings
+
+DIGEST_LENGTH = 32
+
+
+def normalize_phone(value):
+    """Digits only, so ``+1 (555) 010-2030`` and ``15550102030`` match."""
+    return re.sub(r"\D", "", value or "")
+
+
+def normalize_email(value):
+    return (value or "").strip().lower()
+
+
+NORMALIZERS = {
+    "phone": normalize_phone,
+    "email": normalize_email,
+}
+
+
+def _key():
+    configured = getattr(settings, "BLIND_INDEX_KEY", "")
+    if configured:
+        return configured.encode()
+    return hmac.new(
+        settings.FIELD_ENCRYPTION_KEY.encode(), b"remedium-blind-index", hashlib.sha256
+    ).digest()
+
+
+def blind_index(value, kind):
+    """
+    Return the digest of ``value`` as a ``kind`` (``"phone"``/``"email"``),
+    or ``None`` if it normalizes to nothing.
+
+    Values of the same kind share a digest space, so a caller's number can be
+    matched against several phone columns with one digest.
+    """
+    normalized = NORMALIZERS[kind](value)
+    if not normalized:
+        return None
+    message = f"{kind}:{normalized}".encode()
+    return hmac.new(_key(), message, hashlib.sha256).hexdigest()[:DIGEST_LENGTH]
@@ -0,0 +1,150 @@
+"""
+Cascading soft-delete and restore.
+
+``RemediumBaseModel.delete()`` flags a single row, leaving everything that
+hangs off it (a patient's appointments, invoices, care records, ...) live.
+``soft_delete()`` and ``restore()`` walk the ``on_delete=CASCADE`` reverse
+relations between soft-delete models and flag the whole tree with one
+``UPDATE`` per table and chunk, writing the matching history rows with
+``bulk_history_create``, all in one transaction.
+
+Every row in one cascade gets the same ``deleted_at``. ``restore()`` relies on
+that: a child is only restored together with its parent when it was deleted
+at the same instant, so rows that had been deleted on their own before stay
+deleted.
+
+Like queryset ``update()``, the cascade does not send ``post_save`` signals;
+dashboard snapshots are invalidated here instead.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import CASCADE, F
+from django.utils import timezone
+from simple_history.exceptions import NotHistoricalModelError
+from simple_history.utils import get_history_manager_for_model
+
+from core import snapshots
+from core.models import RemediumBaseModel
+
+CHUNK_SIZE = 500
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    values = sorted(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def cascade_relations(model):
+    """Reverse ``CASCADE`` foreign keys from soft-delete models onto ``model``."""
+    return [
+        relation.field
+        for relation in model._meta.related_objects
+        if relation.on_delete is CASCADE
+        and not relation.many_to_many
+        and issubclass(relation.related_model, RemediumBaseModel)
+    ]
+
+
+def _as_roots(objs):
+    """Group model instances (or a queryset) into ``{model: {pk, ...}}``."""
+    roots = defaultdict(set)
+    for obj in objs:
+        roots[type(obj)].add(obj.pk)
+    return roots
+
+
+def collect(roots, restoring=False):
+    """
+    Return ``{model: {pk, ...}}`` for ``roots`` and every row that cascades
+    from them.
+
+    When deleting, only live rows are followed. When restoring, only deleted
+    children whose ``deleted_at`` equals their parent's are followed.
+    """
+    plan = defaultdict(set)
+    queue = list(roots.items())
+    while queue:
+        model, pks = queue.pop()
+        new = set(pks) - plan[model]
+        if not new:
+            continue
+        plan[model] |= new
+        for field in cascade_relations(model):
+            child = field.model
+            if restoring:
+                state = {
+                    "is_deleted": True,
+                    "deleted_at": F(f"{field.name}__deleted_at"),
+                }
+            else:
+                state = {"is_deleted": False}
+            for chunk in _chunks(new):
+                child_pks = child.all_objects.filter(
+                    **{f"{field.attname}__in": chunk}, **state
+                ).values_list("pk", flat=True)
+                queue.append((child, set(child_pks)))
+    return plan
+
+
+def _apply(plan, values, user, reason):
+    now = values["updated_at"]
+    counts = {}
+    with transaction.atomic():
+        for model, pks in plan.items():
+            if not pks:
+                continue
+            try:
+                history = get_history_manager_for_model(model)
+            except NotHistoricalModelError:
+                history = None
+            for chunk in _chunks(pks):
+                rows = model.all_objects.filter(pk__in=chunk)
+                rows.update(**values)
+                if history is not None:
+                    history.bulk_history_create(
+                        rows,
+                        update=True,
+                        default_user=user,
+                        default_change_reason=reason,
+                        default_date=now,
+                    )
+            counts[model._meta.label_lower] = len(pks)
+            snapshots.invalidate(model._meta.label)
+    return counts
+
+
+def soft_delete(objs, user=None, reason="Cascade soft-delete"):
+    """
+    Soft-delete ``objs`` (instances or a queryset) and everything that
+    cascades from them. Rows that are already deleted are left untouched.
+
+    Returns the number of rows flagged per model label.
+    """
+    roots = _as_roots(obj for obj in objs if not obj.is_deleted)
+    now = timezone.now()
+    plan = collect(roots)
+    return _apply(
+        plan,
+        {"is_deleted": True, "deleted_at": now, "updated_at": now},
+        user,
+        reason,
+    )
+
+
+def restore(objs, user=None, reason="Cascade restore"):
+    """
+    Restore ``objs`` and the rows that were soft-deleted in the same cascade.
+
+    Returns the number of rows restored per model label.
+    """
+    roots = _as_roots(obj for obj in objs if obj.is_deleted)
+    plan = collect(roots, restoring=True)
+    return _apply(
+        plan,
+        {"is_deleted": False, "deleted_at": None, "updated_at": timezone.now()},
+        user,
+        reason,
+    )
@@ -0,0 +1,282 @@
+"""
+Dashboard aggregation helpers.
+
+Per-day chart series are produced by a single ``GROUP BY`` date query per
+model, and scalar counters by a single conditional-aggregate query per model,
+so the number of round trips does not grow with the chart window or with the
+number of stat cards.
+
+The ``*_stats`` functions at the bottom build the JSON-serializable counter
+set for each dashboard section; they are what ``core.snapshots`` materializes.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, DateTimeField, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from appointments.models import Appointment
+from billing.models import Invoice
+from care_monitoring.models import PatientCare
+from inventory.models import InventoryItem
+from laboratory.models import LabTest
+from patients.models import Patient
+from pharmacy.models import Prescription
+from staff.models import Staff
+from surgery.models import Surgery
+
+DAY_NAMES = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
+
+
+def last_n_days(today, days=7):
+    """Return the ``days`` calendar dates ending with ``today``, oldest first."""
+    return [today - timedelta(days=i) for i in range(days - 1, -1, -1)]
+
+
+def day_bounds(first_day, last_day):
+    """Return aware datetimes covering ``first_day`` 00:00 to ``last_day`` 24:00."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end = timezone.make_aware(
+        datetime.combine(last_day + timedelta(days=1), time.min), tz
+    )
+    return start, end
+
+
+def daily_series(queryset, date_field, days, aggregate=None):
+    """
+    Aggregate ``queryset`` per calendar day in a single grouped query.
+
+    ``days`` is an ordered list of dates; the result is a list of the same
+    length with ``0`` for days that have no rows. ``aggregate`` defaults to a
+    row count. Works for both ``DateField`` and ``DateTimeField`` columns;
+    datetime columns are filtered on a half-open range so the column index can
+    be used, then truncated to the current timezone's date for grouping.
+    """
+    aggregate = aggregate if aggregate is not None else Count("pk")
+    field = queryset.model._meta.get_field(date_field)
+
+    if isinstance(field, DateTimeField):
+        start, end = day_bounds(days[0], days[-1])
+        queryset = queryset.filter(
+            **{f"{date_field}__gte": start, f"{date_field}__lt": end}
+        ).annotate(day=TruncDate(date_field))
+    else:
+        queryset = queryset.filter(
+            **{f"{date_field}__range": (days[0], days[-1])}
+        ).annotate(day=F(date_field))
+
+    # order_by() drops Meta.ordering so it does not leak into the GROUP BY.
+    rows = queryset.order_by().values("day").annotate(value=aggregate)
+    totals = {row["day"]: row["value"] for row in rows}
+    return [totals.get(day) or 0 for day in days]
+
+
+# ---------------------------------------------------------------------------
+# Per-model counters (one query each)
+# ---------------------------------------------------------------------------
+
+
+def patient_counters():
+    """Total, currently admitted and discharged patients."""
+    return Patient.objects.aggregate(
+        total_patients=Count("pk"),
+        admitted_patients=Count(
+            "pk", filter=Q(admission_date__isnull=False, discharge_date__isnull=True)
+        ),
+        discharged_patients=Count("pk", filter=Q(discharge_date__isnull=False)),
+    )
+
+
+def appointment_counters(today):
+    """Today's scheduled and completed appointments."""
+    start, end = day_bounds(today, today)
+    return Appointment.objects.filter(
+        appointment_date__gte=start, appointment_date__lt=end
+    ).aggregate(
+        today_appointments=Count("pk", filter=Q(status="Scheduled")),
+        completed_today=Count("pk", filter=Q(status="Completed")),
+    )
+
+
+def invoice_counters():
+    """Paid/unpaid invoice counts and collected revenue."""
+    return Invoice.objects.aggregate(
+        paid_invoices=Count("pk", filter=Q(paid=True)),
+        unpaid_invoices=Count("pk", filter=Q(paid=False)),
+        total_revenue=Coalesce(
+            Sum("total_amount", filter=Q(paid=True)),
+            Value(0),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+def staff_counters():
+    """Active staff headcount."""
+    counters = Staff.objects.aggregate(active_staff=Count("pk", filter=Q(is_active=True)))
+    counters["on_duty_today"] = counters["active_staff"]
+    return counters
+
+
+def weekly_charts(today):
+    """Seven-day revenue and appointment series for the admin dashboard charts."""
+    days = last_n_days(today, 7)
+    revenue = daily_series(
+        Invoice.objects.filter(paid=True),
+        "issue_date",
+        days,
+        aggregate=Sum("total_amount"),
+    )
+    return {
+        "chart_day_labels": [DAY_NAMES[day.weekday()] for day in days],
+        "chart_revenue_data": [float(value) for value in revenue],
+        "chart_appointments_data": daily_series(
+            Appointment.objects.all(), "appointment_date", days
+        ),
+    }
+
+
+def department_stats(limit=5):
+    """Largest departments by headcount, with a percentage of the largest."""
+    dept_stats = list(
+        Staff.objects.values("department")
+        .annotate(count=Count("id"))
+        .order_by("-count")[:limit]
+    )
+    if dept_stats:
+        max_count = dept_stats[0]["count"]
+        for d in dept_stats:
+            d["pct"] = int(d["count"] / max_count * 100) if max_count else 0
+    return dept_stats
+
+
+# ---------------------------------------------------------------------------
+# Per-section stats (materialized by core.snapshots)
+# ---------------------------------------------------------------------------
+
+
+def common_stats(today):
+    """Counters shown on every role's dashboard."""
+    stats = patient_counters()
+    stats.update(appointment_counters(today))
+    return stats
+
+
+def admin_stats(today):
+    """Counters and chart series for the Admin dashboard."""
+    stats = invoice_counters()
+    stats.update(staff_counters())
+    stats.update(weekly_charts(today))
+    stats["dept_stats"] = department_stats()
+    return stats
+
+
+def doctor_stats(today, staff_profile):
+    """Counters for one doctor's dashboard."""
+    start, end = day_bounds(today, today)
+    stats = Appointment.objects.filter(doctor=staff_profile).aggregate(
+        my_pending_appointments=Count(
+            "pk",
+            filter=Q(
+                appointment_date__gte=start,
+                appointment_date__lt=end,
+                status="Scheduled",
+            ),
+        ),
+        my_patient_count=Count("patient", distinct=True),
+    )
+    stats["active_care_count"] = PatientCare.objects.filter(
+        status__in=["STABLE", "CRITICAL"]
+    ).count()
+    stats["my_prescriptions_count"] = Prescription.objects.filter(
+        prescribed_by=staff_profile
+    ).count()
+    return stats
+
+
+def nurse_stats(today):
+    """Counters for the Nurse dashboard."""
+    stats = PatientCare.objects.aggregate(
+        active_care_count=Count("pk", filter=Q(status__in=["STABLE", "CRITICAL"])),
+        critical_count=Count("pk", filter=Q(status="CRITICAL")),
+        stable_count=Count("pk", filter=Q(status="STABLE")),
+    )
+    week_start, _ = day_bounds(today - timedelta(days=7), today)
+    stats["recent_admissions_count"] = Patient.objects.filter(
+        admission_date__gte=week_start
+    ).count()
+    return stats
+
+
+def receptionist_stats(today):
+    """Counters for the Receptionist dashboard."""
+    week_start, _ = day_bounds(today - timedelta(days=7), today)
+    return {
+        "available_doctors": Staff.objects.filter(
+            role="DOCTOR", is_active=True
+        ).count(),
+        "new_patients_7days": Patient.objects.filter(
+            admission_date__gte=week_start
+        ).count(),
+        "checked_in_count": appointment_counters(today)["today_appointments"],
+    }
+
+
+def pharmacist_stats(today):
+    """Counters for the Pharmacist dashboard."""
+    start, end = day_bounds(today, today)
+    stats = Prescription.objects.aggregate(
+        active_prescriptions=Count("pk", filter=Q(status="Active")),
+        new_prescriptions_today=Count(
+            "pk", filter=Q(prescribed_date__gte=start, prescribed_date__lt=end)
+        ),
+    )
+    stats["pending_dispense"] = stats["active_prescriptions"]
+    stats["dispensed_today"] = stats["new_prescriptions_today"]
+    stats["low_stock_count"] = InventoryItem.objects.filter(
+        quantity__lte=F("reorder_level")
+    ).count()
+    return stats
+
+
+def labtech_stats(today):
+    """Counters for the Lab Technician dashboard."""
+    start, end = day_bounds(today, today)
+    requested_today = Q(requested_date__gte=start, requested_date__lt=end)
+    return LabTest.objects.aggregate(
+        pending_tests=Count("pk", filter=Q(status="Requested")),
+        completed_today=Count("pk", filter=requested_today & Q(status="Completed")),
+        in_progress_tests=Count("pk", filter=Q(status="In Progress")),
+        requests_today=Count("pk", filter=requested_today),
+    )
+
+
+def surgeon_stats(today, staff_profile=None):
+    """
+    Counters for Surgeon / Anesthesiologist dashboards.
+
+    ``staff_profile`` restricts the counts to one surgeon; ``None`` covers all
+    surgeries (used for anesthesiologists).
+    """
+    queryset = Surgery.objects.all()
+    if staff_profile is not None:
+        queryset = queryset.filter(surgeon=staff_profile)
+    start, end = day_bounds(today, today)
+    week_start, _ = day_bounds(today - timedelta(days=7), today)
+    stats = queryset.aggregate(
+        upcoming_surgeries_count=Count(
+            "pk", filter=Q(scheduled_date__gte=timezone.now())
+        ),
+        surgeries_today=Count(
+            "pk", filter=Q(scheduled_date__gte=start, scheduled_date__lt=end)
+        ),
+        completed_surgeries_7days=Count(
+            "pk", filter=Q(scheduled_date__gte=week_start, status="Completed")
+        ),
+        my_patient_count=Count("patient", distinct=True),
+        pre_op_count=Count("pk", filter=Q(status="Scheduled")),
+    )
+    stats["consult_count"] = 0
+    return stats
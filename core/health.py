@@ -0,0 +1,153 @@
+"""
+Dependency probes behind the liveness and readiness endpoints.
+
+Each probe returns a JSON-serializable dict with a ``status`` of ``ok``,
+``slow`` or ``error`` plus its measured latency, so load balancers and
+dashboards get numbers rather than a bare "connected". A probe slower than
+its ``HEALTH_*_LATENCY_MS`` budget marks the instance not ready, taking it
+out of rotation instead of letting it accept traffic it cannot serve.
+
+Failures carry a generic ``error`` code; the exception message, connection
+settings and pending migration names go in the remaining keys, which
+``public()`` strips for anonymous callers. The exceptions are logged.
+"""
+
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+
+logger = logging.getLogger(__name__)
+
+# What a cache backend raises when its server is unreachable: socket errors
+# for memcached and file caches, RedisError for django-redis.
+CACHE_ERRORS = (OSError,)
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover - Redis is optional
+    pass
+else:
+    CACHE_ERRORS += (RedisError,)
+
+# Keys of a check that anonymous callers see.
+PUBLIC_KEYS = ("status", "latency_ms", "error")
+
+# Set once the applied migrations match the code; a deploy restarts workers,
+# so a clean result does not need to be recomputed for the process lifetime.
+_migrations_clean = {}
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _status(latency_ms, budget_ms):
+    return "ok" if latency_ms <= budget_ms else "slow"
+
+
+def probe_database(alias=DEFAULT_DB_ALIAS):
+    """Time ``SELECT 1`` and report whether the connection was reused."""
+    connection = connections[alias]
+    reused = connection.connection is not None
+    result = {
+        "vendor": connection.vendor,
+        "reused_connection": reused,
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE", 0),
+        "conn_health_checks": connection.settings_dict.get("CONN_HEALTH_CHECKS", False),
+    }
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError as exc:
+        logger.exception("Readiness probe: database unavailable")
+        result.update(
+            status="error",
+            error="database_unavailable",
+            detail=str(exc),
+            latency_ms=_elapsed_ms(started),
+        )
+        return result
+    latency = _elapsed_ms(started)
+    result.update(
+        status=_status(latency, settings.HEALTH_DB_LATENCY_MS), latency_ms=latency
+    )
+    return result
+
+
+def probe_cache():
+    """Time a set/get/delete round trip on the default cache."""
+    key = f"health:probe:{uuid.uuid4().hex}"
+    result = {"backend": settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]}
+    started = time.perf_counter()
+    try:
+        cache.set(key, "1", timeout=10)
+        round_trip = cache.get(key) == "1"
+        cache.delete(key)
+    except CACHE_ERRORS as exc:
+        logger.exception("Readiness probe: cache unavailable")
+        result.update(
+            status="error",
+            error="cache_unavailable",
+            detail=str(exc),
+            latency_ms=_elapsed_ms(started),
+        )
+        return result
+    latency = _elapsed_ms(started)
+    if not round_trip:
+        logger.error("Readiness probe: cache value not read back")
+        result.update(
+            status="error",
+            error="cache_unavailable",
+            detail="value not read back",
+            latency_ms=latency,
+        )
+        return result
+    result.update(
+        status=_status(latency, settings.HEALTH_CACHE_LATENCY_MS), latency_ms=latency
+    )
+    return result
+
+
+def probe_migrations(alias=DEFAULT_DB_ALIAS):
+    """Report migrations present in the code but not applied to the database."""
+    if _migrations_clean.get(alias):
+        return {"status": "ok", "pending": []}
+    try:
+        executor = MigrationExecutor(connections[alias])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    except DatabaseError as exc:
+        logger.exception("Readiness probe: migration state unavailable")
+        return {"status": "error", "error": "database_unavailable", "detail": str(exc)}
+    pending = [f"{migration.app_label}.{migration.name}" for migration, _ in plan]
+    _migrations_clean[alias] = not pending
+    if pending:
+        return {"status": "error", "error": "pending_migrations", "pending": pending}
+    return {"status": "ok", "pending": pending}
+
+
+def public(report):
+    """``report`` reduced to statuses, latencies and error codes."""
+    return {
+        "status": report["status"],
+        "checks": {
+            name: {key: check[key] for key in PUBLIC_KEYS if key in check}
+            for name, check in report["checks"].items()
+        },
+    }
+
+
+def readiness():
+    """Run every probe; returns ``(ready, report)`` with full details."""
+    checks = {
+        "database": probe_database(),
+        "cache": probe_cache(),
+        "migrations": probe_migrations(),
+    }
+    ready = all(check["status"] == "ok" for check in checks.values())
+    return ready, {"status": "ready" if ready else "unready", "checks": checks}
@@ -0,0 +1,95 @@
+"""
+Archive rows that have been soft-deleted longer than their retention period.
+
+Rows are moved into ArchivedRecord in batches of one transaction each and
+removed from their tables; see core.archive. Retention per model comes from
+settings.ARCHIVE_RETENTION_DAYS.
+
+Usage:
+    python manage.py archive_deleted --dry-run
+    python manage.py archive_deleted --batch-size 500 --max-batches 20
+    python manage.py archive_deleted --loop 3600   # run as a worker, hourly
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = "Move long-soft-deleted rows into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=archive.BATCH_SIZE,
+            help="Root rows per batch/transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (per run).",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            metavar="APP_LABEL.MODEL",
+            help="Only archive this model (repeatable).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report eligible rows without archiving anything.",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running and archive every SECONDS seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        labels = [label.lower() for label in options["models"] or []]
+        unknown = set(labels) - set(archive.archivable_models())
+        if unknown:
+            raise CommandError(f"Not a soft-delete model: {', '.join(sorted(unknown))}")
+
+        while True:
+            manifest = archive.archive_deleted(
+                batch_size=options["batch_size"],
+                max_batches=options["max_batches"],
+                labels=labels,
+                dry_run=options["dry_run"],
+            )
+            self._report(manifest, options["dry_run"])
+            if not options["loop"] or options["dry_run"]:
+                break
+            time.sleep(options["loop"])
+
+    def _report(self, manifest, dry_run):
+        for label, count in sorted(manifest.counts.items()):
+            if count:
+                self.stdout.write(f"  {label}: {count}")
+        for label, count in sorted(manifest.skipped.items()):
+            self.stdout.write(
+                self.style.WARNING(f"  {label}: {count} skipped (live dependents)")
+            )
+        total = sum(manifest.counts.values())
+        if dry_run:
+            self.stdout.write(
+                self.style.SUCCESS(f"{total} rows eligible for archiving.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Archive run {manifest.pk}: {total} rows in {manifest.batches} batches."
+                )
+            )
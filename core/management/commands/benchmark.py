@@ -0,0 +1,137 @@
+"""
+Benchmark hot HTML and API endpoints.
+
+Measures latency percentiles and query counts for each role's homepage,
+patient search and detail, the invoice and upcoming-appointment APIs, doctor
+availability and the occupancy map, against the configured database. The
+run is rolled back when it finishes, but it still opens a long transaction,
+so it refuses to run outside DEBUG unless given --allow-write.
+
+Usage:
+    python manage.py seed_demo --scale 100000
+    python manage.py benchmark --output bench/main.json
+    python manage.py benchmark --compare bench/main.json --fail-on-regression
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core import benchmarks
+from patients.models import Patient
+
+
+class Command(BaseCommand):
+    help = "Measure latency percentiles and query counts of hot endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--only",
+            nargs="*",
+            metavar="NAME",
+            help="Only run endpoints whose name contains one of these strings.",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20.0,
+            help="Allowed p95 slowdown in percent before flagging a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error if any endpoint regressed.",
+        )
+        parser.add_argument(
+            "--allow-write",
+            action="store_true",
+            help="Run even though DEBUG is off (e.g. against a staging copy).",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["allow_write"]:
+            raise CommandError(
+                "Refusing to benchmark with DEBUG off; the run creates users and "
+                "sessions in the configured database (rolled back afterwards). "
+                "Pass --allow-write to run anyway."
+            )
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            SECURE_SSL_REDIRECT=False,
+        ):
+            results = benchmarks.run(
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                only=options["only"],
+            )
+
+        self.stdout.write(
+            f"{'endpoint':32} {'status':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8}"
+        )
+        for name, result in results.items():
+            status = ",".join(str(code) for code in result["status"])
+            self.stdout.write(
+                f"{name:32} {status:>8} {result['p50_ms']:>7.1f}ms "
+                f"{result['p95_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms "
+                f"{result['queries']:>8}"
+            )
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps({"meta": self._meta(), "results": results}, indent=2)
+            )
+            self.stdout.write(self.style.SUCCESS(f"Results written to {path}"))
+
+        if options["compare"]:
+            self._compare(options, results)
+
+    def _compare(self, options, results):
+        try:
+            baseline = json.loads(Path(options["compare"]).read_text())["results"]
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read baseline {options['compare']}: {exc}")
+        rows, regressions = benchmarks.compare(
+            baseline, results, threshold=options["threshold"] / 100
+        )
+        self.stdout.write(
+            f"\n{'endpoint':32} {'p95 before':>11} {'p95 now':>9} {'queries':>10}"
+        )
+        for name, before_ms, now_ms, before_q, now_q in rows:
+            before = f"{before_ms:.1f}ms" if before_ms is not None else "new"
+            queries = f"{before_q}->{now_q}" if before_q is not None else str(now_q)
+            line = f"{name:32} {before:>11} {now_ms:>7.1f}ms {queries:>10}"
+            if name in regressions:
+                line = self.style.ERROR(line + "  REGRESSION")
+            self.stdout.write(line)
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} endpoint(s) regressed.")
+
+    def _meta(self):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = ""
+        return {
+            "commit": commit,
+            "created_at": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "patients": Patient.objects.count(),
+        }
@@ -0,0 +1,82 @@
+"""
+Refresh materialized dashboard snapshots.
+
+Recomputes the counters for every dashboard section (and for every active
+doctor and surgeon) and stores them in DashboardSnapshot, so that dashboard
+requests are served from the snapshot table instead of live COUNT queries.
+
+Usage:
+    python manage.py refresh_dashboards
+    python manage.py refresh_dashboards --loop 60   # run as a worker, every 60s
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import snapshots
+from core.models import DashboardSnapshot
+from staff.models import Staff
+
+GLOBAL_SECTIONS = [
+    "common",
+    "admin",
+    "nurse",
+    "receptionist",
+    "pharmacist",
+    "labtech",
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute dashboard snapshots for every role."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running and refresh every SECONDS seconds.",
+        )
+        parser.add_argument(
+            "--stale-only",
+            action="store_true",
+            help="Only refresh snapshots that signals have marked stale.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            refreshed = self._refresh_all(options["stale_only"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Refreshed {refreshed} dashboard snapshots.")
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["loop"])
+
+    def _refresh_all(self, stale_only):
+        today = timezone.now().date()
+        jobs = [(section, (), None) for section in GLOBAL_SECTIONS]
+        for doctor in Staff.objects.filter(role="DOCTOR", is_active=True):
+            jobs.append(("doctor", (doctor,), doctor.pk))
+        for surgeon in Staff.objects.filter(role="SURGEON", is_active=True):
+            jobs.append(("surgeon", (surgeon,), surgeon.pk))
+        jobs.append(("surgeon", (None,), "all"))
+
+        if stale_only:
+            fresh = set(
+                DashboardSnapshot.objects.filter(
+                    is_stale=False, for_date=today
+                ).values_list("key", flat=True)
+            )
+            jobs = [
+                job
+                for job in jobs
+                if snapshots.snapshot_key(job[0], job[2]) not in fresh
+            ]
+
+        for section, section_args, scope in jobs:
+            snapshots.refresh(section, today, *section_args, scope=scope)
+        return len(jobs)
@@ -0,0 +1,41 @@
+"""
+Restore rows from an archive run back into their tables.
+
+Rows come back as they were archived, i.e. still soft-deleted; undelete them
+with ``restore()`` or the admin as usual.
+
+Usage:
+    python manage.py restore_archive --manifest 12
+    python manage.py restore_archive --manifest 12 --model patients.patient --pk 42
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import archive
+from core.models import ArchiveManifest
+
+
+class Command(BaseCommand):
+    help = "Re-insert archived rows from one archive run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--manifest", type=int, required=True)
+        parser.add_argument(
+            "--model", metavar="APP_LABEL.MODEL", help="Only restore this model."
+        )
+        parser.add_argument("--pk", help="Only restore the row with this primary key.")
+
+    def handle(self, *args, **options):
+        try:
+            manifest = ArchiveManifest.objects.get(pk=options["manifest"])
+        except ArchiveManifest.DoesNotExist:
+            raise CommandError(f"Archive run {options['manifest']} does not exist.")
+        label = options["model"].lower() if options["model"] else None
+        restored = archive.restore_manifest(
+            manifest, label=label, object_pk=options["pk"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Restored {restored} rows from archive run {manifest.pk}."
+            )
+        )
@@ -7,25 +7,107 @@ Idempotent — safe to run multiple times without duplicates.
 Usage:
     python manage.py seed_demo
     python manage.py seed_demo --flush   # Clear existing data first
+    python manage.py seed_demo --scale 100000 --seed 7   # Load-test volumes
+
+Scale mode bypasses ``save()`` and ``full_clean()``: rows are generated in
+batches from a seeded RNG (the same ``--seed`` always yields the same
+plaintext data) and written with ``bulk_create``, together with their history
+rows. Invoice numbers are reserved in one call to ``billing.numbering``.
+Each ``--scale`` patient gets ``APPOINTMENTS_PER_PATIENT`` appointments,
+``INVOICES_PER_PATIENT`` invoices and ``VITALS_PER_PATIENT`` care records.
 """
 
 import random
+import time
+from contextlib import contextmanager
 from datetime import timedelta
+from decimal import Decimal
 
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.contrib.auth.models import User, Group
 from django.db import transaction
+from simple_history.utils import bulk_create_with_history
 
 from patients.models import Patient
 from staff.models import Staff
 from appointments.models import Appointment
+from billing import numbering
 from billing.models import Invoice
 from laboratory.models import LabTest
 from pharmacy.models import Prescription
 from surgery.models import Surgery
 from care_monitoring.models import PatientCare
+from hospital import occupancy
 from hospital.models import Ward, Room
+from core.models import DashboardSnapshot
+
+APPOINTMENTS_PER_PATIENT = 3
+INVOICES_PER_PATIENT = 1
+VITALS_PER_PATIENT = 4
+
+FIRST_NAMES = [
+    "John",
+    "Emma",
+    "Oliver",
+    "Sophia",
+    "William",
+    "Isabella",
+    "James",
+    "Mia",
+    "Benjamin",
+    "Charlotte",
+    "Lucas",
+    "Amelia",
+    "Henry",
+    "Harper",
+    "Alexander",
+    "Evelyn",
+    "Daniel",
+    "Aria",
+    "Noah",
+    "Grace",
+    "Samuel",
+    "Chloe",
+    "David",
+    "Zoe",
+]
+LAST_NAMES = [
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Jones",
+    "Brown",
+    "Davis",
+    "Miller",
+    "Wilson",
+    "Moore",
+    "Taylor",
+    "Anderson",
+    "Thomas",
+    "Martin",
+    "Garcia",
+    "Clark",
+    "Lewis",
+]
+REASONS = [
+    "Follow-up consultation",
+    "Initial assessment",
+    "Post-surgery review",
+    "Routine checkup",
+    "Lab results discussion",
+]
+
+
+@contextmanager
+def _without_auto_now_add(model, field_name):
+    """Let bulk_create keep generated values for an ``auto_now_add`` field."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
 
 
 class Command(BaseCommand):
@@ -37,11 +119,39 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing demo data before seeding.",
         )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Bulk-generate N patients with related records for load testing.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Random seed for --scale (same seed, same data).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Patients generated and inserted per batch in --scale mode.",
+        )
+        parser.add_argument(
+            "--skip-history",
+            action="store_true",
+            help="Do not write history rows in --scale mode.",
+        )
 
     def handle(self, *args, **options):
         if options["flush"]:
             self._flush_data()
 
+        if options["scale"]:
+            self._seed_scale(options)
+            return
+
         now = timezone.now()
         admin_user = self._ensure_admin()
 
@@ -489,3 +599,185 @@ class Command(BaseCommand):
             invoices.append(invoice)
 
         return invoices
+
+    # ------------------------------------------------------------------
+    # Scale mode
+    # ------------------------------------------------------------------
+
+    def _seed_scale(self, options):
+        """Bulk-generate ``--scale`` patients and their related records."""
+        rng = random.Random(options["seed"])
+        # The ward/staff helpers draw from the module-level RNG.
+        random.seed(options["seed"])
+        batch_size = options["batch_size"]
+        self._with_history = not options["skip_history"]
+        self._timings = {}
+        now = timezone.now()
+
+        admin_staff = self._ensure_admin()
+        wards = self._create_wards()
+        staff_members = self._create_staff(admin_staff)
+        doctors = [s for s in staff_members if s.role == "DOCTOR"]
+        nurses = [s for s in staff_members if s.role == "NURSE"]
+
+        first_index = Patient.all_objects.filter(unique_id__startswith="LOAD-").count()
+        total = options["scale"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"🏥 Generating {total} patients (seed {options['seed']}, "
+                f"batch {batch_size})..."
+            )
+        )
+
+        started = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            count = min(batch_size, total - offset)
+            with transaction.atomic():
+                patients = self._bulk_patients(
+                    rng, first_index + offset, count, wards, now
+                )
+                self._bulk_appointments(rng, patients, doctors, now)
+                self._bulk_invoices(rng, patients, now)
+                self._bulk_vitals(rng, patients, nurses, now)
+            self.stdout.write(f"  … {offset + count}/{total} patients")
+        elapsed = time.perf_counter() - started
+
+        # Counters served from snapshots were computed before the bulk load,
+        # and bulk_create bypasses the occupancy bookkeeping in Patient.save().
+        DashboardSnapshot.objects.update(is_stale=True)
+        occupancy.reconcile()
+
+        rows = 0
+        for label, (row_count, seconds) in self._timings.items():
+            rows += row_count
+            rate = row_count / seconds if seconds else row_count
+            self.stdout.write(
+                self.style.SUCCESS(f"  ✅ {row_count} {label} ({rate:,.0f} rows/s)")
+            )
+        self.stdout.write(
+            self.style.WARNING(
+                f"\n📊 {rows} rows in {elapsed:.1f}s "
+                f"({rows / elapsed if elapsed else rows:,.0f} rows/s overall)"
+            )
+        )
+
+    def _bulk_insert(self, label, model, objs):
+        """Insert ``objs`` (with history rows unless skipped) and time it."""
+        started = time.perf_counter()
+        if self._with_history:
+            created = bulk_create_with_history(objs, model, batch_size=1000)
+        else:
+            created = model.objects.bulk_create(objs, batch_size=1000)
+        row_count, seconds = self._timings.get(label, (0, 0.0))
+        self._timings[label] = (
+            row_count + len(created) * (2 if self._with_history else 1),
+            seconds + time.perf_counter() - started,
+        )
+        return created
+
+    def _bulk_patients(self, rng, first_index, count, wards, now):
+        patients = []
+        today = now.date()
+        for n in range(first_index, first_index + count):
+            first = rng.choice(FIRST_NAMES)
+            last = rng.choice(LAST_NAMES)
+            admitted = now - timedelta(
+                days=rng.randint(1, 720), hours=rng.randint(0, 23)
+            )
+            # About one in ten patients is currently admitted.
+            in_house = rng.random() < 0.1
+            patients.append(
+                Patient(
+                    unique_id=f"LOAD-{n + 1:07d}",
+                    first_name=first,
+                    last_name=last,
+                    date_of_birth=today - timedelta(days=rng.randint(365, 365 * 90)),
+                    gender=rng.choice("MF"),
+                    phone=f"+1555{rng.randint(0, 9999999):07d}",
+                    email=f"{first.lower()}.{last.lower()}{n}@load.test",
+                    address=f"{rng.randint(1, 999)} Load Street, Test City",
+                    admission_date=admitted,
+                    discharge_date=(
+                        None
+                        if in_house
+                        else admitted + timedelta(days=rng.randint(0, 14))
+                    ),
+                    ward=rng.choice(wards) if in_house else None,
+                )
+            )
+        with _without_auto_now_add(Patient, "created_at"):
+            for patient in patients:
+                patient.created_at = patient.admission_date
+                patient.refresh_blind_indexes()
+            return self._bulk_insert("patients", Patient, patients)
+
+    def _bulk_appointments(self, rng, patients, doctors, now):
+        appointments = []
+        for patient in patients:
+            for j in range(APPOINTMENTS_PER_PATIENT):
+                # One appointment per distinct day window keeps
+                # (patient, doctor, appointment_date) unique.
+                days = -365 + j * 127 + rng.randint(0, 126)
+                when = now.replace(minute=0, second=0, microsecond=0) + timedelta(
+                    days=days, hours=rng.randint(-4, 4)
+                )
+                appointments.append(
+                    Appointment(
+                        patient=patient,
+                        doctor=rng.choice(doctors),
+                        appointment_date=when,
+                        reason=rng.choice(REASONS),
+                        status=(
+                            "Scheduled"
+                            if when > now
+                            else rng.choice(["Completed", "Completed", "Cancelled"])
+                        ),
+                    )
+                )
+        return self._bulk_insert("appointments", Appointment, appointments)
+
+    def _bulk_invoices(self, rng, patients, now):
+        count = len(patients) * INVOICES_PER_PATIENT
+        year = now.year
+        seqs = iter(numbering.reserve(year, count))
+
+        invoices = []
+        for patient in patients:
+            for _ in range(INVOICES_PER_PATIENT):
+                issued = (now - timedelta(days=rng.randint(0, 364))).date()
+                invoices.append(
+                    Invoice(
+                        patient=patient,
+                        invoice_number=numbering.format_number(year, next(seqs)),
+                        issue_date=issued,
+                        due_date=issued + timedelta(days=30),
+                        total_amount=Decimal(rng.randint(2000, 500000)) / 100,
+                        paid=rng.random() < 0.6,
+                    )
+                )
+        return self._bulk_insert("invoices", Invoice, invoices)
+
+    def _bulk_vitals(self, rng, patients, nurses, now):
+        records = []
+        for patient in patients:
+            taken = patient.admission_date
+            for _ in range(VITALS_PER_PATIENT):
+                taken = min(taken + timedelta(hours=rng.randint(2, 12)), now)
+                records.append(
+                    PatientCare(
+                        patient=patient,
+                        monitored_by=rng.choice(nurses) if nurses else None,
+                        monitoring_date=taken,
+                        status=rng.choice(
+                            ["STABLE", "IMPROVING", "OBSERVATION", "CRITICAL"]
+                        ),
+                        temperature=Decimal(rng.randint(360, 395)) / 10,
+                        heart_rate=rng.randint(55, 120),
+                        blood_pressure_systolic=rng.randint(105, 165),
+                        blood_pressure_diastolic=rng.randint(60, 95),
+                        respiratory_rate=rng.randint(12, 24),
+                        oxygen_saturation=Decimal(rng.randint(9200, 9990)) / 100,
+                    )
+                )
+        with _without_auto_now_add(PatientCare, "monitoring_date"):
+            return self._bulk_insert("care records", PatientCare, records)
@@ -0,0 +1,193 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+``core.middleware.QueryMetricsMiddleware`` measures every request: the number
+of SQL queries and the time spent in them (via a database execute wrapper),
+cache hits and misses reported by ``record_cache()``, and the total response
+time. Totals are kept per ``(view, action)``, where ``view`` is the resolved
+URL name and ``action`` the DRF viewset action (empty for plain views).
+
+Each worker process accumulates totals in memory and periodically writes
+them to the shared cache under its own key, so there are no cross-process
+write races; ``collect()`` sums the per-process blobs for ``/metrics``.
+"""
+
+import os
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+INDEX_KEY = "metrics:processes"
+FIELDS = (
+    "requests",
+    "response_seconds",
+    "queries",
+    "query_seconds",
+    "cache_hits",
+    "cache_misses",
+)
+
+# name, help text, type, source field
+SERIES = (
+    ("remedium_http_requests_total", "Requests served.", "counter", "requests"),
+    (
+        "remedium_http_response_seconds_total",
+        "Total time spent producing responses.",
+        "counter",
+        "response_seconds",
+    ),
+    ("remedium_db_queries_total", "SQL queries executed.", "counter", "queries"),
+    (
+        "remedium_db_query_seconds_total",
+        "Total time spent executing SQL.",
+        "counter",
+        "query_seconds",
+    ),
+    (
+        "remedium_db_queries_max",
+        "Most SQL queries executed by a single request.",
+        "gauge",
+        "max_queries",
+    ),
+    ("remedium_cache_hits_total", "Application cache hits.", "counter", "cache_hits"),
+    (
+        "remedium_cache_misses_total",
+        "Application cache misses.",
+        "counter",
+        "cache_misses",
+    ),
+)
+
+_current = ContextVar("request_metrics", default=None)
+_lock = threading.Lock()
+_state = {"pid": None, "key": None, "totals": {}, "flushed_at": 0.0}
+
+
+class RequestMetrics:
+    """Counters for one request; doubles as a database execute wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - started
+
+
+def activate(request_metrics):
+    return _current.set(request_metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+def record_cache(hit):
+    """Count a cache hit or miss against the current request, if any."""
+    request_metrics = _current.get()
+    if request_metrics is not None:
+        if hit:
+            request_metrics.cache_hits += 1
+        else:
+            request_metrics.cache_misses += 1
+
+
+def _process_state():
+    """Per-process state; reset after a fork so workers never share a key."""
+    if _state["pid"] != os.getpid():
+        _state.update(
+            pid=os.getpid(),
+            key=f"metrics:process:{uuid.uuid4().hex}",
+            totals={},
+            flushed_at=0.0,
+        )
+    return _state
+
+
+def record(view, action, request_metrics, response_seconds):
+    """Add one finished request to this process's totals."""
+    with _lock:
+        state = _process_state()
+        totals = state["totals"].setdefault(
+            (view, action), dict.fromkeys(FIELDS + ("max_queries",), 0)
+        )
+        totals["requests"] += 1
+        totals["response_seconds"] += response_seconds
+        totals["queries"] += request_metrics.queries
+        totals["query_seconds"] += request_metrics.query_seconds
+        totals["cache_hits"] += request_metrics.cache_hits
+        totals["cache_misses"] += request_metrics.cache_misses
+        totals["max_queries"] = max(totals["max_queries"], request_metrics.queries)
+        due = time.monotonic() - state["flushed_at"] >= settings.METRICS_FLUSH_INTERVAL
+    if due:
+        flush()
+
+
+def flush():
+    """Write this process's totals to the shared cache."""
+    with _lock:
+        state = _process_state()
+        blob = {key: dict(values) for key, values in state["totals"].items()}
+        state["flushed_at"] = time.monotonic()
+        key = state["key"]
+    cache.set(key, blob, settings.METRICS_RETENTION)
+    # Re-checked on every flush so the index recovers from cache eviction.
+    index = cache.get(INDEX_KEY) or []
+    if key not in index:
+        cache.set(INDEX_KEY, index + [key], None)
+
+
+def collect():
+    """Sum the totals of every live process, keyed by ``(view, action)``."""
+    flush()
+    index = cache.get(INDEX_KEY) or []
+    blobs = cache.get_many(index)
+    if len(blobs) != len(index):
+        # Expired blobs belong to recycled workers; drop them from the index.
+        cache.set(INDEX_KEY, [key for key in index if key in blobs], None)
+    merged = {}
+    for blob in blobs.values():
+        for label, values in blob.items():
+            totals = merged.setdefault(label, dict.fromkeys(FIELDS + ("max_queries",), 0))
+            for field in FIELDS:
+                totals[field] += values.get(field, 0)
+            totals["max_queries"] = max(totals["max_queries"], values.get("max_queries", 0))
+    return merged
+
+
+def reset():
+    """Forget this process's totals (used by tests)."""
+    with _lock:
+        _process_state()["totals"] = {}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(totals):
+    """Render ``collect()`` output in the Prometheus text exposition format."""
+    lines = []
+    labels = sorted(totals)
+    for name, help_text, kind, field in SERIES:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for view, action in labels:
+            value = totals[(view, action)][field]
+            if isinstance(value, float):
+                value = round(value, 6)
+            lines.append(
+                f'{name}{{view="{_escape(view)}",action="{_escape(action)}"}} {value}'
+            )
+    return "\n".join(lines) + "\n"
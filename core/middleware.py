@@ -0,0 +1,87 @@
+"""Request-level middleware for Remedium HMS."""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core import metrics, slow_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryMetricsMiddleware:
+    """
+    Record query count, SQL time, cache hits/misses and response time per
+    resolved URL name and DRF action (see ``core.metrics``).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.activate(request_metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(request_metrics))
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+
+        metrics.record(
+            self._view_label(request),
+            self._action_label(response),
+            request_metrics,
+            time.perf_counter() - started,
+        )
+        return response
+
+    @staticmethod
+    def _view_label(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        return match.view_name or match._func_path
+
+    @staticmethod
+    def _action_label(response):
+        renderer_context = getattr(response, "renderer_context", None) or {}
+        return getattr(renderer_context.get("view"), "action", None) or ""
+
+
+class SlowQueryMiddleware:
+    """
+    Log statements slower than ``SLOW_QUERY_THRESHOLD_MS`` with their plan
+    (see ``core.slow_queries``). Disabled when the threshold is 0.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold <= 0:
+            return self.get_response(request)
+
+        recorder = slow_queries.SlowQueryRecorder(threshold)
+        with ExitStack() as stack:
+            recorder.wrap(stack)
+            response = self.get_response(request)
+
+        if recorder.captured:
+            match = getattr(request, "resolver_match", None)
+            try:
+                slow_queries.save(
+                    recorder.captured, view=match.view_name if match else request.path
+                )
+            except Exception:
+                logger.exception("Could not store slow query log entries")
+        return response
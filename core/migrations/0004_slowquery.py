@@ -0,0 +1,60 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_dashboardsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("duration_ms", models.FloatField()),
+                ("sql", models.TextField()),
+                ("params", models.JSONField(blank=True, default=list)),
+                ("view", models.CharField(blank=True, db_index=True, max_length=200)),
+                (
+                    "origin",
+                    models.CharField(
+                        blank=True,
+                        help_text="Innermost project frame that ran the query",
+                        max_length=300,
+                    ),
+                ),
+                ("stack", models.TextField(blank=True)),
+                ("plan", models.TextField(blank=True)),
+                (
+                    "analyzed",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Plan comes from EXPLAIN ANALYZE (actual timings)",
+                    ),
+                ),
+                ("vendor", models.CharField(blank=True, max_length=20)),
+            ],
+            options={
+                "verbose_name_plural": "slow queries",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:16
+
+import django.db.models.deletion
+import django.utils.timezone
+import encrypted_model_fields.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_slowquery"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchiveManifest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("RUNNING", "Running"),
+                            ("COMPLETED", "Completed"),
+                            ("FAILED", "Failed"),
+                        ],
+                        default="RUNNING",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "retention",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Retention in days applied per model label",
+                    ),
+                ),
+                (
+                    "counts",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Rows archived per model label, including cascades",
+                    ),
+                ),
+                (
+                    "skipped",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Rows left in place per model label (live dependents)",
+                    ),
+                ),
+                ("batches", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "ordering": ["-started_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sequence", models.PositiveIntegerField()),
+                ("model_label", models.CharField(max_length=100)),
+                ("object_pk", models.CharField(max_length=64)),
+                ("payload", encrypted_model_fields.fields.EncryptedTextField()),
+                ("nullified", models.JSONField(blank=True, default=list)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("restored_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "manifest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="records",
+                        to="core.archivemanifest",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["manifest", "sequence"],
+                "indexes": [
+                    models.Index(
+                        fields=["model_label", "object_pk"],
+                        name="core_archiv_model_l_fb7545_idx",
+                    )
+                ],
+            },
+        ),
+    ]
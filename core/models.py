@@ -1,5 +1,10 @@
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
+from encrypted_model_fields.fields import EncryptedTextField
+from simple_history.models import HistoricalRecords
 
 
 class SoftDeleteQuerySet(models.QuerySet):
@@ -23,16 +28,24 @@ class SoftDeleteQuerySet(models.QuerySet):
 
 
 class SoftDeleteManager(models.Manager):
-    """Manager that supports soft deletion."""
+    """
+    Manager that supports soft deletion.
+
+    Models with their own queryset methods use
+    ``SoftDeleteManager.from_queryset(SomeSoftDeleteQuerySet)``.
+    """
+
+    _queryset_class = SoftDeleteQuerySet
 
     def __init__(self, *args, **kwargs):
         self.alive_only = kwargs.pop("alive_only", True)
         super().__init__(*args, **kwargs)
 
     def get_queryset(self):
+        queryset = self._queryset_class(self.model, using=self._db, hints=self._hints)
         if self.alive_only:
-            return SoftDeleteQuerySet(self.model).filter(is_deleted=False)
-        return SoftDeleteQuerySet(self.model)
+            return queryset.filter(is_deleted=False)
+        return queryset
 
     def hard_delete(self):
         return self.get_queryset().hard_delete()
@@ -72,3 +85,150 @@ class RemediumBaseModel(models.Model):
     def hard_delete(self, using=None, keep_parents=False):
         """Permanently delete a single record."""
         return super().delete(using=using, keep_parents=keep_parents)
+
+
+class AuditedHistoricalRecords(HistoricalRecords):
+    """
+    HistoricalRecords with the indexes the unified audit log pages on.
+
+    The plain ``history_date`` index is replaced by a composite
+    ``(history_date, history_id)`` index matching the audit keyset. A
+    ``(history_user, history_date)`` index serves per-user filtering and
+    ``(<pk>, history_date, history_id)`` the per-object history pages in
+    ``core.history``.
+    """
+
+    @property
+    def _date_indexing(self):
+        return False
+
+    def get_meta_options(self, model):
+        meta_fields = super().get_meta_options(model)
+        meta_fields["indexes"] = (
+            models.Index(fields=["history_date", "history_id"]),
+            models.Index(fields=["history_user", "history_date"]),
+            models.Index(fields=[model._meta.pk.attname, "history_date", "history_id"]),
+        )
+        return meta_fields
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Materialized counters for one dashboard section.
+
+    ``key`` is the section name, optionally suffixed with a scope such as a
+    staff member id (``doctor:12``). Rows are refreshed by the
+    ``refresh_dashboards`` command and marked stale by model signals; see
+    ``core.snapshots``.
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    section = models.CharField(max_length=50, db_index=True)
+    for_date = models.DateField(help_text="Calendar day the counters were computed for")
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    is_stale = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Dashboard snapshot {self.key} ({self.refreshed_at:%Y-%m-%d %H:%M})"
+
+    def is_fresh(self, today, max_age):
+        """True if the snapshot can be served for ``today`` without recomputing."""
+        return (
+            not self.is_stale
+            and self.for_date == today
+            and self.refreshed_at >= timezone.now() - timedelta(seconds=max_age)
+        )
+
+
+class SlowQuery(models.Model):
+    """
+    A SQL statement that exceeded ``SLOW_QUERY_THRESHOLD_MS``.
+
+    Parameters are stored with PHI redacted and string literals are stripped
+    from the plan; see ``core.slow_queries``.
+    """
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    duration_ms = models.FloatField()
+    sql = models.TextField()
+    params = models.JSONField(default=list, blank=True)
+    view = models.CharField(max_length=200, blank=True, db_index=True)
+    origin = models.CharField(
+        max_length=300,
+        blank=True,
+        help_text="Innermost project frame that ran the query",
+    )
+    stack = models.TextField(blank=True)
+    plan = models.TextField(blank=True)
+    analyzed = models.BooleanField(
+        default=False, help_text="Plan comes from EXPLAIN ANALYZE (actual timings)"
+    )
+    vendor = models.CharField(max_length=20, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "slow queries"
+
+    def __str__(self):
+        return f"{self.duration_ms:.0f} ms in {self.view or 'unknown view'}"
+
+
+class ArchiveManifest(models.Model):
+    """One run of the soft-delete archiver (see ``core.archive``)."""
+
+    STATUS_CHOICES = [
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    started_at = models.DateTimeField(default=timezone.now, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="RUNNING")
+    retention = models.JSONField(
+        default=dict, help_text="Retention in days applied per model label"
+    )
+    counts = models.JSONField(
+        default=dict, help_text="Rows archived per model label, including cascades"
+    )
+    skipped = models.JSONField(
+        default=dict, help_text="Rows left in place per model label (live dependents)"
+    )
+    batches = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Archive run {self.pk} ({self.status.lower()}, {self.started_at:%Y-%m-%d %H:%M})"
+
+
+class ArchivedRecord(models.Model):
+    """
+    A row moved out of its table by the archiver.
+
+    ``payload`` is the Django-serialized row, encrypted as a whole; ``sequence``
+    is the deletion order within the manifest (restore runs it backwards) and
+    ``nullified`` lists ``[model label, pk, field, value]`` foreign keys on surviving
+    rows that were set to NULL when this row was removed.
+    """
+
+    manifest = models.ForeignKey(
+        ArchiveManifest, on_delete=models.PROTECT, related_name="records"
+    )
+    sequence = models.PositiveIntegerField()
+    model_label = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=64)
+    payload = EncryptedTextField()
+    nullified = models.JSONField(default=list, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+    restored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["manifest", "sequence"]
+        indexes = [models.Index(fields=["model_label", "object_pk"])]
+
+    def __str__(self):
+        return f"{self.model_label} #{self.object_pk} (run {self.manifest_id})"
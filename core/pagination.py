@@ -0,0 +1,205 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of a boundary row, serialized as URL-safe base64
+JSON, so the next page is fetched with an indexed range condition instead of
+an ``OFFSET`` that has to skip every earlier row.
+"""
+
+import base64
+import binascii
+import json
+import operator
+from datetime import datetime
+from functools import reduce
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(values):
+    """Serialize a sort-key tuple into an opaque URL-safe token."""
+    # Full isoformat: DjangoJSONEncoder truncates microseconds, which would
+    # make the boundary row compare unequal to itself.
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by ``encode_cursor`` into a list.
+
+    Raises ``ValueError`` for anything that is not a well-formed cursor.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor.")
+    return values
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination, with opt-in keyset pagination per viewset.
+
+    Viewsets that declare a stable ``cursor_ordering`` (ending in a unique
+    field, e.g. ``["-admission_date", "-id"]``) accept ``?cursor=``. An empty
+    value requests the first page; the response then carries ``next`` and
+    ``previous`` links with opaque cursors and no ``count``. Each page is
+    a range condition on the ordering columns, so page 10,000 costs the
+    same as page 1 and there is no ``COUNT(*)``. Without ``?cursor=`` the
+    response is the usual ``count``/``next``/``previous``/``results`` page.
+
+    Nullable ordering columns sort their NULLs last. ``?ordering=`` cannot
+    be combined with a cursor.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "cursor_ordering", None)
+        self.cursor_mode = (
+            bool(ordering) and self.cursor_query_param in request.query_params
+        )
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self._paginate_keyset(queryset, request, view, ordering)
+
+    def _paginate_keyset(self, queryset, request, view, ordering):
+        if request.query_params.get(getattr(view, "ordering_param", "ordering")):
+            raise ValidationError(
+                {"ordering": "Custom ordering cannot be combined with a cursor."}
+            )
+        self.request = request
+        self.display_page_controls = False
+        model = queryset.model
+        self.cursor_fields = [
+            (model._meta.get_field(name.lstrip("-")), name.startswith("-"))
+            for name in ordering
+        ]
+        token = request.query_params.get(self.cursor_query_param)
+        backwards, values = False, None
+        if token:
+            try:
+                backwards, values = self._parse_cursor(token)
+            except ValueError:
+                raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+        queryset = queryset.order_by(*self._order_by(backwards))
+        if values is not None:
+            queryset = queryset.filter(self._keyset_q(values, backwards))
+        page_size = self.get_page_size(request)
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        # Coming from a cursor means there are rows on that side of it.
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else values is not None
+        self.next_cursor = self._cursor(rows[-1], False) if rows and has_next else None
+        self.previous_cursor = (
+            self._cursor(rows[0], True) if rows and has_previous else None
+        )
+        return rows
+
+    def _order_by(self, backwards):
+        order = []
+        for field, descending in self.cursor_fields:
+            descending = descending != backwards
+            if field.null:
+                expression = F(field.attname)
+                # NULLs sort last walking forwards, so first walking back.
+                nulls = {"nulls_first": True} if backwards else {"nulls_last": True}
+                order.append(
+                    expression.desc(**nulls) if descending else expression.asc(**nulls)
+                )
+            else:
+                order.append(f"-{field.attname}" if descending else field.attname)
+        return order
+
+    def _keyset_q(self, values, backwards):
+        """Rows strictly after (or, walking back, before) the cursor position."""
+        conditions = []
+        ties = Q()
+        for (field, descending), value in zip(self.cursor_fields, values):
+            name = field.attname
+            lookup = "lt" if descending != backwards else "gt"
+            if value is None:
+                # NULLs sort last: only NULLs follow, and every value precedes.
+                strict = Q(**{f"{name}__isnull": False}) if backwards else None
+                tie = Q(**{f"{name}__isnull": True})
+            else:
+                strict = Q(**{f"{name}__{lookup}": value})
+                if field.null and not backwards:
+                    strict |= Q(**{f"{name}__isnull": True})
+                tie = Q(**{name: value})
+            if strict is not None:
+                conditions.append(ties & strict)
+            ties &= tie
+        return reduce(operator.or_, conditions, Q(pk__in=[]))
+
+    def _cursor(self, row, backwards):
+        values = [getattr(row, field.attname) for field, _ in self.cursor_fields]
+        return encode_cursor(["p" if backwards else "n", *values])
+
+    def _parse_cursor(self, token):
+        values = decode_cursor(token)
+        if len(values) != len(self.cursor_fields) + 1 or values[0] not in ("n", "p"):
+            raise ValueError("Invalid cursor.")
+        parsed = []
+        for (field, _), value in zip(self.cursor_fields, values[1:]):
+            if value is not None:
+                try:
+                    value = field.to_python(value)
+                except DjangoValidationError as exc:
+                    raise ValueError("Invalid cursor.") from exc
+            parsed.append(value)
+        return values[0] == "p", parsed
+
+    def _cursor_link(self, token):
+        if token is None:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self._cursor_link(self.next_cursor),
+                "previous": self._cursor_link(self.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        if getattr(view, "cursor_ordering", None):
+            parameters.append(
+                {
+                    "name": self.cursor_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": (
+                        "Keyset pagination: pass an empty value for the first page, then "
+                        "follow `next`/`previous`. Cursor pages have no `count`."
+                    ),
+                    "schema": {"type": "string"},
+                }
+            )
+        return parameters
@@ -111,6 +111,19 @@ class IsPharmacyStaff(permissions.BasePermission):
             return False
 
 
+class HasViewPermission(permissions.BasePermission):
+    """
+    Users holding the model's Django ``view`` permission, the same check the
+    HTML views make, for read-only endpoints those pages call.
+    """
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        opts = view.get_queryset().model._meta
+        return request.user.has_perm(f"{opts.app_label}.view_{opts.model_name}")
+
+
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """Object-level permission: only staff with appropriate permissions can edit, anyone authenticated can view."""
 
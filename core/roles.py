@@ -0,0 +1,138 @@
+"""
+Per-user role flags for templates.
+
+The flag set is derived from the user's auth groups and their Staff role,
+computed with a single group query and cached per user. Entries are
+invalidated by the signals in ``core.signals`` when group membership, the
+user, or the linked Staff record changes; renaming or deleting a group bumps a
+global version so every cached entry is ignored.
+
+Invalidation only works if every worker reads the same cache, so flags are
+cached only in a shared backend (``settings.USER_ROLES_CACHE``). With a
+process-local one such as ``LocMemCache`` a revoked role would stay effective
+in the other workers until the entry expired; there the flags are computed
+once per request instead.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.metrics import record_cache
+
+# Auth group name -> template flag
+GROUP_FLAGS = {
+    "Admin": "is_hms_admin",
+    "Doctor": "is_hms_doctor",
+    "Nurse": "is_hms_nurse",
+    "Receptionist": "is_hms_receptionist",
+    "Pharmacist": "is_hms_pharmacist",
+    "Lab Technician": "is_hms_lab_tech",
+    "Surgeon": "is_hms_surgeon",
+    "Anesthesiologist": "is_hms_anesthesiologist",
+    "Radiologist": "is_hms_radiologist",
+    "Technician": "is_hms_technician",
+    "Security": "is_hms_security",
+    "Maintenance": "is_hms_maintenance",
+}
+
+# Staff.role code -> template flag
+STAFF_ROLE_FLAGS = {
+    "ADMIN": "is_hms_admin",
+    "DOCTOR": "is_hms_doctor",
+    "NURSE": "is_hms_nurse",
+    "RECEPTIONIST": "is_hms_receptionist",
+    "PHARMACIST": "is_hms_pharmacist",
+    "LAB_TECH": "is_hms_lab_tech",
+    "SURGEON": "is_hms_surgeon",
+    "ANESTHESIOLOGIST": "is_hms_anesthesiologist",
+    "RADIOLOGIST": "is_hms_radiologist",
+    "TECH": "is_hms_technician",
+    "SECURITY": "is_hms_security",
+    "MAINTENANCE": "is_hms_maintenance",
+}
+
+VERSION_KEY = "user_roles:version"
+DEFAULT_TIMEOUT = 60 * 15  # 15 minutes
+
+# Backends private to one process: their invalidations never reach the
+# other workers.
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def _role_cache():
+    """The cache holding role flags, or ``None`` if it is process-local."""
+    alias = getattr(settings, "USER_ROLES_CACHE", "default")
+    if settings.CACHES[alias]["BACKEND"] in PROCESS_LOCAL_BACKENDS:
+        return None
+    return caches[alias]
+
+
+def _cache_key(cache, user_id):
+    version = cache.get_or_set(VERSION_KEY, 1, None)
+    return f"user_roles:{version}:{user_id}"
+
+
+def compute_role_flags(user):
+    """Build the flag dict for ``user`` from its groups and Staff role."""
+    from staff.models import Staff
+
+    flags = dict.fromkeys(GROUP_FLAGS.values(), False)
+    for name in user.groups.values_list("name", flat=True):
+        if name in GROUP_FLAGS:
+            flags[GROUP_FLAGS[name]] = True
+
+    if user.is_superuser:
+        flags["is_hms_admin"] = True
+
+    role = Staff.objects.filter(user_id=user.pk).values_list("role", flat=True).first()
+    if role in STAFF_ROLE_FLAGS:
+        flags[STAFF_ROLE_FLAGS[role]] = True
+    return flags
+
+
+def get_role_flags(user):
+    """
+    Return the flag dict for ``user``: from the shared cache, computing it on
+    a miss, or without a shared cache computed once and kept on ``user`` for
+    the rest of the request.
+    """
+    cache = _role_cache()
+    if cache is None:
+        flags = getattr(user, "_role_flags", None)
+        if flags is None:
+            flags = user._role_flags = compute_role_flags(user)
+        return flags
+    key = _cache_key(cache, user.pk)
+    flags = cache.get(key)
+    record_cache(flags is not None)
+    if flags is None:
+        flags = compute_role_flags(user)
+        cache.set(
+            key,
+            flags,
+            getattr(settings, "USER_ROLES_CACHE_TIMEOUT", DEFAULT_TIMEOUT),
+        )
+    return flags
+
+
+def invalidate_role_flags(*user_ids):
+    """Drop the cached flags for the given users."""
+    cache = _role_cache()
+    if cache is not None:
+        cache.delete_many(
+            [_cache_key(cache, user_id) for user_id in user_ids if user_id]
+        )
+
+
+def invalidate_all_role_flags():
+    """Invalidate every cached flag set (e.g. after a group is renamed)."""
+    cache = _role_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
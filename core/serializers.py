@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 
 
 class StandardErrorSerializer(serializers.Serializer):
@@ -15,3 +16,65 @@ class StandardErrorSerializer(serializers.Serializer):
         required=False,
         help_text="Detailed validation errors, mapping field names to lists of messages.",
     )
+
+
+def _param_names(request, name):
+    raw = request.query_params.get(name, "") if request is not None else ""
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` / ``?omit=c`` support for a ModelSerializer.
+
+    Applies to the serializer the view instantiates (and the children of a
+    ``many=True`` list), not to nested serializers. Unknown names are a 400.
+    Views that also use ``core.api_utils.SparseQuerysetMixin`` load only the
+    columns the remaining fields read, so omitted encrypted columns are
+    never fetched or decrypted. Fields that are not model columns declare
+    what they read in ``Meta.field_dependencies``, with columns of related
+    rows as ``relation__column``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        wanted = _param_names(request, "fields")
+        omitted = _param_names(request, "omit")
+        if not wanted and not omitted:
+            return
+        unknown = sorted(set(wanted + omitted) - set(self.fields))
+        if unknown:
+            raise ValidationError(
+                {"fields": [f"Unknown field(s): {', '.join(unknown)}."]}
+            )
+        for name in list(self.fields):
+            if (wanted and name not in wanted) or name in omitted:
+                self.fields.pop(name)
+
+    def required_columns(self):
+        """
+        Model fields the selected serializer fields read, as ``only()``
+        paths (``relation__column`` for related rows), or ``None`` when that
+        cannot be determined (e.g. an undeclared method field).
+        """
+        model = self.Meta.model
+        dependencies = getattr(self.Meta, "field_dependencies", {})
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        for name, field in self.fields.items():
+            if name in dependencies:
+                columns.update(dependencies[name])
+                continue
+            path = field.source.split(".")
+            if path[0] not in concrete or len(path) > 2:
+                return None
+            columns.add(path[0])
+            if len(path) == 2:
+                related = model._meta.get_field(path[0]).related_model
+                if related is None or path[1] not in {
+                    f.name for f in related._meta.concrete_fields
+                }:
+                    return None
+                columns.add(f"{path[0]}__{path[1]}")
+        return columns
@@ -0,0 +1,77 @@
+from django.apps import apps
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core import snapshots
+from core.roles import invalidate_all_role_flags, invalidate_role_flags
+from staff.models import Staff
+
+
+def invalidate_dashboard_snapshots(sender, **kwargs):
+    """Mark dashboard snapshots that depend on ``sender`` as stale."""
+    snapshots.invalidate(sender._meta.label)
+
+
+for _label in snapshots.watched_models():
+    _model = apps.get_model(_label)
+    post_save.connect(
+        invalidate_dashboard_snapshots,
+        sender=_model,
+        dispatch_uid=f"dashboard_snapshot_save_{_label}",
+    )
+    post_delete.connect(
+        invalidate_dashboard_snapshots,
+        sender=_model,
+        dispatch_uid=f"dashboard_snapshot_delete_{_label}",
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cached role flags (core.roles)
+# ---------------------------------------------------------------------------
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_roles_on_group_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Group membership changed, from either side of the relation."""
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_role_flags(instance.pk)
+        return
+    # Changed through group.user_set: pk_set holds user ids, except for
+    # clear(), where the members must be read before they are removed.
+    if action == "pre_clear":
+        invalidate_role_flags(*instance.user_set.values_list("pk", flat=True))
+    elif action in ("post_add", "post_remove"):
+        invalidate_role_flags(*pk_set)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_roles_on_user_change(sender, instance, **kwargs):
+    invalidate_role_flags(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_roles_on_group_change(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_all_role_flags()
+
+
+@receiver(pre_save, sender=Staff)
+def remember_staff_user(sender, instance, **kwargs):
+    """Keep the previous user link so a re-linked account is invalidated too."""
+    if instance.pk:
+        instance._previous_user_id = (
+            Staff.all_objects.filter(pk=instance.pk)
+            .values_list("user_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Staff)
+@receiver(post_delete, sender=Staff)
+def invalidate_roles_on_staff_change(sender, instance, **kwargs):
+    invalidate_role_flags(instance.user_id, getattr(instance, "_previous_user_id", None))
@@ -0,0 +1,161 @@
+"""
+Opt-in slow-query log with automatic EXPLAIN capture.
+
+When ``SLOW_QUERY_THRESHOLD_MS`` is positive,
+``core.middleware.SlowQueryMiddleware`` wraps
+every database connection for the duration of a request. Statements slower
+than the threshold are remembered together with the innermost project stack
+frame that issued them; after the view has returned, each one is explained
+(``EXPLAIN ANALYZE`` for plain SELECTs on PostgreSQL when
+``SLOW_QUERY_EXPLAIN_ANALYZE`` is on, ``EXPLAIN`` / ``EXPLAIN QUERY PLAN``
+otherwise), logged to ``logs/slow_queries.log`` and stored as a
+``SlowQuery`` row browsable in the admin.
+
+Parameters can carry PHI (names, phone numbers, dates of birth), so only
+numbers, booleans and ``None`` are stored verbatim, and quoted literals are
+blanked out of the plan text.
+"""
+
+import logging
+import re
+import time
+import traceback
+from contextvars import ContextVar
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_recording = ContextVar("slow_query_recording", default=False)
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_SKIP_FILES = {__file__, str(Path(__file__).with_name("middleware.py"))}
+STACK_DEPTH = 8
+
+
+def redact_params(params):
+    """Keep non-identifying scalar parameters; replace everything else."""
+    if params is None:
+        return []
+    if isinstance(params, dict):
+        return {key: _redact(value) for key, value in params.items()}
+    return [_redact(value) for value in params]
+
+
+def _redact(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return f"<redacted {type(value).__name__}>"
+
+
+def redact_plan(plan):
+    """Blank out quoted literals that the planner echoes back."""
+    return _LITERAL_RE.sub("'?'", plan)
+
+
+def _project_frames():
+    """Project stack frames (innermost last), excluding this machinery."""
+    base_dir = str(settings.BASE_DIR)
+    return [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and "site-packages" not in frame.filename
+        and frame.filename not in _SKIP_FILES
+    ]
+
+
+class SlowQueryRecorder:
+    """Database execute wrapper collecting statements over the threshold."""
+
+    def __init__(self, threshold_ms):
+        self.threshold_ms = threshold_ms
+        self.captured = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms and not _recording.get():
+                frames = _project_frames()[-STACK_DEPTH:]
+                self.captured.append(
+                    {
+                        "alias": context["connection"].alias,
+                        "sql": sql,
+                        "params": params,
+                        "many": many,
+                        "duration_ms": duration_ms,
+                        "origin": (
+                            f"{frames[-1].filename}:{frames[-1].lineno} in {frames[-1].name}"
+                            if frames
+                            else ""
+                        ),
+                        "stack": "".join(traceback.format_list(frames)),
+                    }
+                )
+
+    def wrap(self, stack):
+        """Install the wrapper on every connection inside ``stack``."""
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+
+
+def explain(alias, sql, params):
+    """Return ``(plan, analyzed)`` for a captured statement."""
+    connection = connections[alias]
+    statement = sql.lstrip().upper()
+    if connection.vendor == "postgresql":
+        analyze = settings.SLOW_QUERY_EXPLAIN_ANALYZE and statement.startswith("SELECT")
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    elif connection.vendor == "sqlite":
+        analyze, prefix = False, "EXPLAIN QUERY PLAN "
+    else:
+        analyze, prefix = False, "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        rows = cursor.fetchall()
+    plan = "\n".join(" ".join(str(column) for column in row) for row in rows)
+    return redact_plan(plan), analyze
+
+
+def save(captured, view=""):
+    """Explain, log and store the captured statements."""
+    from core.models import SlowQuery
+
+    token = _recording.set(True)
+    try:
+        for entry in captured:
+            plan, analyzed = "", False
+            if not entry["many"]:
+                try:
+                    plan, analyzed = explain(entry["alias"], entry["sql"], entry["params"])
+                except Exception as exc:  # EXPLAIN is best-effort diagnostics
+                    plan = f"EXPLAIN failed: {exc.__class__.__name__}"
+            logger.warning(
+                "Slow query (%.1f ms) in %s at %s: %s",
+                entry["duration_ms"],
+                view or "unknown view",
+                entry["origin"] or "unknown origin",
+                entry["sql"],
+            )
+            SlowQuery.objects.using(entry["alias"]).create(
+                duration_ms=entry["duration_ms"],
+                sql=entry["sql"],
+                params=redact_params(None if entry["many"] else entry["params"]),
+                view=view[:200],
+                origin=entry["origin"][:300],
+                stack=entry["stack"],
+                plan=plan,
+                analyzed=analyzed,
+                vendor=connections[entry["alias"]].vendor,
+            )
+    finally:
+        _recording.reset(token)
@@ -0,0 +1,111 @@
+"""
+Materialized dashboard snapshots.
+
+The counters behind each dashboard section (see ``core.dashboard``) are stored
+as JSON in ``DashboardSnapshot`` rows so that a burst of logins does not run
+the same COUNT queries over and over. Views read through ``get_stats()``:
+a fresh row is served as-is, a missing, stale or expired one is recomputed and
+written back. Rows are kept warm by the ``refresh_dashboards`` command and
+marked stale by the signals in ``core.signals`` whenever a model they depend
+on is written.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from core import dashboard
+from core.metrics import record_cache
+from core.models import DashboardSnapshot
+
+SECTIONS = {
+    "common": dashboard.common_stats,
+    "admin": dashboard.admin_stats,
+    "doctor": dashboard.doctor_stats,
+    "nurse": dashboard.nurse_stats,
+    "receptionist": dashboard.receptionist_stats,
+    "pharmacist": dashboard.pharmacist_stats,
+    "labtech": dashboard.labtech_stats,
+    "surgeon": dashboard.surgeon_stats,
+}
+
+# Model writes that invalidate each section
+SECTION_DEPENDENCIES = {
+    "common": ["patients.Patient", "appointments.Appointment"],
+    "admin": ["billing.Invoice", "staff.Staff", "appointments.Appointment"],
+    "doctor": [
+        "appointments.Appointment",
+        "care_monitoring.PatientCare",
+        "pharmacy.Prescription",
+    ],
+    "nurse": ["care_monitoring.PatientCare", "patients.Patient"],
+    "receptionist": ["staff.Staff", "patients.Patient", "appointments.Appointment"],
+    "pharmacist": ["pharmacy.Prescription", "inventory.InventoryItem"],
+    "labtech": ["laboratory.LabTest"],
+    "surgeon": ["surgery.Surgery"],
+}
+
+DEFAULT_MAX_AGE = 300  # seconds
+
+
+def snapshot_key(section, scope=None):
+    return section if scope is None else f"{section}:{scope}"
+
+
+def get_stats(section, today, *args, scope=None):
+    """
+    Return the counters for ``section``, served from its snapshot when fresh.
+
+    Extra positional ``args`` are passed to the section builder (e.g. the
+    staff profile for per-doctor sections); ``scope`` must identify them in
+    the snapshot key.
+    """
+    max_age = getattr(settings, "DASHBOARD_SNAPSHOT_MAX_AGE", DEFAULT_MAX_AGE)
+    snapshot = DashboardSnapshot.objects.filter(
+        key=snapshot_key(section, scope)
+    ).first()
+    fresh = snapshot is not None and snapshot.is_fresh(today, max_age)
+    record_cache(fresh)
+    if fresh:
+        return snapshot.data
+    return refresh(section, today, *args, scope=scope)
+
+
+def refresh(section, today, *args, scope=None):
+    """Recompute ``section`` and store it, returning the stored data."""
+    # Round-trip through JSON so callers see the same types whether the data
+    # was just computed or read back from the snapshot table.
+    data = json.loads(
+        json.dumps(SECTIONS[section](today, *args), cls=DjangoJSONEncoder)
+    )
+    DashboardSnapshot.objects.update_or_create(
+        key=snapshot_key(section, scope),
+        defaults={
+            "section": section,
+            "for_date": today,
+            "data": data,
+            "is_stale": False,
+            "refreshed_at": timezone.now(),
+        },
+    )
+    return data
+
+
+def watched_models():
+    """All model labels that invalidate at least one section."""
+    return sorted({label for labels in SECTION_DEPENDENCIES.values() for label in labels})
+
+
+def invalidate(model_label):
+    """Mark every snapshot that depends on ``model_label`` as stale."""
+    sections = [
+        section
+        for section, labels in SECTION_DEPENDENCIES.items()
+        if model_label in labels
+    ]
+    if sections:
+        DashboardSnapshot.objects.filter(
+            section__in=sections, is_stale=False
+        ).update(is_stale=True)
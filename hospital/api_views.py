@@ -1,7 +1,11 @@
+from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import Ward, Room
-from .serializers import WardSerializer, RoomSerializer
-from core.permissions import IsAdminUser
+from .serializers import WardSerializer, RoomSerializer, WardOccupancySerializer
+from . import occupancy
+from core.permissions import HasViewPermission, IsAdminUser
 
 
 class WardViewSet(viewsets.ModelViewSet):
@@ -13,6 +17,25 @@ class WardViewSet(viewsets.ModelViewSet):
     ordering_fields = ["name", "capacity"]
     ordering = ["name"]
 
+    @extend_schema(
+        summary="Bed occupancy",
+        description=(
+            "Every ward with its rooms and their capacity, occupied and free beds, "
+            "read from maintained counters. Cheap enough for bed boards to poll."
+        ),
+        responses={200: WardOccupancySerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        permission_classes=[IsAdminUser | HasViewPermission],
+    )
+    def occupancy(self, request):
+        """Occupancy counters for all wards and rooms."""
+        wards = occupancy.board(occupants=False)
+        return Response(WardOccupancySerializer(wards, many=True).data)
+
 
 class RoomViewSet(viewsets.ModelViewSet):
     queryset = Room.objects.select_related("ward").all()
@@ -0,0 +1,30 @@
+"""
+Rebuild the maintained ward and room occupancy counters from the patient table.
+
+``Patient.save()``, the soft-delete cascade and the bulk import keep the
+counters in step, but queryset ``update()`` calls on patients, raw SQL,
+``loaddata`` or restored backups can leave them drifted. Run this
+periodically (or after such an operation) to correct them.
+
+Usage:
+    python manage.py reconcile_occupancy
+"""
+
+from django.core.management.base import BaseCommand
+
+from hospital import occupancy
+
+
+class Command(BaseCommand):
+    help = "Recompute ward and room occupancy counters and report any drift."
+
+    def handle(self, *args, **options):
+        drift = occupancy.reconcile()
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"  {key}: {stored} -> {actual}")
+        if drift:
+            self.stdout.write(
+                self.style.WARNING(f"Corrected {len(drift)} drifted counters.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Occupancy counters are in sync."))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.14 on 2026-10-18 18:10
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_counters(apps, schema_editor):
+    Patient = apps.get_model("patients", "Patient")
+    occupying = Patient.objects.filter(
+        is_deleted=False, admission_date__isnull=False, discharge_date__isnull=True
+    ).order_by()
+    for model_name, column in (("Ward", "ward_id"), ("Room", "room_id")):
+        model = apps.get_model("hospital", model_name)
+        counts = (
+            occupying.exclude(**{f"{column}__isnull": True})
+            .values_list(column)
+            .annotate(n=Count("pk"))
+        )
+        for pk, occupied in counts:
+            model.objects.filter(pk=pk).update(occupied=occupied)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0015_history_object_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="occupied",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="ward",
+            name="occupied",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -15,6 +15,8 @@ class Ward(RemediumBaseModel):
 
     name = models.CharField(max_length=50, unique=True)
     capacity = models.PositiveIntegerField()
+    # Live admitted patients assigned here, maintained by hospital.occupancy.
+    occupied = models.IntegerField(default=0, editable=False)
 
     def clean(self):
         super().clean()
@@ -25,6 +27,11 @@ class Ward(RemediumBaseModel):
         self.clean()
         super().save(*args, **kwargs)
 
+    @property
+    def available(self):
+        """Free beds: capacity less current occupancy, never negative."""
+        return max(self.capacity - self.occupied, 0)
+
     def __str__(self):
         return self.name
 
@@ -47,6 +54,8 @@ class Room(RemediumBaseModel):
     ward = models.ForeignKey(Ward, on_delete=models.CASCADE)
     room_number = models.CharField(max_length=20)
     capacity = models.PositiveIntegerField()
+    # Live admitted patients in the room, maintained by hospital.occupancy.
+    occupied = models.IntegerField(default=0, editable=False)
 
     def clean(self):
         super().clean()
@@ -59,6 +68,11 @@ class Room(RemediumBaseModel):
         self.clean()
         super().save(*args, **kwargs)
 
+    @property
+    def available(self):
+        """Free beds in the room (never negative)."""
+        return max(self.capacity - self.occupied, 0)
+
     def __str__(self):
         return f"{self.ward.name} - Room {self.room_number}"
 
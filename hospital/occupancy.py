@@ -0,0 +1,195 @@
+"""
+Maintained bed occupancy.
+
+``Ward.occupied`` and ``Room.occupied`` hold the number of live, currently
+admitted patients (admission date set, no discharge date) assigned to each
+ward and room, so the bed board reads two small tables instead of walking
+every patient ever assigned to a room.
+
+``Patient.save()`` moves the counters with ``F()`` updates in the same
+transaction as the admission, transfer or discharge (see ``saved()``); the
+cascade soft delete/restore and the bulk import, which bypass ``save()``,
+go through ``tracking()`` and ``occupy()``. Queryset ``update()`` calls, raw
+SQL and restored backups bypass all of this: ``reconcile_occupancy``
+rebuilds the counters from the patient table and reports any drift.
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import Room, Ward
+
+# Patient columns that decide which bed, if any, a patient occupies.
+BED_FIELDS = ("ward_id", "room_id", "admission_date", "discharge_date", "is_deleted")
+
+OCCUPYING = Q(
+    is_deleted=False, admission_date__isnull=False, discharge_date__isnull=True
+)
+
+
+def bed(state):
+    """``(ward_id, room_id)`` occupied by a patient with ``state``, or ``None``."""
+    if (
+        state["is_deleted"]
+        or state["admission_date"] is None
+        or state["discharge_date"] is not None
+    ):
+        return None
+    if state["ward_id"] is None and state["room_id"] is None:
+        return None
+    return (state["ward_id"], state["room_id"])
+
+
+def adjust(ward_deltas, room_deltas):
+    """
+    Apply ``{pk: delta}`` changes to the ward and room counters. Rows are
+    updated wards first, each in primary key order, so concurrent transfers
+    in opposite directions lock them in the same order instead of
+    deadlocking.
+    """
+    for model, deltas in ((Ward, ward_deltas), (Room, room_deltas)):
+        for pk, delta in sorted(
+            (pk, delta) for pk, delta in deltas.items() if pk is not None
+        ):
+            if delta:
+                model.all_objects.filter(pk=pk).update(occupied=F("occupied") + delta)
+
+
+def move(old, new):
+    """Move the counters from bed ``old`` to bed ``new`` (either may be ``None``)."""
+    if old == new:
+        return
+    wards, rooms = Counter(), Counter()
+    if old:
+        wards[old[0]] -= 1
+        rooms[old[1]] -= 1
+    if new:
+        wards[new[0]] += 1
+        rooms[new[1]] += 1
+    adjust(wards, rooms)
+
+
+def _patients():
+    from patients.models import Patient
+
+    return Patient.all_objects.order_by()
+
+
+def stored_state(patient, lock=False):
+    """The saved ``BED_FIELDS`` of ``patient`` as a dict, or ``None`` if unsaved."""
+    if patient.pk is None:
+        return None
+    rows = _patients().filter(pk=patient.pk)
+    if lock:
+        rows = rows.select_for_update()
+    return rows.values(*BED_FIELDS).first()
+
+
+def written_fields(patient, update_fields=None):
+    """The ``BED_FIELDS`` a ``save(update_fields=...)`` of ``patient`` writes."""
+    if update_fields is None:
+        names = BED_FIELDS
+    else:
+        names = {patient._meta.get_field(name).attname for name in update_fields}
+    # Deferred fields are neither loaded nor written.
+    return [name for name in BED_FIELDS if name in names and name in patient.__dict__]
+
+
+def saved(patient, old, written):
+    """
+    Move the counters after ``patient`` was saved over the stored state
+    ``old`` (``None`` for an insert), writing the ``written`` fields.
+    """
+    new = dict(old or {})
+    new.update((name, patient.__dict__[name]) for name in written)
+    if len(new) < len(BED_FIELDS):
+        return
+    move(bed(old) if old else None, bed(new))
+
+
+@contextmanager
+def tracking(patient):
+    """
+    Move the counters by however the stored bed of ``patient`` changes inside
+    the block, for writes that bypass ``save()`` (the soft-delete cascade,
+    restore, hard delete). Runs the block in a transaction.
+    """
+    with transaction.atomic():
+        old = stored_state(patient, lock=True)
+        yield
+        new = stored_state(patient)
+        move(bed(old) if old else None, bed(new) if new else None)
+
+
+def occupy(patients):
+    """Count newly inserted ``patients`` (e.g. from ``bulk_create``) in the counters."""
+    wards, rooms = Counter(), Counter()
+    for patient in patients:
+        placed = bed({name: getattr(patient, name) for name in BED_FIELDS})
+        if placed:
+            wards[placed[0]] += 1
+            rooms[placed[1]] += 1
+    adjust(wards, rooms)
+
+
+def _occupying_patients():
+    return _patients().filter(OCCUPYING)
+
+
+def reconcile():
+    """
+    Rebuild every ward and room counter from the patient table.
+
+    Returns ``{"ward:<pk>" | "room:<pk>": (stored, actual)}`` for the
+    counters that had drifted.
+    """
+    drift = {}
+    patients = _occupying_patients()
+    with transaction.atomic():
+        for model, column in ((Ward, "ward_id"), (Room, "room_id")):
+            truth = dict(
+                patients.exclude(**{f"{column}__isnull": True})
+                .values_list(column)
+                .annotate(n=Count("pk"))
+            )
+            stored = dict(
+                model.all_objects.select_for_update().values_list("pk", "occupied")
+            )
+            for pk, occupied in stored.items():
+                actual = truth.get(pk, 0)
+                if occupied != actual:
+                    drift[f"{model._meta.model_name}:{pk}"] = (occupied, actual)
+                    model.all_objects.filter(pk=pk).update(occupied=actual)
+    return drift
+
+
+def board(occupants=True):
+    """
+    Wards for the bed board, each with ``board_rooms`` (its rooms in number
+    order). With ``occupants``, each room also gets ``occupants``, the live
+    admitted patients in it. At most three queries, however many patients
+    have ever been assigned to the rooms.
+    """
+    wards = list(Ward.objects.order_by("name"))
+    by_ward = {ward.pk: ward for ward in wards}
+    for ward in wards:
+        ward.board_rooms = []
+    by_room = {}
+    for room in Room.objects.filter(ward__in=wards).order_by("room_number"):
+        room.occupants = []
+        by_ward[room.ward_id].board_rooms.append(room)
+        by_room[room.pk] = room
+    occupied = [pk for pk, room in by_room.items() if room.occupied]
+    if occupants and occupied:
+        patients = (
+            _occupying_patients()
+            .filter(room_id__in=occupied)
+            .only("pk", "unique_id", "first_name", "last_name", "room_id")
+            .order_by("admission_date")
+        )
+        for patient in patients:
+            by_room[patient.room_id].occupants.append(patient)
+    return wards
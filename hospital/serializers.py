@@ -5,7 +5,8 @@ from .models import Ward, Room
 class WardSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ward
-        fields = ["id", "name", "capacity"]
+        fields = ["id", "name", "capacity", "occupied"]
+        read_only_fields = ["occupied"]
 
 
 class RoomSerializer(serializers.ModelSerializer):
@@ -13,4 +14,22 @@ class RoomSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Room
-        fields = ["id", "ward", "ward_name", "room_number", "capacity"]
+        fields = ["id", "ward", "ward_name", "room_number", "capacity", "occupied"]
+        read_only_fields = ["occupied"]
+
+
+class RoomOccupancySerializer(serializers.ModelSerializer):
+    available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Room
+        fields = ["id", "room_number", "capacity", "occupied", "available"]
+
+
+class WardOccupancySerializer(serializers.ModelSerializer):
+    available = serializers.IntegerField(read_only=True)
+    rooms = RoomOccupancySerializer(source="board_rooms", many=True, read_only=True)
+
+    class Meta:
+        model = Ward
+        fields = ["id", "name", "capacity", "occupied", "available", "rooms"]
@@ -5,6 +5,7 @@ from django.contrib.auth.models import User
 from django.urls import reverse
 from django.contrib.auth.models import Permission
 from django.test import Client
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from hospital.models import Ward, Room, HospitalService
@@ -16,6 +17,15 @@ def make_admin():
     )
 
 
+def login_with_permission(username, codename):
+    client = Client()
+    user = User.objects.create_user(username=username, password="pass")
+    perm = Permission.objects.get(codename=codename, content_type__app_label="hospital")
+    user.user_permissions.add(perm)
+    client.login(username=username, password="pass")
+    return client
+
+
 @pytest.fixture
 def admin_client():
     client = APIClient()
@@ -80,14 +90,6 @@ class TestRoomAPI:
 class TestWardViews:
     """Template rendering tests for Ward/Room views."""
 
-    def _login_with_permission(self, username, codename):
-        client = Client()
-        user = User.objects.create_user(username=username, password="pass")
-        perm = Permission.objects.get(codename=codename, content_type__app_label="hospital")
-        user.user_permissions.add(perm)
-        client.login(username=username, password="pass")
-        return client
-
     def test_ward_list_requires_permission(self):
         user = User.objects.create_user(username="testuser", password="pass")
         client = Client()
@@ -97,7 +99,7 @@ class TestWardViews:
         assert response.status_code == 403
 
     def test_ward_list_with_permission(self):
-        client = self._login_with_permission("permuser", "view_ward")
+        client = login_with_permission("permuser", "view_ward")
         url = reverse("hospital:ward_list")
         response = client.get(url)
         assert response.status_code == 200
@@ -105,7 +107,7 @@ class TestWardViews:
 
     def test_ward_detail_with_permission(self):
         ward = Ward.objects.create(name="ICU", capacity=10)
-        client = self._login_with_permission("permuser", "view_ward")
+        client = login_with_permission("permuser", "view_ward")
         url = reverse("hospital:ward_detail", kwargs={"pk": ward.pk})
         response = client.get(url)
         assert response.status_code == 200
@@ -115,15 +117,194 @@ class TestWardViews:
         HospitalService.objects.create(
             name="X-Ray", category="LABORATORY", base_price=100.00
         )
-        client = self._login_with_permission("permuser", "view_hospitalservice")
+        client = login_with_permission("permuser", "view_hospitalservice")
         url = reverse("hospital:service_list")
         response = client.get(url)
         assert response.status_code == 200
         assert "services" in response.context
 
     def test_occupancy_map_with_permission(self):
-        client = self._login_with_permission("permuser", "view_ward")
+        client = login_with_permission("permuser", "view_ward")
         url = reverse("hospital:occupancy_map")
         response = client.get(url)
         assert response.status_code == 200
         assert "wards" in response.context
+
+
+@pytest.mark.django_db
+class TestOccupancy:
+    """Maintained ward/room occupancy counters and the bed board."""
+
+    @pytest.fixture
+    def beds(self):
+        ward = Ward.objects.create(name="Acute", capacity=4)
+        other = Ward.objects.create(name="Recovery", capacity=4)
+        return (
+            ward,
+            Room.objects.create(ward=ward, room_number="1", capacity=2),
+            other,
+            Room.objects.create(ward=other, room_number="9", capacity=1),
+        )
+
+    def _admit(self, ward, room, n=1):
+        from patients.models import Patient
+
+        return Patient.objects.create(
+            unique_id=f"OCC-{n}",
+            first_name="Bed",
+            last_name=f"Holder{n}",
+            date_of_birth="1980-01-01",
+            gender="F",
+            admission_date=timezone.now(),
+            ward=ward,
+            room=room,
+        )
+
+    def _counts(self, *objs):
+        return [type(obj).all_objects.get(pk=obj.pk).occupied for obj in objs]
+
+    def test_admit_transfer_discharge(self, beds):
+        ward, room, other, other_room = beds
+        patient = self._admit(ward, room)
+        self._admit(ward, room, n=2)
+        assert self._counts(ward, room, other, other_room) == [2, 2, 0, 0]
+
+        patient.ward, patient.room = other, other_room
+        patient.save()
+        assert self._counts(ward, room, other, other_room) == [1, 1, 1, 1]
+
+        patient.discharge_date = timezone.now()
+        patient.save(update_fields=["discharge_date"])
+        assert self._counts(ward, room, other, other_room) == [1, 1, 0, 0]
+
+    def test_counters_locked_in_fixed_order(self, beds):
+        import re
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from hospital import occupancy
+
+        ward, room, other, other_room = beds
+        orders = []
+        for old, new in (
+            ((ward.pk, room.pk), (other.pk, other_room.pk)),
+            ((other.pk, other_room.pk), (ward.pk, room.pk)),
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                occupancy.move(old, new)
+            orders.append(
+                [
+                    re.search(r'UPDATE "(\w+)".* = (\d+)$', q["sql"]).groups()
+                    for q in ctx.captured_queries
+                ]
+            )
+        # A->B and B->A lock the same rows in the same order, wards first.
+        expected = [
+            ("hospital_ward", str(ward.pk)),
+            ("hospital_ward", str(other.pk)),
+            ("hospital_room", str(room.pk)),
+            ("hospital_room", str(other_room.pk)),
+        ]
+        assert orders == [expected, expected]
+
+    def test_unrelated_save_leaves_counters(self, beds):
+        ward, room, _, _ = beds
+        patient = self._admit(ward, room)
+        patient.first_name = "Renamed"
+        patient.save(update_fields=["first_name"])
+        patient.save()
+        assert self._counts(ward, room) == [1, 1]
+
+    def test_soft_delete_restore_and_hard_delete(self, beds):
+        ward, room, _, _ = beds
+        patient = self._admit(ward, room)
+        patient.delete()
+        assert self._counts(ward, room) == [0, 0]
+        patient.restore()
+        assert self._counts(ward, room) == [1, 1]
+        patient.hard_delete()
+        assert self._counts(ward, room) == [0, 0]
+
+    def test_import_counts_admitted_rows(self, beds):
+        from patients import importer
+
+        ward, room, _, _ = beds
+        rows = (
+            "unique_id,first_name,last_name,date_of_birth,gender,admission_date,ward,room\n"
+            f"IMP-1,A,B,1970-01-01,M,2026-01-01T08:00:00Z,{ward.pk},{room.pk}\n"
+            "IMP-2,C,D,1970-01-01,F,,,\n"
+        )
+        report = importer.import_patients(rows.encode().splitlines(keepends=True))
+        assert report.created == 2
+        assert self._counts(ward, room) == [1, 1]
+
+    def test_reconcile_command_fixes_drift(self, beds):
+        from io import StringIO
+        from django.core.management import call_command
+
+        ward, room, _, _ = beds
+        self._admit(ward, room)
+        Ward.objects.filter(pk=ward.pk).update(occupied=7)
+        out = StringIO()
+        call_command("reconcile_occupancy", stdout=out)
+        assert f"ward:{ward.pk}: 7 -> 1" in out.getvalue()
+        assert self._counts(ward, room) == [1, 1]
+        call_command("reconcile_occupancy", stdout=out)
+        assert "in sync" in out.getvalue()
+
+    def test_occupancy_map_lists_current_occupants_only(self, beds):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        ward, room, _, _ = beds
+        self._admit(ward, room)
+        discharged = self._admit(ward, room, n=2)
+        discharged.discharge_date = timezone.now()
+        discharged.save()
+
+        client = login_with_permission("boarduser", "view_ward")
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("hospital:occupancy_map"))
+        assert response.status_code == 200
+        # Wards, rooms, and one query for the current occupants.
+        board_queries = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if "hospital_" in q["sql"] or "patients_patient" in q["sql"]
+        ]
+        assert len(board_queries) == 3
+        board = {w.name: w for w in response.context["wards"]}
+        (board_room,) = board["Acute"].board_rooms
+        assert board_room.occupied == 1
+        assert [p.last_name for p in board_room.occupants] == ["Holder1"]
+        assert board["Recovery"].board_rooms[0].occupants == []
+
+    def test_occupancy_api(self, beds):
+        ward, room, _, _ = beds
+        self._admit(ward, room)
+        user = User.objects.create_user(username="bedmgr", password="pass")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = "/api/v1/wards/occupancy/"
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        user.user_permissions.add(
+            Permission.objects.get(
+                codename="view_ward", content_type__app_label="hospital"
+            )
+        )
+        client.force_authenticate(user=User.objects.get(pk=user.pk))
+        r = client.get(url)
+        assert r.status_code == status.HTTP_200_OK
+        acute = next(w for w in r.data if w["id"] == ward.pk)
+        assert acute["occupied"] == 1 and acute["available"] == 3
+        assert acute["rooms"] == [
+            {
+                "id": room.pk,
+                "room_number": "1",
+                "capacity": 2,
+                "occupied": 1,
+                "available": 1,
+            }
+        ]
+        # The write endpoints stay admin-only.
+        assert client.get("/api/v1/wards/").status_code == status.HTTP_403_FORBIDDEN
@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.views import generic
 from .models import Ward, Room, HospitalService
 from .forms import WardForm, RoomForm
+from . import occupancy
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
@@ -35,10 +36,8 @@ class OccupancyMapView(
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Prefetch wards with rooms, and rooms with patients
-        context["wards"] = Ward.objects.prefetch_related(
-            "rooms", "rooms__patient_set"
-        ).all()
+        # Maintained counters plus the current occupants only.
+        context["wards"] = occupancy.board()
         return context
 
 
@@ -2,9 +2,11 @@ from rest_framework import viewsets, filters
 from .models import LabTest
 from .serializers import LabTestSerializer
 from core.permissions import IsLabStaff
+from core.api_utils import SparseQuerysetMixin
+from core.export import ExportMixin
 
 
-class LabTestViewSet(viewsets.ModelViewSet):
+class LabTestViewSet(ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = LabTest.objects.select_related("patient").all()
     serializer_class = LabTestSerializer
     permission_classes = [IsLabStaff]
@@ -12,3 +14,4 @@ class LabTestViewSet(viewsets.ModelViewSet):
     search_fields = ["patient__first_name", "patient__last_name", "test_name"]
     ordering_fields = ["requested_date", "status"]
     ordering = ["-requested_date"]
+    cursor_ordering = ["-requested_date", "-id"]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("laboratory", "0007_alter_historicallabtest_created_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicallabtest",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicallabtest",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="laboratory__history_03bec1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicallabtest",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="laboratory__history_dcac81_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("laboratory", "0008_history_audit_indexes"),
+        ("patients", "0012_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="labtest",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-requested_date"],
+                name="lab_live_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="labtest",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["status", "-requested_date"],
+                name="lab_live_status_date_idx",
+            ),
+        ),
+    ]
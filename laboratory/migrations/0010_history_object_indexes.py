@@ -0,0 +1,28 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("laboratory", "0009_live_partial_indexes"),
+        ("patients", "0014_contact_blind_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="historicallabtest",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="laboratory__id_d724e1_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,6 @@
 from django.db import models
 from patients.models import Patient
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class LabTest(RemediumBaseModel):
@@ -13,6 +12,18 @@ class LabTest(RemediumBaseModel):
             ("laboratory_change_labtest", "Can change lab test"),
             ("laboratory_delete_labtest", "Can delete lab test"),
         ]
+        indexes = [
+            models.Index(
+                fields=["-requested_date"],
+                name="lab_live_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "-requested_date"],
+                name="lab_live_status_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     patient = models.ForeignKey("patients.Patient", on_delete=models.CASCADE)
     service = models.ForeignKey(
@@ -42,4 +53,4 @@ class LabTest(RemediumBaseModel):
     def __str__(self):
         return f"{self.test_name} for {self.patient}"
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
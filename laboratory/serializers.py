@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from .models import LabTest
 
 
-class LabTestSerializer(serializers.ModelSerializer):
+class LabTestSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = LabTest
         fields = "__all__"
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0009_history_audit_indexes"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("medical_records", "0004_encounter_created_at_encounter_deleted_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        ("staff", "0010_history_audit_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalencounter",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name="historicalpatientdocument",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalencounter",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="medical_rec_history_1aa085_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalencounter",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="medical_rec_history_193d14_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatientdocument",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="medical_rec_history_306b16_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatientdocument",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="medical_rec_history_477d0c_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("medical_records", "0005_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="historicalencounter",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="medical_rec_id_6fa0de_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="historicalpatientdocument",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="medical_rec_id_b99f61_idx",
+            ),
+        ),
+    ]
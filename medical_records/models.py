@@ -3,10 +3,9 @@ from django.utils import timezone
 from patients.models import Patient
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
-from simple_history.models import HistoricalRecords
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from core.models import RemediumBaseModel
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 # 10 MB file size limit
 MAX_FILE_SIZE = 10 * 1024 * 1024
@@ -47,7 +46,7 @@ class Encounter(RemediumBaseModel):
         related_name="encounter",
     )
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     class Meta:
         ordering = ["-start_time"]
@@ -98,7 +97,7 @@ class PatientDocument(RemediumBaseModel):
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey("content_type", "object_id")
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def clean(self):
         super().clean()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationCounter
 
 
 @admin.register(Notification)
@@ -7,3 +7,10 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = ("recipient", "notification_type", "status", "sent_at")
     list_filter = ("notification_type", "status", "sent_at")
     search_fields = ("recipient", "message")
+
+
+@admin.register(NotificationCounter)
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ("scope", "pending", "updated_at")
+    search_fields = ("scope",)
+    readonly_fields = ("scope", "pending", "updated_at")
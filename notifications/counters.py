@@ -0,0 +1,175 @@
+"""
+Maintained pending-notification counters.
+
+Instead of counting the (unbounded) notification table on every page, a
+``NotificationCounter`` row per scope holds the number of pending
+notifications: one ``global`` row plus one per recipient and per patient.
+Single-row changes are applied from the signals in ``notifications.signals``;
+bulk status changes must go through ``mark_pending_sent()`` so the counters
+move with them. ``reconcile_notification_counters`` rebuilds everything from
+the source table.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+
+GLOBAL_SCOPE = "global"
+BATCH_SIZE = 1000
+
+
+def scopes_for(recipient=None, patient_id=None):
+    """Counter scopes a notification with these attributes contributes to."""
+    scopes = [GLOBAL_SCOPE]
+    if recipient:
+        scopes.append(f"recipient:{recipient}")
+    if patient_id:
+        scopes.append(f"patient:{patient_id}")
+    return scopes
+
+
+def adjust(deltas):
+    """Apply ``{scope: delta}`` changes with ``F()`` updates, creating missing rows."""
+    from .models import NotificationCounter
+
+    for scope, delta in deltas.items():
+        if not delta:
+            continue
+        updated = NotificationCounter.objects.filter(scope=scope).update(
+            pending=F("pending") + delta
+        )
+        if not updated:
+            NotificationCounter.objects.bulk_create(
+                [NotificationCounter(scope=scope, pending=0)], ignore_conflicts=True
+            )
+            NotificationCounter.objects.filter(scope=scope).update(
+                pending=F("pending") + delta
+            )
+
+
+def unread_count(recipient=None, patient_id=None):
+    """
+    Pending notifications, globally or for one recipient / patient.
+
+    A single primary-key-sized lookup on the counter table.
+    """
+    from .models import NotificationCounter
+
+    if patient_id:
+        scope = f"patient:{patient_id}"
+    elif recipient:
+        scope = f"recipient:{recipient}"
+    else:
+        scope = GLOBAL_SCOPE
+    pending = (
+        NotificationCounter.objects.filter(scope=scope)
+        .values_list("pending", flat=True)
+        .first()
+    )
+    return max(pending or 0, 0)
+
+
+def mark_pending_sent(queryset=None):
+    """
+    Mark pending notifications in ``queryset`` as sent, in batches, keeping
+    the counters in step. Returns the number of notifications updated.
+    """
+    from .models import Notification
+
+    queryset = Notification.objects.all() if queryset is None else queryset
+    pending = queryset.filter(status="PENDING").order_by("pk")
+    total = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                pending.filter(pk__gt=last_pk).values_list(
+                    "pk", "recipient", "patient_id"
+                )[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            ids = [row[0] for row in batch]
+            updated = Notification.objects.filter(
+                pk__in=ids, status="PENDING"
+            ).update(status="SENT")
+            if updated == len(ids):
+                deltas = Counter()
+                for _, recipient, patient_id in batch:
+                    for scope in scopes_for(recipient, patient_id):
+                        deltas[scope] -= 1
+                adjust(deltas)
+            else:
+                # Some rows changed concurrently; recount just the affected scopes.
+                recount(
+                    {
+                        scope
+                        for _, recipient, patient_id in batch
+                        for scope in scopes_for(recipient, patient_id)
+                    }
+                )
+            total += updated
+            last_pk = ids[-1]
+    return total
+
+
+def compute_counts():
+    """Return ``{scope: pending}`` computed from the notification table."""
+    from .models import Notification
+
+    pending = Notification.objects.filter(status="PENDING").order_by()
+    counts = {GLOBAL_SCOPE: pending.count()}
+    for row in pending.values("recipient").annotate(n=Count("pk")):
+        if row["recipient"]:
+            counts[f"recipient:{row['recipient']}"] = row["n"]
+    for row in (
+        pending.filter(patient__isnull=False).values("patient_id").annotate(n=Count("pk"))
+    ):
+        counts[f"patient:{row['patient_id']}"] = row["n"]
+    return counts
+
+
+def recount(scopes):
+    """Recompute the given scopes from the source table."""
+    from .models import Notification, NotificationCounter
+
+    pending = Notification.objects.filter(status="PENDING").order_by()
+    for scope in scopes:
+        if scope.startswith("recipient:"):
+            count = pending.filter(recipient=scope.split(":", 1)[1]).count()
+        elif scope.startswith("patient:"):
+            count = pending.filter(patient_id=scope.split(":", 1)[1]).count()
+        else:
+            count = pending.count()
+        NotificationCounter.objects.update_or_create(
+            scope=scope, defaults={"pending": count}
+        )
+
+
+def reconcile():
+    """
+    Rebuild every counter from the notification table.
+
+    Returns ``{scope: (stored, actual)}`` for the scopes that had drifted.
+    """
+    from .models import NotificationCounter
+
+    with transaction.atomic():
+        truth = compute_counts()
+        stored = dict(NotificationCounter.objects.values_list("scope", "pending"))
+        drift = {
+            scope: (stored.get(scope, 0), truth.get(scope, 0))
+            for scope in set(stored) | set(truth)
+            if stored.get(scope, 0) != truth.get(scope, 0)
+        }
+        NotificationCounter.objects.all().delete()
+        NotificationCounter.objects.bulk_create(
+            [
+                NotificationCounter(scope=scope, pending=pending)
+                for scope, pending in truth.items()
+                if pending or scope == GLOBAL_SCOPE
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return drift
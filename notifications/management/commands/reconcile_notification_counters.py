@@ -0,0 +1,30 @@
+"""
+Rebuild the maintained notification counters from the notification table.
+
+Signals keep the counters in step with single-row writes, but raw SQL,
+``QuerySet.update()`` calls that bypass ``counters.mark_pending_sent()`` or
+restored backups can leave them drifted. Run this periodically (or after such
+an operation) to correct them.
+
+Usage:
+    python manage.py reconcile_notification_counters
+"""
+
+from django.core.management.base import BaseCommand
+
+from notifications import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute pending-notification counters and report any drift."
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile()
+        for scope, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"  {scope}: {stored} -> {actual}")
+        if drift:
+            self.stdout.write(
+                self.style.WARNING(f"Corrected {len(drift)} drifted counters.")
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("Notification counters are in sync."))
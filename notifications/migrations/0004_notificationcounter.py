@@ -0,0 +1,57 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:44
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def seed_counters(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationCounter = apps.get_model("notifications", "NotificationCounter")
+    pending = Notification.objects.filter(status="PENDING", is_deleted=False).order_by()
+    counters = [NotificationCounter(scope="global", pending=pending.count())]
+    for row in (
+        pending.exclude(recipient="").values("recipient").annotate(n=Count("pk"))
+    ):
+        counters.append(
+            NotificationCounter(scope=f"recipient:{row['recipient']}", pending=row["n"])
+        )
+    for row in (
+        pending.filter(patient__isnull=False)
+        .values("patient_id")
+        .annotate(n=Count("pk"))
+    ):
+        counters.append(
+            NotificationCounter(scope=f"patient:{row['patient_id']}", pending=row["n"])
+        )
+    NotificationCounter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "notifications",
+            "0003_notification_created_at_notification_deleted_at_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("scope", models.CharField(max_length=300, unique=True)),
+                ("pending", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
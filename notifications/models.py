@@ -28,6 +28,18 @@ class Notification(RemediumBaseModel):
             ("notifications_delete_notification", "Can delete notification"),
         ]
         ordering = ["-sent_at"]
+        indexes = [
+            models.Index(
+                fields=["-sent_at"],
+                name="notif_live_sent_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "-sent_at"],
+                name="notif_live_status_sent_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     # Recipient information
     recipient = models.CharField(
@@ -71,3 +83,21 @@ class Notification(RemediumBaseModel):
         if error:
             self.error_message = error
         self.save(update_fields=["status", "error_message"])
+
+
+class NotificationCounter(models.Model):
+    """
+    Maintained count of pending notifications for one scope.
+
+    Scopes are ``global``, ``recipient:<address>`` and ``patient:<id>``. Rows
+    are kept up to date by ``notifications.counters`` from Notification
+    signals and bulk status changes, and rebuilt by the
+    ``reconcile_notification_counters`` command.
+    """
+
+    scope = models.CharField(max_length=300, unique=True)
+    pending = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.scope}: {self.pending} pending"
@@ -1,8 +1,10 @@
 import logging
-from django.db.models.signals import post_save
+from collections import Counter
+from django.db.models.signals import post_save, post_delete, post_init
 from django.dispatch import receiver
 from appointments.models import Appointment
 from .models import Notification
+from . import counters
 from django.core.mail import send_mail
 
 logger = logging.getLogger(__name__)
@@ -39,3 +41,45 @@ def send_appointment_notification(sender, instance, created, **kwargs):
                 )
             except Exception as e:
                 logger.warning(f"Failed to send appointment notification email: {e}")
+
+
+def _counter_state(instance):
+    """(is_pending, recipient, patient_id) as far as the counters are concerned.
+
+    Reads ``__dict__`` so deferred fields are never loaded just for this.
+    """
+    data = instance.__dict__
+    is_pending = data.get("status") == "PENDING" and not data.get("is_deleted")
+    return (is_pending, data.get("recipient"), data.get("patient_id"))
+
+
+@receiver(post_init, sender=Notification)
+def remember_counter_state(sender, instance, **kwargs):
+    instance._counter_state = _counter_state(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Notification)
+def update_notification_counters(sender, instance, created, **kwargs):
+    """Move the pending counters when a notification is created or changes status."""
+    old = None if created else getattr(instance, "_counter_state", None)
+    new = _counter_state(instance)
+    if old == new:
+        return
+    deltas = Counter()
+    if old and old[0]:
+        for scope in counters.scopes_for(old[1], old[2]):
+            deltas[scope] -= 1
+    if new[0]:
+        for scope in counters.scopes_for(new[1], new[2]):
+            deltas[scope] += 1
+    counters.adjust(deltas)
+    instance._counter_state = new
+
+
+@receiver(post_delete, sender=Notification)
+def release_notification_counters(sender, instance, **kwargs):
+    state = getattr(instance, "_counter_state", None)
+    if state and state[0]:
+        counters.adjust(
+            {scope: -1 for scope in counters.scopes_for(state[1], state[2])}
+        )
@@ -165,6 +165,73 @@ class TestNotificationModel:
         assert Notification.objects.filter(status="PENDING").count() == 0
         assert Notification.objects.filter(status="SENT").count() == 2
 
+    def test_unread_count_follows_writes(self):
+        """Badge count follows create, status change and mark-all-read."""
+        from notifications.counters import unread_count
+
+        assert unread_count() == 0
+        notif = Notification.objects.create(
+            recipient="test@test.com", notification_type="EMAIL", message="One"
+        )
+        Notification.objects.create(
+            recipient="test@test.com", notification_type="EMAIL", message="Two"
+        )
+        assert unread_count() == 2
+        notif.mark_sent()
+        assert unread_count() == 1
+        client = self._login_with_permission("testuser5", "change_notification")
+        client.post(reverse("notification_mark_all_read"))
+        assert unread_count() == 0
+
+    def test_counters_follow_status_and_soft_delete(self):
+        """Per-recipient and per-patient counters move with status changes and soft deletes."""
+        from notifications.counters import unread_count
+
+        patient = Patient.objects.create(
+            unique_id="PAT_NOTIF_CNT",
+            first_name="Test",
+            last_name="Patient",
+            date_of_birth=timezone.now().date() - timedelta(days=365 * 30),
+            gender="M",
+        )
+        first = Notification.objects.create(
+            recipient="a@test.com", notification_type="EMAIL", message="One", patient=patient
+        )
+        Notification.objects.create(
+            recipient="b@test.com", notification_type="EMAIL", message="Two", patient=patient
+        )
+        assert unread_count(recipient="a@test.com") == 1
+        assert unread_count(patient_id=patient.pk) == 2
+        first.mark_failed("bounced")
+        assert unread_count(recipient="a@test.com") == 0
+        assert unread_count(patient_id=patient.pk) == 1
+        first.status = "PENDING"
+        first.save()
+        assert unread_count() == 2
+        first.delete()
+        assert unread_count() == 1
+        assert unread_count(recipient="a@test.com") == 0
+
+    def test_reconcile_command_fixes_drift(self):
+        """reconcile_notification_counters rebuilds counters changed behind the signals."""
+        from io import StringIO
+        from django.core.management import call_command
+        from notifications.counters import unread_count
+
+        Notification.objects.create(
+            recipient="test@test.com", notification_type="EMAIL", message="One"
+        )
+        Notification.objects.create(
+            recipient="test@test.com", notification_type="EMAIL", message="Two"
+        )
+        Notification.objects.update(status="SENT")
+        assert unread_count() == 2
+        out = StringIO()
+        call_command("reconcile_notification_counters", stdout=out)
+        assert "Corrected" in out.getvalue()
+        assert unread_count() == 0
+        assert unread_count(recipient="test@test.com") == 0
+
     def test_notification_ordering(self):
         """Test notifications are ordered by sent_at descending."""
         patient = Patient.objects.create(
@@ -5,6 +5,7 @@ from django.contrib import messages
 from django.views import generic
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from .models import Notification
+from .counters import mark_pending_sent
 
 
 class NotificationListView(
@@ -34,6 +35,6 @@ def mark_read(request, pk):
 @permission_required("notifications.change_notification", raise_exception=True)
 @require_POST
 def mark_all_read(request):
-    Notification.objects.filter(status="PENDING").update(status="SENT")
+    mark_pending_sent()
     messages.success(request, "All notifications marked as read.")
     return redirect("notification_list")
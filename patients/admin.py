@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Patient
+from .search import contact_matches
 
 
 @admin.register(Patient)
@@ -14,7 +15,9 @@ class PatientAdmin(admin.ModelAdmin):
         "admission_date",
     ]
     list_filter = ["gender", "admission_date", "ward", "insurance_provider"]
-    search_fields = ["unique_id", "first_name", "last_name", "phone", "email"]
+    # Phone and email are encrypted; get_search_results matches them exactly
+    # through their blind indexes.
+    search_fields = ["unique_id", "first_name", "last_name"]
     date_hierarchy = "admission_date"
     list_per_page = 25
 
@@ -60,3 +63,12 @@ class PatientAdmin(admin.ModelAdmin):
 
     is_admitted.boolean = True
     is_admitted.short_description = "Currently Admitted"
+
+    def get_search_results(self, request, queryset, search_term):
+        contacts = contact_matches(queryset, search_term)
+        queryset, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if contacts is not None:
+            queryset |= contacts
+        return queryset, may_have_duplicates
@@ -1,13 +1,22 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from django.utils import timezone
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from . import importer
+from . import summary as patient_summary
 from .models import Patient
+from .search import PatientSearchFilter, RankedOrderingFilter
 from .serializers import PatientSerializer, PatientBriefSerializer
 from core.permissions import IsClinicalStaff, IsAdminUser
 from core.serializers import StandardErrorSerializer
+from core.api_utils import CSVStreamParser, NDJSONStreamParser, SparseQuerysetMixin
+from core.export import ExportMixin
 
 
 from django_filters.rest_framework import DjangoFilterBackend
@@ -17,6 +26,24 @@ from django_filters.rest_framework import DjangoFilterBackend
     list=extend_schema(
         summary="List all patients",
         description="Retrieve a paginated list of all patients. Clinical staff receive the full record; admins and receptionists receive a brief summary.",
+        parameters=[
+            OpenApiParameter(
+                "phone",
+                str,
+                description="Exact phone number (patient or emergency contact); punctuation is ignored.",
+            ),
+            OpenApiParameter(
+                "email", str, description="Exact email address, case-insensitive."
+            ),
+            OpenApiParameter(
+                "fields",
+                str,
+                description="Comma-separated fields to return; other columns are not loaded.",
+            ),
+            OpenApiParameter(
+                "omit", str, description="Comma-separated fields to leave out."
+            ),
+        ],
     ),
     retrieve=extend_schema(
         summary="Get patient details",
@@ -39,38 +66,53 @@ from django_filters.rest_framework import DjangoFilterBackend
         description="Permanently remove a patient record from the system.",
     ),
 )
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(ExportMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     queryset = Patient.objects.all()
     serializer_class = PatientSerializer
     permission_classes = [IsClinicalStaff]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        PatientSearchFilter,
+        RankedOrderingFilter,
     ]
     filterset_fields = ["gender", "ward", "room"]
-    search_fields = ["unique_id", "first_name", "last_name", "email"]
+    search_fields = ["unique_id", "first_name", "last_name"]
     ordering_fields = ["admission_date", "first_name", "last_name"]
     ordering = ["-admission_date"]
+    # Opt-in keyset pagination (?cursor=); see core.pagination.HybridPagination.
+    cursor_ordering = ["-admission_date", "-id"]
 
     # Roles that receive the brief (non-PHI) serializer on list/retrieve
     _BRIEF_ROLES = {"RECEPTIONIST", "ADMIN"}
 
+    def get_queryset(self):
+        """Apply the exact ``?phone=`` / ``?email=`` blind-index lookups."""
+        queryset = super().get_queryset()
+        phone = self.request.query_params.get("phone")
+        if phone:
+            queryset = queryset.by_phone(phone, include_emergency=True)
+        email = self.request.query_params.get("email")
+        if email:
+            queryset = queryset.by_email(email)
+        return queryset
+
     def get_serializer_class(self):
         """
         Return PatientBriefSerializer for non-clinical staff (e.g. receptionist,
-        admin) on list/retrieve actions, and PatientFullSerializer for clinical staff.
+        admin) on list/retrieve/export actions, and PatientFullSerializer for clinical staff.
         """
-        if self.action in ("list", "retrieve"):
-            user = self.request.user
-            try:
-                role = user.staff_profile.role
-            except AttributeError:
-                role = None
-            if role in self._BRIEF_ROLES and not user.is_superuser:
-                return PatientBriefSerializer
+        if self.action in ("list", "retrieve", "export") and self._is_brief_user():
+            return PatientBriefSerializer
         return PatientSerializer
 
+    def _is_brief_user(self):
+        user = self.request.user
+        try:
+            role = user.staff_profile.role
+        except AttributeError:
+            role = None
+        return role in self._BRIEF_ROLES and not user.is_superuser
+
     @extend_schema(
         summary="List admitted patients",
         description="Retrieve a list of all patients currently admitted to the hospital (those with an admission date but no discharge date).",
@@ -85,6 +127,97 @@ class PatientViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(admitted, many=True)
         return Response(serializer.data)
 
+    @extend_schema(
+        summary="Patient chart summary",
+        description=(
+            "The patient with their recent appointments, care records and vitals "
+            "chart, prescriptions, lab tests, encounters and documents, in one "
+            "response. Cached server-side; send the returned ETag in If-None-Match "
+            "to get 304 Not Modified while nothing has changed. Non-clinical roles "
+            "receive the brief patient record and appointments only."
+        ),
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+    )
+    @action(detail=True, methods=["get"])
+    def summary(self, request, pk=None):
+        """Cached chart summary with ETag-based conditional GET."""
+        patient = self.get_object()
+        variant = (
+            patient_summary.BRIEF if self._is_brief_user() else patient_summary.FULL
+        )
+        version = patient_summary.etag(patient.pk, variant)
+        quoted = quote_etag(version)
+        headers = {"ETag": quoted, "Cache-Control": "private, no-cache"}
+        # Weak comparison, as If-None-Match requires.
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in client_etags or quoted in {
+            t.removeprefix("W/") for t in client_etags
+        }:
+            response = HttpResponseNotModified()
+            for name, value in headers.items():
+                response[name] = value
+            return response
+        payload = patient_summary.get(patient.pk, variant, version)
+        return Response(payload, headers=headers)
+
+    @extend_schema(
+        summary="Bulk import patients",
+        description=(
+            "Create patients from CSV (header row of field names) or NDJSON (one "
+            "JSON object per line), sent as the request body or as a `file` "
+            "upload. The input is read as a stream and inserted in batches. Rows "
+            "that fail validation are skipped and listed with their line number "
+            "in `errors`; the rest are imported."
+        ),
+        request={
+            "text/csv": OpenApiTypes.BINARY,
+            "application/x-ndjson": OpenApiTypes.BINARY,
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            },
+        },
+        parameters=[
+            OpenApiParameter(
+                "dry_run", bool, description="Validate only; nothing is written."
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: StandardErrorSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[CSVStreamParser, NDJSONStreamParser, MultiPartParser],
+        permission_classes=[IsAdminUser],
+    )
+    def bulk_import(self, request):
+        """Stream a CSV/NDJSON file of patients into the database."""
+        upload = request.FILES.get("file")
+        if upload is not None:
+            stream = upload
+            is_ndjson = upload.name.lower().endswith((".ndjson", ".jsonl"))
+        else:
+            stream = request.data
+            is_ndjson = request.content_type.startswith(NDJSONStreamParser.media_type)
+        if not hasattr(stream, "read"):
+            raise ValidationError(
+                {
+                    "detail": "Send CSV or NDJSON as the request body or as a file upload."
+                }
+            )
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true")
+        try:
+            report = importer.import_patients(
+                stream,
+                "ndjson" if is_ndjson else "csv",
+                dry_run=dry_run,
+                user=request.user,
+            )
+        except importer.ImportFormatError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(report.as_dict())
+
     @extend_schema(
         summary="Discharge patient",
         description="Mark a patient as discharged. Sets the discharge date to the current time.",
@@ -101,4 +234,3 @@ class PatientViewSet(viewsets.ModelViewSet):
         patient.save()
         serializer = self.get_serializer(patient)
         return Response(serializer.data)
-
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PatientsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "patients"
+
+    def ready(self):
+        from patients.search import ensure_index_after_migrate
+
+        post_migrate.connect(
+            ensure_index_after_migrate,
+            sender=self,
+            dispatch_uid="patients_search_index",
+        )
@@ -0,0 +1,255 @@
+"""
+Bulk patient import from CSV or NDJSON.
+
+Creating patients one at a time costs a ``save()``, an ``INSERT`` and a
+history ``INSERT`` per row, which is far too slow to onboard a facility with
+hundreds of thousands of legacy records. ``import_patients()`` instead reads
+the input as a stream and, per batch of ``batch_size`` rows:
+
+- validates every row with ``PatientImportSerializer`` (no queries), then
+  checks unique IDs and ward/room ids with one query each;
+- computes the blind indexes, and inserts the valid rows with one
+  ``bulk_create`` plus one bulk history insert (the encrypted fields are
+  encrypted as part of the insert).
+
+Rows that fail are reported with their line number and errors and do not
+stop the import. Each batch is its own transaction, so a large import can
+be resumed by re-running it: rows already imported are reported as
+duplicate unique IDs.
+
+Neither ``save()`` nor ``post_save`` run for imported rows; ward and room
+occupancy counters are moved and dashboard snapshots invalidated here
+instead.
+"""
+
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.db import IntegrityError, transaction
+from simple_history.utils import bulk_create_with_history
+
+from core import snapshots
+from hospital import occupancy
+from hospital.models import Room, Ward
+
+from .models import Patient
+from .serializers import PatientImportSerializer
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+CHANGE_REASON = "Bulk import"
+
+FORMATS = ("csv", "ndjson")
+COLUMNS = set(PatientImportSerializer.Meta.fields)
+
+
+class ImportFormatError(ValueError):
+    """The input cannot be read as the requested format at all."""
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    valid: int = 0
+    created: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, unique_id, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "unique_id": unique_id, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "valid": self.valid,
+            "created": self.created,
+            "failed": self.failed,
+            "dry_run": self.dry_run,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _text_lines(stream):
+    """Iterate ``stream`` (bytes or text) as decoded lines."""
+    lines = iter(stream)
+    first = next(lines, None)
+    if first is None:
+        return
+    if isinstance(first, str):
+        yield first.lstrip("\ufeff")
+        yield from lines
+        return
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        yield decoder.decode(first)
+        for line in lines:
+            yield decoder.decode(line)
+        yield decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("Input is not valid UTF-8.") from exc
+
+
+def _cleaned(row):
+    """Drop empty values so they import as NULL/default rather than ``""``."""
+    return {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def read_csv(stream):
+    """Yield ``(line, row)`` from CSV with a header row of field names."""
+    reader = csv.DictReader(_text_lines(stream))
+    if not reader.fieldnames:
+        return
+    unknown = sorted(set(reader.fieldnames) - COLUMNS)
+    if unknown:
+        raise ImportFormatError(f"Unknown columns: {', '.join(unknown)}.")
+    for row in reader:
+        row.pop(None, None)
+        yield reader.line_num, _cleaned(row)
+
+
+def read_ndjson(stream):
+    """Yield ``(line, row)`` from one JSON object per line."""
+    for line, text in enumerate(_text_lines(stream), start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError:
+            row = None
+        yield line, _cleaned(row) if isinstance(row, dict) else None
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _validate_rows(batch, report):
+    """Rows of ``batch`` that pass the serializer, as ``(line, data)``."""
+    valid = []
+    for line, row in batch:
+        if row is None:
+            report.add_error(line, None, {"non_field_errors": ["Not a JSON object."]})
+            continue
+        unknown = sorted(set(row) - COLUMNS)
+        if unknown:
+            errors = {"non_field_errors": [f"Unknown fields: {', '.join(unknown)}."]}
+            report.add_error(line, row.get("unique_id"), errors)
+            continue
+        serializer = PatientImportSerializer(data=row)
+        if not serializer.is_valid():
+            report.add_error(line, row.get("unique_id"), dict(serializer.errors))
+            continue
+        valid.append((line, serializer.validated_data))
+    return valid
+
+
+def _existing(queryset, field_name, values):
+    return set(
+        queryset.filter(**{f"{field_name}__in": values}).values_list(
+            field_name, flat=True
+        )
+    )
+
+
+def _validate(batch, report, seen):
+    """Valid, unsaved ``(line, Patient)`` pairs of ``batch``; errors go to ``report``."""
+    valid = _validate_rows(batch, report)
+    # One query each for the checks the serializer leaves to the batch.
+    existing = _existing(
+        Patient.all_objects, "unique_id", [data["unique_id"] for _, data in valid]
+    )
+    known = {
+        "ward": _existing(Ward.objects, "pk", {data.get("ward") for _, data in valid}),
+        "room": _existing(Room.objects, "pk", {data.get("room") for _, data in valid}),
+    }
+
+    patients = []
+    for line, data in valid:
+        unique_id = data["unique_id"]
+        errors = {}
+        if unique_id in existing:
+            errors["unique_id"] = ["A patient with this unique ID already exists."]
+        elif unique_id in seen:
+            errors["unique_id"] = ["Duplicate unique ID earlier in this import."]
+        for name, pks in known.items():
+            if data.get(name) is not None and data[name] not in pks:
+                errors[name] = [f'Invalid pk "{data[name]}" - object does not exist.']
+        if errors:
+            report.add_error(line, unique_id, errors)
+            continue
+        seen.add(unique_id)
+        data = dict(data)
+        ward_id, room_id = data.pop("ward", None), data.pop("room", None)
+        patient = Patient(**data, ward_id=ward_id, room_id=room_id)
+        patient.refresh_blind_indexes()
+        patients.append((line, patient))
+    return patients
+
+
+def _insert(patients, report, user):
+    """Insert ``patients`` with their history, isolating rows that clash."""
+    options = {"default_user": user, "default_change_reason": CHANGE_REASON}
+    try:
+        with transaction.atomic():
+            created = bulk_create_with_history(
+                [p for _, p in patients], Patient, **options
+            )
+            occupancy.occupy(created)
+        report.created += len(patients)
+        return
+    except IntegrityError:
+        pass
+    # A concurrent writer took one of the unique IDs: retry row by row.
+    for line, patient in patients:
+        patient.pk = None
+        try:
+            with transaction.atomic():
+                occupancy.occupy(
+                    bulk_create_with_history([patient], Patient, **options)
+                )
+        except IntegrityError as exc:
+            report.add_error(line, patient.unique_id, {"non_field_errors": [str(exc)]})
+        else:
+            report.created += 1
+
+
+def import_patients(stream, fmt="csv", batch_size=BATCH_SIZE, dry_run=False, user=None):
+    """
+    Import patients from ``stream`` (bytes or text, ``fmt`` in ``FORMATS``).
+
+    Returns an ``ImportReport``; with ``dry_run`` rows are only validated
+    and nothing is written.
+    Raises ``ImportFormatError`` when the input cannot be parsed at all
+    (unknown format or CSV columns, invalid encoding).
+    """
+    if fmt not in READERS:
+        raise ImportFormatError(
+            f"Unsupported format {fmt!r}; use one of {', '.join(FORMATS)}."
+        )
+    report = ImportReport(dry_run=dry_run)
+    seen = set()
+    for batch in _batches(READERS[fmt](stream), batch_size):
+        report.rows += len(batch)
+        patients = _validate(batch, report, seen)
+        report.valid += len(patients)
+        if patients and not dry_run:
+            _insert(patients, report, user)
+    if report.created and not dry_run:
+        snapshots.invalidate(Patient._meta.label)
+    return report
@@ -0,0 +1,37 @@
+"""
+Recompute the blind index columns of every patient.
+
+Migration 0017 fills the columns when they are added. Re-run after rows
+are written without Patient.save() (queryset.update(), raw SQL, restored
+backups) and after the blind index key is rotated. Rows whose digests are
+already current are left alone, so the command is safe to re-run.
+
+Usage:
+    python manage.py backfill_blind_indexes
+    python manage.py backfill_blind_indexes --batch-size 2000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from patients.models import backfill_blind_indexes
+
+
+class Command(BaseCommand):
+    help = "Recompute blind indexes for encrypted patient contact fields."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Patients loaded and updated per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        scanned, updated = backfill_blind_indexes(batch_size=batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f"Scanned {scanned} patients, updated {updated}.")
+        )
@@ -0,0 +1,89 @@
+"""
+Bulk-import patients from a CSV or NDJSON file.
+
+The file is streamed and inserted in batches with bulk history rows; rows
+that fail validation are skipped and reported. See patients.importer.
+
+Usage:
+    python manage.py import_patients legacy.csv
+    python manage.py import_patients export.ndjson --dry-run
+    python manage.py import_patients - --format ndjson < export.ndjson
+    python manage.py import_patients legacy.csv --errors import-errors.json
+"""
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from patients import importer
+
+
+class Command(BaseCommand):
+    help = "Bulk-import patients from CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for standard input.")
+        parser.add_argument(
+            "--format",
+            choices=importer.FORMATS,
+            default=None,
+            help="Input format (default: from the file extension, else csv).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importer.BATCH_SIZE,
+            help="Rows validated and inserted per batch/transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without writing anything.",
+        )
+        parser.add_argument(
+            "--errors",
+            metavar="PATH",
+            help="Write the full report, including row errors, to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        path = options["path"]
+        fmt = options["format"] or (
+            "ndjson" if path.lower().endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        try:
+            if path == "-":
+                report = self._import(sys.stdin.buffer, fmt, options)
+            else:
+                with open(path, "rb") as stream:
+                    report = self._import(stream, fmt, options)
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+        except importer.ImportFormatError as exc:
+            raise CommandError(str(exc))
+
+        if options["errors"]:
+            with open(options["errors"], "w") as out:
+                json.dump(report.as_dict(), out, indent=2)
+        for error in report.errors[:10]:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if report.failed > 10:
+            self.stderr.write(f"... and {report.failed - 10} more failed rows.")
+
+        verb = "Validated" if report.dry_run else "Imported"
+        count = report.valid if report.dry_run else report.created
+        style = self.style.SUCCESS if not report.failed else self.style.WARNING
+        self.stdout.write(
+            style(f"{verb} {count} of {report.rows} rows; {report.failed} failed.")
+        )
+
+    def _import(self, stream, fmt, options):
+        return importer.import_patients(
+            stream,
+            fmt,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0011_alter_historicalpatient_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalpatient",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatient",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="patients_hi_history_73347d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalpatient",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="patients_hi_history_dccb85_idx",
+            ),
+        ),
+    ]
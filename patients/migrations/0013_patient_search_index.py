@@ -0,0 +1,28 @@
+from django.db import migrations
+
+# The PostgreSQL index is built concurrently by 0016, outside a transaction.
+
+
+def create_search_index(apps, schema_editor):
+    from patients.search import ensure_index
+
+    if schema_editor.connection.vendor == "sqlite":
+        ensure_index(schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    from patients.search import drop_index
+
+    if schema_editor.connection.vendor == "sqlite":
+        drop_index(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0012_history_audit_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The columns are filled and indexed by 0017 without locking the table.
+
+    dependencies = [
+        ("patients", "0013_patient_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="patient",
+            name="email_bidx",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="patient",
+            name="emergency_contact_phone_bidx",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="patient",
+            name="phone_bidx",
+            field=models.CharField(
+                blank=True, editable=False, max_length=32, null=True
+            ),
+        ),
+    ]
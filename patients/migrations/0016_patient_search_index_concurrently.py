@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from patients.search import ensure_index
+
+    if schema_editor.connection.vendor == "postgresql":
+        ensure_index(schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    from patients.search import drop_index
+
+    if schema_editor.connection.vendor == "postgresql":
+        drop_index(schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("patients", "0015_history_object_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
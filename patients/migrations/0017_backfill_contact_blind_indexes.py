@@ -0,0 +1,67 @@
+from django.db import migrations, models, transaction
+
+from core.blind_index import blind_index
+from core.operations import AddIndexConcurrently
+
+# Encrypted field -> (blind index column, kind of value), as of this migration.
+BLIND_INDEXES = {
+    "phone": ("phone_bidx", "phone"),
+    "email": ("email_bidx", "email"),
+    "emergency_contact_phone": ("emergency_contact_phone_bidx", "phone"),
+}
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    Patient = apps.get_model("patients", "Patient")
+    columns = [column for column, _ in BLIND_INDEXES.values()]
+    rows = Patient._base_manager.using(schema_editor.connection.alias)
+    rows = rows.order_by("pk").only("pk", *BLIND_INDEXES, *columns)
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        changed = []
+        for patient in batch:
+            stale = False
+            for name, (column, kind) in BLIND_INDEXES.items():
+                digest = blind_index(getattr(patient, name), kind)
+                if getattr(patient, column) != digest:
+                    setattr(patient, column, digest)
+                    stale = True
+            if stale:
+                changed.append(patient)
+        if changed:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                rows.bulk_update(changed, columns)
+
+
+class Migration(migrations.Migration):
+    # Backfill in per-batch transactions, then CREATE INDEX CONCURRENTLY,
+    # neither of which can run inside one migration-wide transaction.
+    atomic = False
+
+    dependencies = [
+        ("patients", "0016_patient_search_index_concurrently"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="patient",
+            index=models.Index(fields=["phone_bidx"], name="patient_phone_bidx_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="patient",
+            index=models.Index(fields=["email_bidx"], name="patient_email_bidx_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="patient",
+            index=models.Index(
+                fields=["emergency_contact_phone_bidx"],
+                name="patient_ec_phone_bidx_idx",
+            ),
+        ),
+    ]
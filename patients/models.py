@@ -1,11 +1,48 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import date
 from encrypted_model_fields.fields import EncryptedCharField, EncryptedTextField, EncryptedEmailField
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.blind_index import blind_index
+from core.models import (
+    AuditedHistoricalRecords,
+    RemediumBaseModel,
+    SoftDeleteManager,
+    SoftDeleteQuerySet,
+)
+from hospital import occupancy
+
+# Encrypted field -> (blind index column, kind of value)
+BLIND_INDEXES = {
+    "phone": ("phone_bidx", "phone"),
+    "email": ("email_bidx", "email"),
+    "emergency_contact_phone": ("emergency_contact_phone_bidx", "phone"),
+}
+
+
+class PatientQuerySet(SoftDeleteQuerySet):
+    """Exact lookups on encrypted contact fields via their blind indexes."""
+
+    def by_phone(self, number, include_emergency=False):
+        """Patients whose phone (or emergency contact phone) is ``number``."""
+        digest = blind_index(number, "phone")
+        if digest is None:
+            return self.none()
+        condition = models.Q(phone_bidx=digest)
+        if include_emergency:
+            condition |= models.Q(emergency_contact_phone_bidx=digest)
+        return self.filter(condition)
+
+    def by_email(self, email):
+        """Patients whose email is ``email`` (case-insensitive)."""
+        digest = blind_index(email, "email")
+        if digest is None:
+            return self.none()
+        return self.filter(email_bidx=digest)
+
+
+PatientManager = SoftDeleteManager.from_queryset(PatientQuerySet)
 
 
 class Patient(RemediumBaseModel):
@@ -15,6 +52,7 @@ class Patient(RemediumBaseModel):
         ("O", "Other"),
         ("P", "Prefer not to say"),
     ]
+    GENDER_ALIASES = {label: code for code, label in GENDER_CHOICES}
 
     class Meta:
         app_label = "patients"
@@ -31,6 +69,15 @@ class Patient(RemediumBaseModel):
                 name="discharge_after_admission",
             ),
         ]
+        # Blind index lookups (see PatientQuerySet); built concurrently.
+        indexes = [
+            models.Index(fields=["phone_bidx"], name="patient_phone_bidx_idx"),
+            models.Index(fields=["email_bidx"], name="patient_email_bidx_idx"),
+            models.Index(
+                fields=["emergency_contact_phone_bidx"],
+                name="patient_ec_phone_bidx_idx",
+            ),
+        ]
 
     # Simplified phone regex: accepts optional + followed by 9-15 digits
     # Supports any country code, not just US (+1)
@@ -103,7 +150,20 @@ class Patient(RemediumBaseModel):
         help_text="Assigned room",
     )
 
-    history = HistoricalRecords()
+    # HMAC digests of the encrypted contact fields (see core.blind_index),
+    # maintained by save().
+    phone_bidx = models.CharField(max_length=32, blank=True, null=True, editable=False)
+    email_bidx = models.CharField(max_length=32, blank=True, null=True, editable=False)
+    emergency_contact_phone_bidx = models.CharField(
+        max_length=32, blank=True, null=True, editable=False
+    )
+
+    objects = PatientManager()
+    all_objects = PatientManager(alive_only=False)
+
+    history = AuditedHistoricalRecords(
+        excluded_fields=[column for column, _ in BLIND_INDEXES.values()]
+    )
 
     def clean(self):
         super().clean()
@@ -126,14 +186,49 @@ class Patient(RemediumBaseModel):
     def save(self, *args, **kwargs):
         # Allow gender to be provided as display values like "Male" as well as codes like "M"
         if self.gender:
-            gender_map = {
-                "Male": "M",
-                "Female": "F",
-                "Other": "O",
-                "Prefer not to say": "P",
+            self.gender = self.GENDER_ALIASES.get(self.gender, self.gender)
+        self.refresh_blind_indexes()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {
+                BLIND_INDEXES[name][0] for name in update_fields if name in BLIND_INDEXES
             }
-            self.gender = gender_map.get(self.gender, self.gender)
-        super().save(*args, **kwargs)
+        # Admission, transfer and discharge move the ward/room occupancy
+        # counters in the same transaction as the save.
+        written = occupancy.written_fields(self, update_fields)
+        with transaction.atomic():
+            old = None
+            if written and not self._state.adding:
+                old = occupancy.stored_state(self, lock=True)
+            super().save(*args, **kwargs)
+            if written:
+                occupancy.saved(self, old, written)
+
+    def refresh_blind_indexes(self):
+        """Recompute the blind index columns from the encrypted values."""
+        for name, (column, kind) in BLIND_INDEXES.items():
+            setattr(self, column, blind_index(getattr(self, name), kind))
+
+    def delete(self, using=None, keep_parents=False):
+        """Soft delete the patient together with their clinical and billing records."""
+        from core import cascade
+
+        with occupancy.tracking(self):
+            cascade.soft_delete([self])
+        self.refresh_from_db(fields=["is_deleted", "deleted_at", "updated_at"])
+
+    def restore(self):
+        """Restore the patient and the records deleted along with them."""
+        from core import cascade
+
+        with occupancy.tracking(self):
+            cascade.restore([self])
+        self.refresh_from_db(fields=["is_deleted", "deleted_at", "updated_at"])
+
+    def hard_delete(self, using=None, keep_parents=False):
+        """Permanently delete the patient, releasing any bed they occupied."""
+        with occupancy.tracking(self):
+            return super().hard_delete(using=using, keep_parents=keep_parents)
 
     @property
     def age(self):
@@ -162,3 +257,38 @@ class Patient(RemediumBaseModel):
 
     def __str__(self):
         return f"{self.unique_id} - {self.first_name} {self.last_name}"
+
+
+def backfill_blind_indexes(batch_size=1000):
+    """
+    Recompute the blind index columns of every patient, soft-deleted ones
+    included, walking the table by primary key in batches of ``batch_size``
+    and writing only the rows whose digests changed, one transaction per
+    batch. Returns ``(scanned, updated)``.
+    """
+    columns = [column for column, _ in BLIND_INDEXES.values()]
+    rows = Patient.all_objects.order_by("pk").only("pk", *BLIND_INDEXES, *columns)
+
+    scanned = updated = 0
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        changed = []
+        for patient in batch:
+            stale = False
+            for name, (column, kind) in BLIND_INDEXES.items():
+                digest = blind_index(getattr(patient, name), kind)
+                if getattr(patient, column) != digest:
+                    setattr(patient, column, digest)
+                    stale = True
+            if stale:
+                changed.append(patient)
+        if changed:
+            with transaction.atomic():
+                Patient.all_objects.bulk_update(changed, columns)
+        scanned += len(batch)
+        updated += len(changed)
+    return scanned, updated
@@ -0,0 +1,265 @@
+"""
+Indexed patient search on ID and name.
+
+``icontains`` on ``first_name``/``last_name``/``unique_id`` cannot use an
+index and scans the whole patient table. Instead:
+
+- SQLite: an FTS5 external-content table ``patients_patient_fts`` kept in
+  sync by triggers, queried with ``MATCH`` and ranked with ``bm25()``.
+- PostgreSQL: a GIN index on a ``tsvector`` expression, queried with a
+  prefix ``tsquery`` and ranked with ``ts_rank()``.
+- Other backends fall back to ``icontains``.
+
+Queries that look like a phone number or an email address are first matched
+exactly against the encrypted contact columns through their blind indexes
+(see ``PatientQuerySet.by_phone``/``by_email``).
+
+Every term of the query is matched as a prefix and all terms must match, so
+``"jo sm"`` finds John Smith and ``"LOAD-0001"`` finds ``LOAD-000123``.
+Matching is case-insensitive. Results carry a ``search_rank`` annotation
+(higher is better).
+
+Django remakes SQLite tables on some schema changes, which drops their
+triggers, so on SQLite ``ensure_index()`` also runs after every ``migrate``
+and rebuilds the FTS table if its triggers had gone missing. The PostgreSQL
+index is built with ``CREATE INDEX CONCURRENTLY`` by a non-atomic migration,
+so the patient table stays writable during the build.
+"""
+
+import re
+
+from django.db import NotSupportedError, connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+MAX_TERMS = 8
+# A caller's number as typed: digits with optional +, spaces, dashes, dots
+# and parentheses, with at least PHONE_MIN_DIGITS digits so short ID
+# fragments are not mistaken for phone numbers.
+PHONE_QUERY = re.compile(r"\+?[\d\s().-]+")
+PHONE_MIN_DIGITS = 7
+
+FTS_TABLE = "patients_patient_fts"
+FTS_COLUMNS = ("unique_id", "first_name", "last_name")
+# bm25 column weights: an ID hit outranks a name hit.
+FTS_WEIGHTS = "10.0, 5.0, 5.0"
+
+_SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON patients_patient
+        BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, unique_id, first_name, last_name)
+            VALUES (new.id, new.unique_id, new.first_name, new.last_name);
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON patients_patient
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, unique_id, first_name, last_name)
+            VALUES ('delete', old.id, old.unique_id, old.first_name, old.last_name);
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF unique_id, first_name, last_name ON patients_patient
+        BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, unique_id, first_name, last_name)
+            VALUES ('delete', old.id, old.unique_id, old.first_name, old.last_name);
+            INSERT INTO {FTS_TABLE}(rowid, unique_id, first_name, last_name)
+            VALUES (new.id, new.unique_id, new.first_name, new.last_name);
+        END""",
+}
+
+# The query must repeat this expression verbatim for the index to be used.
+PG_DOCUMENT = (
+    "to_tsvector('simple', coalesce({table}unique_id, '') || ' ' || "
+    "coalesce({table}first_name, '') || ' ' || coalesce({table}last_name, ''))"
+)
+PG_INDEX = "patients_patient_search_idx"
+
+
+def contact_matches(queryset, query):
+    """
+    Exact phone/email matches for ``query`` through the blind indexes, or
+    ``None`` when ``query`` does not look like a phone number or an email.
+    """
+    query = (query or "").strip()
+    if "@" in query:
+        return queryset.by_email(query)
+    if (
+        PHONE_QUERY.fullmatch(query)
+        and sum(c.isdigit() for c in query) >= PHONE_MIN_DIGITS
+    ):
+        return queryset.by_phone(query, include_emergency=True)
+    return None
+
+
+def terms(query):
+    """Split a search string into lowercase word terms."""
+    return re.findall(r"[^\W_]+", (query or "").lower())[:MAX_TERMS]
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+
+def _ensure_not_in_transaction(connection):
+    if connection.in_atomic_block:
+        raise NotSupportedError(
+            "The patient search index is built concurrently and cannot be "
+            "built inside a transaction."
+        )
+
+
+def ensure_index(using="default"):
+    """
+    Create the search index for ``using`` if it is missing. On PostgreSQL the
+    index is built concurrently, so this must run outside a transaction.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        _ensure_not_in_transaction(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [f"{FTS_TABLE}_%"],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"{', '.join(FTS_COLUMNS)}, content='patients_patient', "
+                "content_rowid='id', tokenize='unicode61', prefix='2 3')"
+            )
+            for sql in _SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            if existing != set(_SQLITE_TRIGGERS):
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = %s",
+                [PG_INDEX],
+            )
+            row = cursor.fetchone()
+            if row and row[0]:
+                return
+            if row:
+                # A failed concurrent build leaves an invalid index behind,
+                # which IF NOT EXISTS would keep forever.
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {PG_INDEX}")
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {PG_INDEX} "
+                f"ON patients_patient USING gin ({PG_DOCUMENT.format(table='')})"
+            )
+
+
+def drop_index(using="default"):
+    """Remove the search index for ``using`` (concurrently on PostgreSQL)."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        _ensure_not_in_transaction(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            for name in _SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {PG_INDEX}")
+
+
+def ensure_index_after_migrate(sender, using, **kwargs):
+    """
+    ``post_migrate`` receiver: re-create SQLite triggers lost to table
+    remakes. PostgreSQL keeps its index across schema changes and only builds
+    it in its migration, never with a locking build here.
+    """
+    from django.db.migrations.recorder import MigrationRecorder
+
+    if connections[using].vendor != "sqlite":
+        return
+    applied = MigrationRecorder(connections[using]).applied_migrations()
+    if ("patients", "0013_patient_search_index") in applied:
+        ensure_index(using)
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+
+def search(queryset, query):
+    """
+    Filter a Patient queryset to rows matching ``query``, annotated with
+    ``search_rank`` and ordered by it. An empty query returns ``queryset``
+    unchanged.
+    """
+    words = terms(query)
+    if not words:
+        return queryset
+    # A phone number or email is looked up exactly first; if nobody has it,
+    # fall through to the ID/name search (e.g. for digit-only patient IDs).
+    contacts = contact_matches(queryset, query)
+    if contacts is not None and contacts.exists():
+        return contacts.annotate(
+            search_rank=Value(1.0, output_field=FloatField())
+        ).order_by("-search_rank", "last_name", "pk")
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        match = " ".join(f'"{word}"*' for word in words)
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = "patients_patient"."id"',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+    elif vendor == "postgresql":
+        tsquery = " & ".join(f"{word}:*" for word in words)
+        document = PG_DOCUMENT.format(table='"patients_patient".')
+        queryset = queryset.filter(
+            RawSQL(
+                f"{document} @@ to_tsquery('simple', %s)",
+                [tsquery],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({document}, to_tsquery('simple', %s))",
+                [tsquery],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        for word in words:
+            queryset = queryset.filter(
+                Q(first_name__icontains=word)
+                | Q(last_name__icontains=word)
+                | Q(unique_id__icontains=word)
+            )
+        queryset = queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by("-search_rank", "last_name", "pk")
+
+
+class PatientSearchFilter(filters.SearchFilter):
+    """``?search=`` backed by ``search()`` instead of ``icontains`` lookups."""
+
+    def filter_queryset(self, request, queryset, view):
+        return search(queryset, request.query_params.get(self.search_param, ""))
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """Keep relevance order for searches unless ``?ordering=`` is given."""
+
+    def get_default_ordering(self, view):
+        query = view.request.query_params.get(filters.SearchFilter.search_param, "")
+        if terms(query):
+            return ["-search_rank", "last_name", "pk"]
+        return super().get_default_ordering(view)
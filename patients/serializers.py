@@ -1,9 +1,19 @@
+from datetime import date
+
 from rest_framework import serializers
 from rest_framework.fields import CharField, IntegerField, BooleanField
+from core.serializers import SparseFieldsetMixin
 from .models import Patient
 
+# Properties served by the serializers and the columns they read.
+PATIENT_FIELD_DEPENDENCIES = {
+    "full_name": ["first_name", "last_name"],
+    "age": ["date_of_birth"],
+    "is_admitted": ["admission_date", "discharge_date"],
+}
+
 
-class PatientBriefSerializer(serializers.ModelSerializer):
+class PatientBriefSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Non-clinical staff view - excludes sensitive PHI fields."""
 
     full_name = CharField(read_only=True)
@@ -26,9 +36,10 @@ class PatientBriefSerializer(serializers.ModelSerializer):
             "room",
         ]
         read_only_fields = ["id", "full_name"]
+        field_dependencies = PATIENT_FIELD_DEPENDENCIES
 
 
-class PatientFullSerializer(serializers.ModelSerializer):
+class PatientFullSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Clinical staff view - includes all fields including PHI."""
 
     age = IntegerField(read_only=True)
@@ -60,7 +71,61 @@ class PatientFullSerializer(serializers.ModelSerializer):
             "room",
         ]
         read_only_fields = ["id", "age", "full_name", "is_admitted"]
+        field_dependencies = PATIENT_FIELD_DEPENDENCIES
 
 
 # Alias for backward compatibility
 PatientSerializer = PatientFullSerializer
+
+
+class PatientImportSerializer(serializers.ModelSerializer):
+    """
+    One row of a bulk import (see ``patients.importer``).
+
+    Validation runs no queries: the importer checks ``unique_id`` clashes and
+    the ``ward``/``room`` ids once per batch.
+    """
+
+    ward = IntegerField(required=False, allow_null=True)
+    room = IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Patient
+        fields = [
+            "unique_id",
+            "first_name",
+            "last_name",
+            "date_of_birth",
+            "gender",
+            "address",
+            "phone",
+            "email",
+            "insurance_provider",
+            "emergency_contact_name",
+            "emergency_contact_phone",
+            "medical_history",
+            "admission_date",
+            "discharge_date",
+            "ward",
+            "room",
+        ]
+        extra_kwargs = {"unique_id": {"validators": []}}
+
+    def to_internal_value(self, data):
+        # Legacy exports use display values ("Female") as often as codes.
+        gender = data.get("gender")
+        if gender in Patient.GENDER_ALIASES:
+            data = {**data, "gender": Patient.GENDER_ALIASES[gender]}
+        return super().to_internal_value(data)
+
+    def validate(self, data):
+        if data["date_of_birth"] > date.today():
+            raise serializers.ValidationError(
+                {"date_of_birth": "Date of birth cannot be in the future."}
+            )
+        admitted, discharged = data.get("admission_date"), data.get("discharge_date")
+        if admitted and discharged and discharged < admitted:
+            raise serializers.ValidationError(
+                {"discharge_date": "Discharge date cannot be before admission date."}
+            )
+        return data
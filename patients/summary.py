@@ -0,0 +1,253 @@
+"""
+Patient summary: the data behind the patient chart, composed once and cached.
+
+The chart needs the patient plus their recent appointments, care records,
+prescriptions, lab tests, encounters and documents. ``load()`` fetches them
+with sliced prefetches, ``compose()`` turns them into a JSON-ready payload,
+and ``get()`` caches that payload under a version key.
+
+The version (``etag()``) comes from one ``UNION ALL`` query returning, for
+the patient row and each related table, the latest ``updated_at`` and the
+number of live rows. Any save bumps ``updated_at``, and soft-deletes,
+restores and hard deletes change the count. So a cached payload is never
+served after its data changed, and stale entries simply expire. Writes
+that bypass ``save()`` without touching ``updated_at`` (a bare
+``queryset.update()``) are not seen until the cache entry expires.
+
+The same version is returned as the ``ETag`` of
+``/api/v1/patients/{id}/summary/`` for conditional GETs.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, IntegerField, Max, Prefetch, Value
+
+from appointments.models import Appointment
+from care_monitoring.models import PatientCare
+from core.metrics import record_cache
+from laboratory.models import LabTest
+from medical_records.models import Encounter, PatientDocument
+from pharmacy.models import Prescription
+
+from .models import Patient
+from .serializers import PatientBriefSerializer, PatientFullSerializer
+
+SECTION_LIMIT = 10
+CARE_LIMIT = 20
+CACHE_TIMEOUT = 60 * 60
+CACHE_PREFIX = "patient-summary"
+
+# Bump when the payload shape changes so old cache entries are not reused.
+PAYLOAD_VERSION = 2
+
+# Variants: the brief one (non-clinical roles) carries no clinical sections.
+FULL = "full"
+BRIEF = "brief"
+
+# Section -> model with a ``patient`` foreign key.
+SECTIONS = {
+    "appointments": Appointment,
+    "care_records": PatientCare,
+    "prescriptions": Prescription,
+    "lab_tests": LabTest,
+    "encounters": Encounter,
+    "documents": PatientDocument,
+}
+BRIEF_SECTIONS = ["appointments"]
+
+
+def prefetches(variant=FULL):
+    """Sliced prefetches for the chart sections, as ``summary_<section>`` lists."""
+    querysets = {
+        "appointments": (
+            "appointment_set",
+            Appointment.objects.select_related("doctor").order_by("-appointment_date"),
+            SECTION_LIMIT,
+        ),
+        "care_records": (
+            "patientcare_set",
+            PatientCare.objects.order_by("-monitoring_date"),
+            CARE_LIMIT,
+        ),
+        "prescriptions": (
+            "prescription_set",
+            Prescription.objects.select_related("prescribed_by").order_by(
+                "-prescribed_date"
+            ),
+            SECTION_LIMIT,
+        ),
+        "lab_tests": (
+            "labtest_set",
+            LabTest.objects.order_by("-requested_date"),
+            SECTION_LIMIT,
+        ),
+        "encounters": (
+            "encounters",
+            Encounter.objects.select_related("doctor").order_by("-start_time"),
+            SECTION_LIMIT,
+        ),
+        "documents": ("documents", PatientDocument.objects.all(), SECTION_LIMIT),
+    }
+    sections = BRIEF_SECTIONS if variant == BRIEF else list(SECTIONS)
+    return [
+        Prefetch(lookup, queryset=queryset[:limit], to_attr=f"summary_{section}")
+        for section, (lookup, queryset, limit) in querysets.items()
+        if section in sections
+    ]
+
+
+def load(patient_pk, variant=FULL):
+    """The patient with ward, room and the chart sections prefetched."""
+    return (
+        Patient.objects.select_related("ward", "room")
+        .prefetch_related(*prefetches(variant))
+        .get(pk=patient_pk)
+    )
+
+
+def vitals_chart(care_records):
+    """
+    Series for the vitals chart, oldest reading first, from the latest
+    ``care_records`` (newest first). Full, downsampled series come from
+    ``/api/v1/care-monitoring/series/``.
+    """
+    care_records = list(reversed(care_records))
+
+    def number(value):
+        return float(value) if value else None
+
+    return {
+        "dates": [r.monitoring_date.strftime("%b %d %H:%M") for r in care_records],
+        "heart_rates": [r.heart_rate or None for r in care_records],
+        "temperatures": [number(r.temperature) for r in care_records],
+        "systolic": [r.blood_pressure_systolic or None for r in care_records],
+        "diastolic": [r.blood_pressure_diastolic or None for r in care_records],
+        "oxygen": [number(r.oxygen_saturation) for r in care_records],
+    }
+
+
+def _name(staff):
+    return str(staff) if staff is not None else None
+
+
+def compose(patient, variant=FULL):
+    """JSON-ready summary payload for a patient returned by ``load()``."""
+    serializer = PatientBriefSerializer if variant == BRIEF else PatientFullSerializer
+    payload = {
+        "patient": dict(serializer(patient).data),
+        "appointments": [
+            {
+                "id": a.pk,
+                "appointment_date": a.appointment_date,
+                "status": a.status,
+                "reason": a.reason,
+                "doctor": _name(a.doctor),
+            }
+            for a in patient.summary_appointments
+        ],
+    }
+    if variant == BRIEF:
+        return payload
+    care_records = patient.summary_care_records
+    payload.update(
+        {
+            "care_records": [
+                {
+                    "id": r.pk,
+                    "monitoring_date": r.monitoring_date,
+                    "status": r.status,
+                    "blood_pressure": r.blood_pressure,
+                    "is_vital_signs_critical": r.is_vital_signs_critical,
+                }
+                for r in care_records
+            ],
+            "vitals_chart": vitals_chart(care_records),
+            "prescriptions": [
+                {
+                    "id": p.pk,
+                    "drug_name": p.drug_name,
+                    "dosage": p.dosage,
+                    "frequency": p.frequency,
+                    "status": p.status,
+                    "prescribed_date": p.prescribed_date,
+                    "prescribed_by": _name(p.prescribed_by),
+                }
+                for p in patient.summary_prescriptions
+            ],
+            "lab_tests": [
+                {
+                    "id": t.pk,
+                    "test_name": t.test_name,
+                    "status": t.status,
+                    "requested_date": t.requested_date,
+                    "result_date": t.result_date,
+                }
+                for t in patient.summary_lab_tests
+            ],
+            "encounters": [
+                {
+                    "id": e.pk,
+                    "encounter_type": e.encounter_type,
+                    "start_time": e.start_time,
+                    "end_time": e.end_time,
+                    "reason_for_visit": e.reason_for_visit,
+                    "doctor": _name(e.doctor),
+                }
+                for e in patient.summary_encounters
+            ],
+            "documents": [
+                {
+                    "id": d.pk,
+                    "title": d.title,
+                    "document_type": d.document_type,
+                    "uploaded_at": d.uploaded_at,
+                }
+                for d in patient.summary_documents
+            ],
+        }
+    )
+    return payload
+
+
+def etag(patient_pk, variant=FULL):
+    """Version of the patient's summary data, computed in one query."""
+    label = Value("patient", output_field=CharField())
+    parts = [
+        Patient.objects.filter(pk=patient_pk)
+        .annotate(section=label, rows=Value(1, output_field=IntegerField()))
+        .values_list("section", "updated_at", "rows")
+    ]
+    sections = BRIEF_SECTIONS if variant == BRIEF else list(SECTIONS)
+    for section in sections:
+        parts.append(
+            SECTIONS[section]
+            .objects.filter(patient_id=patient_pk)
+            .order_by()
+            .values("patient")
+            .annotate(
+                section=Value(section, output_field=CharField()),
+                latest=Max("updated_at"),
+                rows=Count("pk"),
+            )
+            .values_list("section", "latest", "rows")
+        )
+    first, *rest = parts
+    state = sorted(
+        (section, str(latest), rows)
+        for section, latest, rows in first.union(*rest, all=True)
+    )
+    raw = repr((PAYLOAD_VERSION, variant, patient_pk, state)).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def get(patient_pk, variant=FULL, version=None):
+    """The cached summary payload, composing and caching it on a miss."""
+    version = version or etag(patient_pk, variant)
+    key = f"{CACHE_PREFIX}:{patient_pk}:{version}"
+    payload = cache.get(key)
+    record_cache(payload is not None)
+    if payload is None:
+        payload = compose(load(patient_pk, variant), variant)
+        cache.set(key, payload, CACHE_TIMEOUT)
+    return payload
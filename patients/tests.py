@@ -262,3 +262,403 @@ class TestPatientViews:
         url = reverse("patient_history", kwargs={"pk": patient.pk})
         response = client.get(url)
         assert response.status_code == 200
+
+    def test_history_is_paginated(self, monkeypatch):
+        patient = self._create_patient()
+        for i in range(3):
+            patient.first_name = f"Edit{i}"
+            patient.save()
+        client = self._login_with_permission("permuser", "patients_view_patient")
+        url = reverse("patient_history", kwargs={"pk": patient.pk})
+        monkeypatch.setattr("core.views.ObjectHistoryMixin.history_page_size", 2)
+        response = client.get(url)
+        assert len(response.context["history"]) == 2
+        older = client.get(url, {"before": response.context["page"].older_cursor})
+        assert len(older.context["history"]) == 2
+        assert older.context["history"][-1]["changes"] is None
+        assert client.get(url, {"before": "bogus"}).status_code == 200
+
+
+@pytest.mark.django_db
+class TestPatientSearch:
+    """Indexed ID/name search used by the list view and the API."""
+
+    def _create(self, unique_id, first_name, last_name):
+        return Patient.objects.create(
+            unique_id=unique_id,
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=date(1990, 1, 1),
+            gender="M",
+        )
+
+    def test_prefix_terms_all_match(self):
+        from patients.search import search
+
+        john = self._create("LOAD-000123", "John", "Smith")
+        self._create("LOAD-000456", "Johanna", "Brown")
+        self._create("PAT-9", "Mary", "Smithers")
+
+        assert list(search(Patient.objects.all(), "jo sm")) == [john]
+        assert list(search(Patient.objects.all(), "LOAD-000123")) == [john]
+        assert search(Patient.objects.all(), "load").count() == 2
+        assert search(Patient.objects.all(), "smith").count() == 2
+
+    def test_index_follows_updates_and_soft_deletes(self):
+        from patients.search import search
+
+        patient = self._create("PAT-1", "Alice", "Walker")
+        Patient.objects.filter(pk=patient.pk).update(last_name="Jones")
+        assert not search(Patient.objects.all(), "walker").exists()
+        assert search(Patient.objects.all(), "jones").get() == patient
+        patient.delete()
+        assert not search(Patient.objects.all(), "jones").exists()
+
+    def test_ranks_id_hits_first(self):
+        from patients.search import search
+
+        by_name = self._create("PAT-2", "Grace", "Kelly")
+        by_id = self._create("KELLY-7", "Tom", "Jones")
+        results = list(search(Patient.objects.all(), "kelly"))
+        assert results == [by_id, by_name]
+        assert results[0].search_rank > results[1].search_rank
+
+    def test_list_view_and_api_use_search(self):
+        from rest_framework.test import APIClient
+
+        self._create("PAT-3", "Ada", "Lovelace")
+        self._create("PAT-4", "Alan", "Turing")
+        client = Client()
+        user = User.objects.create_user(username="searcher", password="pass")
+        user.user_permissions.add(Permission.objects.get(codename="patients_view_patient"))
+        client.login(username="searcher", password="pass")
+        response = client.get(reverse("patient_list"), {"q": "love"})
+        assert [p.unique_id for p in response.context["patients"]] == ["PAT-3"]
+
+        admin = User.objects.create_superuser("searchadmin", "a@test.com", "pass")
+        api = APIClient()
+        api.force_authenticate(admin)
+        response = api.get(reverse("patient-list"), {"search": "tur"})
+        assert response.status_code == 200
+        assert [row["unique_id"] for row in response.data["results"]] == ["PAT-4"]
+
+
+@pytest.mark.django_db
+class TestContactBlindIndex:
+    """Exact lookups on encrypted phone/email through blind indexes."""
+
+    def _create(self, unique_id, **contact):
+        return Patient.objects.create(
+            unique_id=unique_id,
+            first_name="Caller",
+            last_name=unique_id,
+            date_of_birth=date(1980, 1, 1),
+            gender="F",
+            **contact,
+        )
+
+    def test_lookup_by_phone_and_email(self):
+        patient = self._create(
+            "BI-1",
+            phone="+15550102030",
+            email="Jane.Doe@Example.org",
+            emergency_contact_phone="+15550109999",
+        )
+        self._create("BI-2", phone="+15550100000")
+
+        assert list(Patient.objects.by_phone("+1 (555) 010-2030")) == [patient]
+        assert list(Patient.objects.by_email(" jane.doe@example.ORG ")) == [patient]
+        assert not Patient.objects.by_phone("15550109999").exists()
+        assert list(
+            Patient.objects.by_phone("15550109999", include_emergency=True)
+        ) == [patient]
+        assert not Patient.objects.by_phone("").exists()
+        # Digests only; the ciphertext column is not comparable.
+        assert patient.phone_bidx and "5550102030" not in patient.phone_bidx
+
+    def test_digest_follows_updates(self):
+        patient = self._create("BI-3", phone="+15550103333")
+        patient.phone = "+15550104444"
+        patient.save(update_fields=["phone"])
+        assert not Patient.objects.by_phone("+15550103333").exists()
+        assert Patient.objects.by_phone("+15550104444").get() == patient
+
+    def test_backfill_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        patient = self._create("BI-4", email="late@example.org")
+        Patient.objects.filter(pk=patient.pk).update(email_bidx=None)
+        assert not Patient.objects.by_email("late@example.org").exists()
+
+        out = StringIO()
+        call_command("backfill_blind_indexes", batch_size=1, stdout=out)
+        assert "updated 1" in out.getvalue()
+        assert Patient.objects.by_email("late@example.org").get() == patient
+
+    def test_api_and_list_search(self):
+        from rest_framework.test import APIClient
+
+        patient = self._create("BI-5", phone="+15550105555")
+        self._create("BI-6", phone="+15550106666")
+        admin = User.objects.create_superuser("bidxadmin", "b@test.com", "pass")
+        api = APIClient()
+        api.force_authenticate(admin)
+        response = api.get(reverse("patient-list"), {"phone": "1 555 010 5555"})
+        assert [row["unique_id"] for row in response.data["results"]] == ["BI-5"]
+        response = api.get(reverse("patient-list"), {"search": "+1-555-010-5555"})
+        assert [row["unique_id"] for row in response.data["results"]] == ["BI-5"]
+
+        clerk = User.objects.create_user(username="callcentre", password="pass")
+        clerk.user_permissions.add(Permission.objects.get(codename="patients_view_patient"))
+        client = Client()
+        client.force_login(clerk)
+        response = client.get(reverse("patient_list"), {"q": "+15550105555"})
+        assert list(response.context["patients"]) == [patient]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """?fields= / ?omit= on the patient API."""
+
+    @pytest.fixture
+    def api(self):
+        from rest_framework.test import APIClient
+
+        for n in range(3):
+            Patient.objects.create(
+                unique_id=f"SF-{n}",
+                first_name="Sparse",
+                last_name=f"Patient{n}",
+                date_of_birth=date(1970, 1, 1),
+                gender="M",
+                phone="+15550107777",
+                medical_history="Confidential",
+            )
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser("sparse", "s@test.com", "pass")
+        )
+        return client
+
+    def test_fields_limits_payload_and_columns(self, api):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api.get(
+                reverse("patient-list"), {"fields": "id,unique_id,full_name"}
+            )
+        assert response.status_code == 200
+        rows = response.data["results"]
+        assert len(rows) == 3
+        assert set(rows[0]) == {"id", "unique_id", "full_name"}
+        assert rows[0]["full_name"].startswith("Sparse ")
+        select = [q["sql"] for q in queries if '"patients_patient"."unique_id"' in q["sql"]]
+        assert select and all('"medical_history"' not in sql for sql in select)
+        # Properties read only loaded columns: no per-row queries.
+        assert len(queries.captured_queries) <= 6
+
+    def test_omit_and_unknown_fields(self, api):
+        patient = Patient.objects.get(unique_id="SF-0")
+        response = api.get(
+            reverse("patient-detail", args=[patient.pk]),
+            {"omit": "medical_history,phone"},
+        )
+        assert response.status_code == 200
+        assert "medical_history" not in response.data
+        assert response.data["age"] is not None
+
+        response = api.get(reverse("patient-list"), {"fields": "id,ssn"})
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestPatientSummary:
+    """Cached /patients/{id}/summary/ with ETag conditional GETs."""
+
+    @pytest.fixture
+    def setup(self):
+        from rest_framework.test import APIClient
+        from appointments.models import Appointment
+        from care_monitoring.models import PatientCare
+        from staff.models import Staff
+
+        patient = Patient.objects.create(
+            unique_id="SUM-1",
+            first_name="Summary",
+            last_name="Patient",
+            date_of_birth=date(1975, 3, 3),
+            gender="F",
+        )
+        doctor = Staff.objects.create(
+            staff_id="SUM-DOC", first_name="Greg", last_name="House", role="DOCTOR"
+        )
+        appointment = Appointment.objects.create(
+            patient=patient,
+            doctor=doctor,
+            appointment_date=timezone.now() + timedelta(days=2),
+        )
+        care = PatientCare.objects.create(
+            patient=patient, status="STABLE", heart_rate=72
+        )
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser("summary", "sum@test.com", "pass")
+        )
+        url = reverse("patient-summary", args=[patient.pk])
+        return client, url, appointment, care
+
+    def test_payload_and_cache(self, setup, django_assert_max_num_queries):
+        from django.core.cache import cache
+
+        client, url, appointment, _ = setup
+        cache.clear()
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.data
+        assert data["patient"]["unique_id"] == "SUM-1"
+        assert [a["id"] for a in data["appointments"]] == [appointment.pk]
+        assert data["vitals_chart"]["heart_rates"] == [72]
+        assert response["ETag"]
+
+        # Cache hit: permission lookup, patient, version query only.
+        with django_assert_max_num_queries(4):
+            again = client.get(url)
+        assert again.data == data
+
+    def test_conditional_get_and_invalidation(self, setup):
+        client, url, appointment, care = setup
+        etag = client.get(url)["ETag"]
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+        appointment.reason = "Rescheduled"
+        appointment.save()
+        changed = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert changed.status_code == 200
+        assert changed.data["appointments"][0]["reason"] == "Rescheduled"
+
+        care.delete()
+        after_delete = client.get(url, HTTP_IF_NONE_MATCH=changed["ETag"])
+        assert after_delete.status_code == 200
+        assert after_delete.data["care_records"] == []
+
+
+@pytest.mark.django_db
+class TestPatientImport:
+    """Streaming bulk import from CSV/NDJSON."""
+
+    CSV = (
+        "unique_id,first_name,last_name,date_of_birth,gender,phone,email\n"
+        "IMP-1,Ada,Lovelace,1980-12-10,Female,+15550107001,ada@example.com\n"
+        "IMP-2,Alan,Turing,1975-06-23,M,,\n"
+        "IMP-3,Bad,Date,2999-01-01,M,,\n"
+        "IMP-1,Dup,InFile,1980-01-01,F,,\n"
+        "IMP-0,Already,There,1980-01-01,F,,\n"
+        'IMP-4,"Grace, Jr",Hopper,1970-01-01,O,,\n'
+    )
+
+    def _existing(self):
+        return Patient.objects.create(
+            unique_id="IMP-0",
+            first_name="Already",
+            last_name="There",
+            date_of_birth=date(1980, 1, 1),
+            gender="F",
+        )
+
+    def test_csv_import_reports_row_errors(self):
+        import io
+        from patients.importer import import_patients
+
+        self._existing()
+        report = import_patients(io.BytesIO(self.CSV.encode()), "csv", batch_size=2)
+
+        assert (report.rows, report.created, report.failed) == (6, 3, 3)
+        assert [(e["line"], e["unique_id"]) for e in report.errors] == [
+            (4, "IMP-3"),
+            (5, "IMP-1"),
+            (6, "IMP-0"),
+        ]
+        assert "date_of_birth" in report.errors[0]["errors"]
+        ada = Patient.objects.get(unique_id="IMP-1")
+        assert ada.gender == "F" and ada.phone == "+15550107001"
+        assert list(Patient.objects.by_phone("1 555 010 7001")) == [ada]
+        assert Patient.objects.get(unique_id="IMP-4").first_name == "Grace, Jr"
+        history = ada.history.get()
+        assert history.history_type == "+"
+        assert history.history_change_reason == "Bulk import"
+
+    def test_queries_do_not_grow_with_rows(self, django_assert_max_num_queries):
+        import io
+        from patients.importer import import_patients
+
+        lines = ["unique_id,first_name,last_name,date_of_birth,gender"]
+        lines += [f"BULK-{i},First{i},Last{i},1990-01-01,M" for i in range(200)]
+        with django_assert_max_num_queries(20):
+            report = import_patients(io.StringIO("\n".join(lines)), batch_size=100)
+        assert report.created == 200
+        assert Patient.history.filter(unique_id__startswith="BULK-").count() == 200
+
+    def test_api_ndjson_stream_and_dry_run(self):
+        from rest_framework.test import APIClient
+
+        admin = User.objects.create_superuser("importadmin", "i@test.com", "pass")
+        api = APIClient()
+        api.force_authenticate(admin)
+        body = (
+            '{"unique_id": "ND-1", "first_name": "Nd", "last_name": "One", '
+            '"date_of_birth": "1990-01-01", "gender": "M"}\n'
+            "not json\n"
+            '{"unique_id": "ND-2", "first_name": "Nd", "last_name": "Two", '
+            '"date_of_birth": "1990-01-01", "gender": "F", "shoe_size": 9}\n'
+        )
+        url = reverse("patient-bulk-import")
+        response = api.post(
+            f"{url}?dry_run=1", body, content_type="application/x-ndjson"
+        )
+        assert response.status_code == 200
+        assert response.data["valid"] == 1 and response.data["created"] == 0
+        assert not Patient.objects.filter(unique_id="ND-1").exists()
+
+        response = api.post(url, body, content_type="application/x-ndjson")
+        assert response.data["created"] == 1
+        assert [e["line"] for e in response.data["errors"]] == [2, 3]
+        assert Patient.objects.filter(unique_id="ND-1").exists()
+
+        response = api.post(url, "bogus,header\n", content_type="text/csv")
+        assert response.status_code == 400
+
+    def test_api_requires_admin(self):
+        from rest_framework.test import APIClient
+        from staff.models import Staff
+
+        user = User.objects.create_user("importnurse", password="pass")
+        Staff.objects.create(
+            staff_id="IMP-NRS",
+            first_name="N",
+            last_name="Urse",
+            role="NURSE",
+            user=user,
+        )
+        api = APIClient()
+        api.force_authenticate(user)
+        response = api.post(
+            reverse("patient-bulk-import"), self.CSV, content_type="text/csv"
+        )
+        assert response.status_code == 403
+
+    def test_command(self, tmp_path):
+        import json
+        from django.core.management import call_command
+
+        source = tmp_path / "patients.csv"
+        source.write_text(self.CSV)
+        report_path = tmp_path / "report.json"
+        call_command("import_patients", str(source), "--errors", str(report_path))
+
+        assert Patient.objects.filter(unique_id__startswith="IMP-").count() == 4
+        assert json.loads(report_path.read_text())["failed"] == 2
@@ -2,11 +2,12 @@ from django.shortcuts import render
 from django.views import generic
 from .models import Patient
 from .forms import PatientForm
-from django.db.models import Q
+from . import summary
+from .search import search, terms
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.urls import reverse_lazy
-from core.views import DeleteSuccessMixin, SuccessQueryParamMixin
+from core.views import DeleteSuccessMixin, ObjectHistoryMixin, SuccessQueryParamMixin
 
 
 class PatientListView(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
@@ -29,18 +30,17 @@ class PatientListView(LoginRequiredMixin, PermissionRequiredMixin, generic.ListV
     ]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related("ward", "room")
         query = self.request.GET.get("q")
-        order_by = self.request.GET.get("order_by", "last_name")
+        order_by = self.request.GET.get("order_by")
+        if query and terms(query):
+            queryset = search(queryset, query)
+            # Relevance order unless a column sort was asked for.
+            if order_by not in self.ALLOWED_ORDER_BY:
+                return queryset
         if order_by not in self.ALLOWED_ORDER_BY:
             order_by = "last_name"
-        if query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=query)
-                | Q(last_name__icontains=query)
-                | Q(unique_id__icontains=query)
-            )
-        return queryset.select_related("ward", "room").order_by(order_by)
+        return queryset.order_by(order_by)
 
 
 class PatientDetailView(
@@ -53,48 +53,24 @@ class PatientDetailView(
     raise_exception = True
 
     def get_queryset(self):
-        return Patient.objects.select_related("ward", "room").all()
+        return Patient.objects.select_related("ward", "room").prefetch_related(
+            *summary.prefetches()
+        )
 
     def get_context_data(self, **kwargs):
-        import json
-
         context = super().get_context_data(**kwargs)
         p = self.object
         context["breadcrumbs"] = [
             {"label": "Patients", "url": "/patients/"},
             {"label": p.full_name},
         ]
-        context["appointments"] = p.appointment_set.select_related("doctor").order_by(
-            "-appointment_date"
-        )[:10]
-        care_records = list(p.patientcare_set.order_by("monitoring_date")[:20])
-        context["care_records"] = care_records
-        context["prescriptions"] = p.prescription_set.select_related(
-            "prescribed_by"
-        ).order_by("-prescribed_date")[:10]
-        context["lab_tests"] = p.labtest_set.order_by("-requested_date")[:10]
-        context["encounters"] = p.encounters.select_related("doctor").order_by(
-            "-start_time"
-        )[:10]
-        context["documents"] = p.documents.all()[:10]
-        context["chart_data"] = json.dumps(
-            {
-                "dates": [
-                    r.monitoring_date.strftime("%b %d %H:%M") for r in care_records
-                ],
-                "heart_rates": [r.heart_rate or None for r in care_records],
-                "temperatures": [
-                    float(r.temperature) if r.temperature else None
-                    for r in care_records
-                ],
-                "systolic": [r.blood_pressure_systolic or None for r in care_records],
-                "diastolic": [r.blood_pressure_diastolic or None for r in care_records],
-                "oxygen": [
-                    float(r.oxygen_saturation) if r.oxygen_saturation else None
-                    for r in care_records
-                ],
-            }
-        )
+        context["appointments"] = p.summary_appointments
+        context["care_records"] = p.summary_care_records
+        context["prescriptions"] = p.summary_prescriptions
+        context["lab_tests"] = p.summary_lab_tests
+        context["encounters"] = p.summary_encounters
+        context["documents"] = p.summary_documents
+        context["chart_data"] = summary.vitals_chart(p.summary_care_records)
         return context
 
 
@@ -140,26 +116,10 @@ class PatientDeleteView(
 
 
 class PatientHistoryView(
-    LoginRequiredMixin, PermissionRequiredMixin, generic.DetailView
+    LoginRequiredMixin, PermissionRequiredMixin, ObjectHistoryMixin, generic.DetailView
 ):
     model = Patient
     template_name = "patients/patient_history.html"
     context_object_name = "patient"
     permission_required = "patients.patients_view_patient"
     raise_exception = True
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        raw_history = self.object.history.all()
-        context["history"] = [
-            {
-                "entry": record,
-                "changes": (
-                    record.diff_against(record.prev_record).changes
-                    if record.prev_record
-                    else None
-                ),
-            }
-            for record in raw_history
-        ]
-        return context
@@ -10,9 +10,10 @@ from .serializers import (
 )
 from .openfda_service import search_drug_label, search_adverse_events
 from core.permissions import IsPharmacyStaff
+from core.api_utils import SparseQuerysetMixin
 
 
-class PrescriptionViewSet(viewsets.ModelViewSet):
+class PrescriptionViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """
     Manage prescriptions and access drug information.
 
@@ -29,6 +30,7 @@ class PrescriptionViewSet(viewsets.ModelViewSet):
     search_fields = ["patient__first_name", "patient__last_name", "drug_name"]
     ordering_fields = ["prescribed_date"]
     ordering = ["-prescribed_date"]
+    cursor_ordering = ["-prescribed_date", "-id"]
 
     @action(detail=False, methods=["get"], url_path="drug-info")
     def drug_info(self, request):
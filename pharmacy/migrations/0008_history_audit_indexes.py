@@ -0,0 +1,37 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0012_history_audit_indexes"),
+        ("pharmacy", "0007_alter_historicalprescription_created_at_and_more"),
+        ("staff", "0010_history_audit_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalprescription",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalprescription",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="pharmacy_hi_history_1f6eab_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalprescription",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="pharmacy_hi_history_8432ea_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("hospital", "0005_hospitalservice_created_at_and_more"),
+        ("patients", "0012_history_audit_indexes"),
+        ("pharmacy", "0008_history_audit_indexes"),
+        ("staff", "0010_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="prescription",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["-prescribed_date"],
+                name="rx_live_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="prescription",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["status", "-prescribed_date"],
+                name="rx_live_status_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="prescription",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["prescribed_by", "-prescribed_date"],
+                name="rx_live_prescriber_date_idx",
+            ),
+        ),
+    ]
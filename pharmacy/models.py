@@ -1,7 +1,6 @@
 from django.db import models
 from patients.models import Patient
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class Prescription(RemediumBaseModel):
@@ -13,6 +12,23 @@ class Prescription(RemediumBaseModel):
             ("pharmacy_change_prescription", "Can change prescription"),
             ("pharmacy_delete_prescription", "Can delete prescription"),
         ]
+        indexes = [
+            models.Index(
+                fields=["-prescribed_date"],
+                name="rx_live_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "-prescribed_date"],
+                name="rx_live_status_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["prescribed_by", "-prescribed_date"],
+                name="rx_live_prescriber_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     patient = models.ForeignKey("patients.Patient", on_delete=models.CASCADE)
     service = models.ForeignKey(
@@ -46,4 +62,4 @@ class Prescription(RemediumBaseModel):
     def __str__(self):
         return f"{self.drug_name} for {self.patient}"
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
@@ -21,6 +21,8 @@ from datetime import timedelta
 from django.core.cache import cache
 import requests
 
+from core.metrics import record_cache
+
 logger = logging.getLogger(__name__)
 
 OPENFDA_BASE_URL = "https://api.fda.gov"
@@ -52,6 +54,7 @@ def search_drug_label(drug_name: str, skip_cache: bool = False) -> dict:
 
     if not skip_cache:
         cached_result = cache.get(cache_key)
+        record_cache(bool(cached_result))
         if cached_result:
             return cached_result
 
@@ -112,6 +115,7 @@ def search_adverse_events(drug_name: str, skip_cache: bool = False) -> dict:
 
     if not skip_cache:
         cached_result = cache.get(cache_key)
+        record_cache(bool(cached_result))
         if cached_result:
             return cached_result
 
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsetMixin
 from .models import Prescription
 
 
-class PrescriptionSerializer(serializers.ModelSerializer):
+class PrescriptionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Prescription
         fields = [
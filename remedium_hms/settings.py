@@ -57,6 +57,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.QueryMetricsMiddleware",
+    "core.middleware.SlowQueryMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -114,6 +116,9 @@ if DB_ENGINE in POSTGRES_ENGINES:
             "PASSWORD": _db_password,
             "HOST": config("DB_HOST", default="localhost"),
             "PORT": config("DB_PORT", default="5432"),
+            # Persistent connections; /health/ready/ reports whether they are reused.
+            "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 elif DB_ENGINE == "django.db.backends.sqlite3":
@@ -199,7 +204,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.HybridPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -297,6 +302,11 @@ if not FIELD_ENCRYPTION_KEY:
         "Generate one with: python -c \"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\""
     )
 
+# HMAC key for the blind indexes on encrypted columns (see core.blind_index).
+# Derived from FIELD_ENCRYPTION_KEY when empty. Changing it requires
+# "python manage.py backfill_blind_indexes".
+BLIND_INDEX_KEY = config("BLIND_INDEX_KEY", default="")
+
 # Logging Configuration
 LOGGING = {
     "version": 1,
@@ -323,6 +333,13 @@ LOGGING = {
             "backupCount": 5,
             "formatter": "verbose",
         },
+        "slow_queries_file": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": os.path.join(BASE_DIR, "logs", "slow_queries.log"),
+            "maxBytes": 1024 * 1024 * 5,  # 5 MB
+            "backupCount": 5,
+            "formatter": "verbose",
+        },
     },
     "root": {
         "handlers": ["console", "file"],
@@ -334,6 +351,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "core.slow_queries": {
+            "handlers": ["slow_queries_file"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
 
@@ -364,6 +386,51 @@ else:
         }
     }
 
+# Dashboard snapshots (see core.snapshots): counters older than this many
+# seconds are recomputed on read even if no signal marked them stale.
+DASHBOARD_SNAPSHOT_MAX_AGE = config("DASHBOARD_SNAPSHOT_MAX_AGE", default=300, cast=int)
+
+# Per-user role flags used by core.context_processors.user_roles are cached
+# for this many seconds (signals invalidate them on group/Staff changes).
+# The cache must be shared by all workers (e.g. Redis); with a per-process
+# LocMemCache the flags are recomputed on every request instead.
+USER_ROLES_CACHE = config("USER_ROLES_CACHE", default="default")
+USER_ROLES_CACHE_TIMEOUT = config("USER_ROLES_CACHE_TIMEOUT", default=900, cast=int)
+
+# Readiness probe budgets (see core.health): a dependency slower than this
+# many milliseconds makes /health/ready/ return 503.
+HEALTH_DB_LATENCY_MS = config("HEALTH_DB_LATENCY_MS", default=250, cast=int)
+HEALTH_CACHE_LATENCY_MS = config("HEALTH_CACHE_LATENCY_MS", default=100, cast=int)
+
+# Per-endpoint request metrics (see core.metrics), scraped from /metrics.
+# Workers push their totals to the cache every METRICS_FLUSH_INTERVAL seconds.
+# Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>";
+# superusers can also view the page from a logged-in session.
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=10, cast=int)
+METRICS_RETENTION = config("METRICS_RETENTION", default=86400, cast=int)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Slow-query log (see core.slow_queries): statements slower than this many
+# milliseconds are stored with their plan in SlowQuery. 0 disables it.
+# EXPLAIN ANALYZE re-runs the statement, so it is only used for SELECTs on
+# PostgreSQL and only when explicitly enabled.
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=0, cast=int)
+SLOW_QUERY_EXPLAIN_ANALYZE = config(
+    "SLOW_QUERY_EXPLAIN_ANALYZE", default=False, cast=bool
+)
+
+# Archival of soft-deleted rows (see core.archive / manage.py archive_deleted):
+# rows soft-deleted for longer than this many days are moved into
+# ArchivedRecord. Keys are lowercased model labels; "default" covers the rest.
+# Clinical records keep the longer statutory retention.
+ARCHIVE_RETENTION_DAYS = {
+    "default": config("ARCHIVE_RETENTION_DAYS", default=365, cast=int),
+    "patients.patient": 3650,
+    "medical_records.encounter": 3650,
+    "medical_records.patientdocument": 3650,
+}
+
 # JWT Configuration
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
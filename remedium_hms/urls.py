@@ -26,7 +26,7 @@ from hospital.api_views import WardViewSet, RoomViewSet
 from inventory.api_views import InventoryItemViewSet
 from surgery.api_views import SurgeryViewSet
 from care_monitoring.api_views import PatientCareViewSet
-from core.views import homepage, health_check
+from core.views import homepage, health_check, liveness, metrics_view, readiness
 
 api_router = DefaultRouter()
 api_router.register(r"patients", PatientViewSet, basename="patient")
@@ -45,6 +45,9 @@ api_router.register(r"care-monitoring", PatientCareViewSet, basename="care-monit
 urlpatterns = [
     path("", homepage, name="home"),
     path("health/", health_check, name="health_check"),
+    path("health/live/", liveness, name="health_live"),
+    path("health/ready/", readiness, name="health_ready"),
+    path("metrics", metrics_view, name="metrics"),
     path("admin/", admin.site.urls),
     path("accounts/", include("django.contrib.auth.urls")),
     path("api-auth/", include("rest_framework.urls")),
@@ -14,6 +14,7 @@ class StaffViewSet(viewsets.ModelViewSet):
     search_fields = ["staff_id", "first_name", "last_name", "email", "role"]
     ordering_fields = ["hire_date", "first_name", "last_name"]
     ordering = ["first_name"]
+    cursor_ordering = ["first_name", "id"]
 
     @action(detail=False, methods=["get"])
     def medical_staff(self, request):
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("staff", "0009_shift_created_at_shift_deleted_at_shift_is_deleted_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalstaff",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalstaff",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="staff_histo_history_a7ecba_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalstaff",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="staff_histo_history_5c53d6_idx",
+            ),
+        ),
+    ]
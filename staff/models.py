@@ -2,8 +2,7 @@ from django.db import models
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.conf import settings
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 # Shared phone validator - same as Patient model
 phone_regex = RegexValidator(
@@ -104,7 +103,7 @@ class Staff(RemediumBaseModel):
         default=True, help_text="Whether the staff member is currently active"
     )
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()
 
     def clean(self):
         super().clean()
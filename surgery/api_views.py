@@ -19,6 +19,7 @@ class SurgeryViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = ["scheduled_date", "status", "procedure"]
     ordering = ["-scheduled_date"]
+    cursor_ordering = ["-scheduled_date", "-id"]
 
     @action(detail=False, methods=["get"])
     def scheduled(self, request):
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.14 on 2026-10-18 16:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("patients", "0012_history_audit_indexes"),
+        ("staff", "0010_history_audit_indexes"),
+        ("surgery", "0006_alter_historicalsurgery_created_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="historicalsurgery",
+            name="history_date",
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name="historicalsurgery",
+            index=models.Index(
+                fields=["history_date", "history_id"],
+                name="surgery_his_history_f49b57_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalsurgery",
+            index=models.Index(
+                fields=["history_user", "history_date"],
+                name="surgery_his_history_bbddf8_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("patients", "0012_history_audit_indexes"),
+        ("staff", "0010_history_audit_indexes"),
+        ("surgery", "0007_history_audit_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="surgery",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["scheduled_date"],
+                name="surg_live_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="surgery",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["surgeon", "scheduled_date"],
+                name="surg_live_surgeon_date_idx",
+            ),
+        ),
+    ]
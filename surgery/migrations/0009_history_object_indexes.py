@@ -0,0 +1,28 @@
+# Generated by Django 5.2.14 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("patients", "0015_history_object_indexes"),
+        ("staff", "0011_history_object_indexes"),
+        ("surgery", "0008_live_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="historicalsurgery",
+            index=models.Index(
+                fields=["id", "history_date", "history_id"],
+                name="surgery_his_id_991d40_idx",
+            ),
+        ),
+    ]
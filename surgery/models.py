@@ -1,8 +1,7 @@
 from django.db import models
 from patients.models import Patient
 from staff.models import Staff
-from core.models import RemediumBaseModel
-from simple_history.models import HistoricalRecords
+from core.models import RemediumBaseModel, AuditedHistoricalRecords
 
 
 class Surgery(RemediumBaseModel):
@@ -20,6 +19,18 @@ class Surgery(RemediumBaseModel):
                 name="unique_operating_room_schedule",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["scheduled_date"],
+                name="surg_live_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["surgeon", "scheduled_date"],
+                name="surg_live_surgeon_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     patient = models.ForeignKey("patients.Patient", on_delete=models.CASCADE)
     surgeon = models.ForeignKey("staff.Staff", on_delete=models.CASCADE)
@@ -42,4 +53,4 @@ class Surgery(RemediumBaseModel):
     def __str__(self):
         return f"Surgery for {self.patient} by {self.surgeon} on {self.scheduled_date}"
 
-    history = HistoricalRecords()
+    history = AuditedHistoricalRecords()